@@ -0,0 +1,95 @@
+LOOP, ONCE, PING_PONG = "loop", "once", "ping_pong"
+MODES = (LOOP, ONCE, PING_PONG)
+
+
+class Clip:
+    def __init__(self, frames, frame_duration, mode=LOOP):
+        self._frames = tuple(frames)
+        self._frame_duration = frame_duration
+        self._mode = mode
+        self._duration = frame_duration * len(self._frames)
+
+    def index(self, elapsed):
+        """Get the frame index after elapsed ms of playback"""
+        count = len(self._frames)
+        step = int(elapsed // self._frame_duration)
+        if self._mode == ONCE:
+            return min(max(step, 0), count - 1)
+        if self._mode == PING_PONG and count > 1:
+            step %= 2 * count - 2
+            return step if step < count else 2 * count - 2 - step
+        return step % count
+
+    def finished(self, elapsed):
+        """Check if a one-shot clip has played through"""
+        return self._mode == ONCE and elapsed >= self._duration
+
+    @property
+    def frames(self):
+        return self._frames
+
+    @property
+    def frame_duration(self):
+        return self._frame_duration
+
+    @property
+    def duration(self):
+        """Get the length of one pass through the clip in ms"""
+        return self._duration
+
+
+class AnimationClock:
+    """Shared animation timeline.
+
+    Entities do not own animation timers; they keep a clip id and (for clips that
+    start on an event) the clock time the clip started. The current frame is
+    computed from the clock in O(1), so only the clock itself advances per tick."""
+
+    def __init__(self, clips):
+        self.load_clips(clips)
+        self._time = 0
+
+    def load_clips(self, clips):
+        """Replace the clip definitions; the clock keeps running"""
+        self._clips = {name: Clip(*definition) for name, definition in clips.items()}
+
+    def add_clip(self, clip_id, frames, frame_duration, mode=LOOP):
+        """Register a clip built at runtime from frames not in the atlas"""
+        self._clips[clip_id] = Clip(frames, frame_duration, mode)
+
+    def remove_clip(self, clip_id):
+        self._clips.pop(clip_id, None)
+
+    def advance(self, dt):
+        self._time += dt
+
+    def reset(self):
+        self._time = 0
+
+    def frame(self, clip_id, start=0, divisor=1):
+        """Get the current frame Surface of a clip started at clock time start.
+        
+        With divisor > 1 only every divisor-th frame is shown (each for divisor
+        frame durations), so the clip keeps its speed at a lower frame rate."""
+        clip = self._clips[clip_id]
+        elapsed = self._time - start
+        if divisor > 1:
+            step = clip.frame_duration * divisor
+            elapsed -= elapsed % step
+        return clip.frames[clip.index(elapsed)]
+
+    def finished(self, clip_id, start):
+        """Check if a one-shot clip started at start has played through"""
+        return self._clips[clip_id].finished(self._time - start)
+
+    def clip(self, clip_id):
+        return self._clips[clip_id]
+
+    @property
+    def time(self):
+        """Get the animation time in ms"""
+        return self._time
+
+    @time.setter
+    def time(self, value):
+        self._time = value
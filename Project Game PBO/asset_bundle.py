@@ -0,0 +1,168 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+import pygame
+from atlas import SPRITE_SHEETS, ATLAS_INDEX
+
+ASSET_DIR = "assets"
+BUNDLE_FILE = "assets.bundle"
+BUNDLE_MAGIC = b"RSAB"
+BUNDLE_VERSION = 1
+MIXER_FORMAT = (44100, -16, 2)
+PIXEL_FORMAT = "BGRA"
+# Dokumen/diagram tidak dipakai saat runtime, jadi tidak ikut di-bundle
+BUNDLE_EXCLUDE = {"uml.png", BUNDLE_FILE}
+_HEADER = struct.Struct("<4sII")
+_ALIGN = 16
+
+
+def _source_signature(path):
+    """Return (size, crc32) of a source file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return len(data), zlib.crc32(data)
+
+
+def _encode_asset(path, name):
+    """Convert one source file to its bundled form: (index entry, raw bytes)"""
+    lower = name.lower()
+    if lower.endswith(".png"):
+        surface = pygame.image.load(path)
+        entry = {"kind": "image", "size": list(surface.get_size()), "format": PIXEL_FORMAT}
+        return entry, pygame.image.tobytes(surface, PIXEL_FORMAT)
+    if lower.endswith(".wav"):
+        return {"kind": "sound"}, pygame.mixer.Sound(path).get_raw()
+    with open(path, "rb") as f:
+        return {"kind": "data"}, f.read()
+
+
+def build_bundle(asset_dir=ASSET_DIR):
+    """Pack every runtime asset into one bundle of display-ready pixels and mixer PCM"""
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.init(*MIXER_FORMAT)
+
+    exclude = set(BUNDLE_EXCLUDE)
+    if os.path.exists(os.path.join(asset_dir, ATLAS_INDEX)):
+        # Sheet sumber hanya dibaca bila atlas belum dibangun; pikselnya sudah ada di atlas
+        exclude.update(filename for filename, _ in SPRITE_SHEETS.values())
+    entries = {}
+    blobs = []
+    offset = 0
+    for name in sorted(os.listdir(asset_dir)):
+        path = os.path.join(asset_dir, name)
+        if name.lower() in exclude or not os.path.isfile(path):
+            continue
+        entry, raw = _encode_asset(path, name)
+        entry["name"] = name
+        entry["offset"] = offset
+        entry["length"] = len(raw)
+        entry["source"] = list(_source_signature(path))
+        entries[name.lower()] = entry
+        padding = -len(raw) % _ALIGN
+        blobs.append(raw + b"\0" * padding)
+        offset += len(raw) + padding
+
+    index = json.dumps({"mixer": list(MIXER_FORMAT), "entries": entries}).encode("utf-8")
+    data_start = _HEADER.size + len(index)
+    data_start += -data_start % _ALIGN
+    with open(os.path.join(asset_dir, BUNDLE_FILE), "wb") as f:
+        f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index)))
+        f.write(index)
+        f.write(b"\0" * (data_start - _HEADER.size - len(index)))
+        for blob in blobs:
+            f.write(blob)
+    return len(entries), data_start + offset
+
+
+class AssetBundle:
+    def __init__(self, path, asset_dir=ASSET_DIR):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = _HEADER.unpack_from(self._map)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported asset bundle: {path}")
+
+        index = json.loads(self._map[_HEADER.size:_HEADER.size + index_length])
+        data_start = _HEADER.size + index_length
+        self._data_start = data_start + (-data_start % _ALIGN)
+        self._mixer = tuple(index["mixer"])
+        self._entries = index["entries"]
+        self._stale = self._verify(asset_dir)
+
+    @classmethod
+    def open(cls, asset_dir=ASSET_DIR):
+        """Open the bundle in asset_dir, or return None if it has not been built"""
+        path = os.path.join(asset_dir, BUNDLE_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path, asset_dir)
+        except (OSError, ValueError) as e:
+            print(f"Warning: asset bundle ignored: {e}")
+            return None
+
+    def _verify(self, asset_dir):
+        """Compare every entry with its source file; changed sources are served from disk"""
+        stale = set()
+        for key, entry in self._entries.items():
+            path = os.path.join(asset_dir, entry["name"])
+            if not os.path.exists(path) or list(_source_signature(path)) != entry["source"]:
+                stale.add(key)
+        if stale:
+            print(f"Warning: asset bundle is out of date for {len(stale)} file(s), rebuild it")
+        return stale
+
+    def _view(self, entry):
+        start = self._data_start + entry["offset"]
+        return memoryview(self._map)[start:start + entry["length"]]
+
+    def has(self, name):
+        """Check if a fresh copy of the asset is in the bundle"""
+        key = name.lower()
+        return key in self._entries and key not in self._stale
+
+    def image(self, name):
+        """Wrap bundled pixels in a Surface without decoding or copying"""
+        entry = self._entries[name.lower()]
+        return pygame.image.frombuffer(self._view(entry), tuple(entry["size"]), entry["format"])
+
+    def sound(self, name):
+        """Create a Sound from bundled PCM, or None if the mixer format differs"""
+        if pygame.mixer.get_init() != self._mixer:
+            return None
+        return pygame.mixer.Sound(buffer=self._view(self._entries[name.lower()]))
+
+    def data(self, name):
+        return bytes(self._view(self._entries[name.lower()]))
+
+    def touch(self, name):
+        """Fault the asset's pages into memory so its first use does not wait on disk"""
+        view = self._view(self._entries[name.lower()])
+        for offset in range(0, len(view), mmap.PAGESIZE):
+            view[offset]
+
+    def mark_stale(self, name):
+        """Stop serving an asset from the bundle (its source changed)"""
+        self._stale.add(name.lower())
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    @property
+    def names(self):
+        """Get the original file names of all bundled assets"""
+        return [entry["name"] for entry in self._entries.values()]
+
+
+if __name__ == "__main__":
+    from atlas import build_atlas
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    build_atlas()
+    count, size = build_bundle()
+    print(f"Bundled {count} assets into {BUNDLE_FILE} ({size // 1024} KiB)")
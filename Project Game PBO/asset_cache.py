@@ -0,0 +1,134 @@
+import io
+import os
+import sys
+import threading
+import pygame
+from asset_bundle import ASSET_DIR, AssetBundle
+
+
+class AssetCache:
+    def __init__(self, asset_dir=ASSET_DIR):
+        self._asset_dir = asset_dir
+        self._bundle = AssetBundle.open(asset_dir)
+        self._images = {}
+        self._sounds = {}
+        self._prefetched = {}
+        self._prefetch_lock = threading.Lock()
+        self._scan_files()
+
+    def _scan_files(self):
+        """Map lower-case names to the real file names on disk"""
+        self._files = {name.lower(): name for name in os.listdir(self._asset_dir)}
+
+    def resolve(self, name):
+        """Get the on-disk path of an asset, ignoring letter case"""
+        key = os.path.basename(name).lower()
+        if key not in self._files:
+            raise FileNotFoundError(f"Asset not found: {name}")
+        return os.path.join(self._asset_dir, self._files[key])
+
+    def exists(self, name):
+        """Check if an asset is available, ignoring letter case"""
+        key = os.path.basename(name).lower()
+        return key in self._files or (self._bundle is not None and self._bundle.has(key))
+
+    def image(self, name, alpha=True):
+        """Get a display-ready Surface, from the bundle when possible"""
+        key = os.path.basename(name).lower()
+        if key not in self._images:
+            if self._bundle is not None and self._bundle.has(key):
+                surface = self._bundle.image(key)
+                # Piksel bundle sudah BGRA; konversi hanya jika format layar berbeda
+                display = pygame.display.get_surface()
+                if not alpha:
+                    surface = surface.convert()
+                elif display is not None and surface.get_masks()[:3] != display.get_masks()[:3]:
+                    surface = surface.convert_alpha()
+            else:
+                surface = pygame.image.load(self._source(key), key)
+                surface = surface.convert_alpha() if alpha else surface.convert()
+            self._images[key] = surface
+        return self._images[key]
+
+    def sound(self, name):
+        """Get a mixer Sound, from bundled PCM when possible"""
+        key = os.path.basename(name).lower()
+        if key not in self._sounds:
+            sound = None
+            if self._bundle is not None and self._bundle.has(key):
+                sound = self._bundle.sound(key)
+            if sound is None:
+                sound = pygame.mixer.Sound(self._source(key))
+            self._sounds[key] = sound
+        return self._sounds[key]
+
+    def prefetch(self, name):
+        """Read an asset's file ahead of its first use; safe to call from any thread.
+
+        Only bytes are read here; decoding still happens on the main thread in
+        image() or sound(), since pygame surfaces belong to the display thread."""
+        key = os.path.basename(name).lower()
+        if key in self._images or key in self._sounds or not self.exists(key):
+            return
+        if self._bundle is not None and self._bundle.has(key):
+            self._bundle.touch(key)
+            return
+        with open(self.resolve(key), "rb") as f:
+            data = f.read()
+        with self._prefetch_lock:
+            self._prefetched[key] = data
+
+    def _source(self, key):
+        """Get prefetched bytes as a file object, or the path to read from"""
+        with self._prefetch_lock:
+            data = self._prefetched.pop(key, None)
+        return io.BytesIO(data) if data is not None else self.resolve(key)
+
+    def data(self, name):
+        """Get the raw bytes of a data asset such as a JSON index"""
+        key = os.path.basename(name).lower()
+        if self._bundle is not None and self._bundle.has(key):
+            return self._bundle.data(key)
+        with open(self.resolve(key), "rb") as f:
+            return f.read()
+
+    def evict(self, name):
+        """Drop a cached asset so the next request loads it again"""
+        key = os.path.basename(name).lower()
+        self._images.pop(key, None)
+        self._sounds.pop(key, None)
+
+    def reload(self, name):
+        """Forget a changed asset and serve it from its source file from now on"""
+        self._scan_files()
+        key = os.path.basename(name).lower()
+        self.evict(key)
+        with self._prefetch_lock:
+            self._prefetched.pop(key, None)
+        if self._bundle is not None:
+            self._bundle.mark_stale(key)
+
+    def unreferenced(self, kind):
+        """Get the names of cached "images" or "sounds" that nothing outside the cache uses"""
+        cache = self._images if kind == "images" else self._sounds
+        # Referensi yang tersisa hanya dict cache dan argumen getrefcount
+        return [name for name in cache if sys.getrefcount(cache[name]) <= 2]
+
+    def clear_sounds(self):
+        """Forget cached sounds (needed after the mixer is re-initialized)"""
+        self._sounds.clear()
+
+    @property
+    def images(self):
+        """Get the cached Surfaces by lower-case name, oldest first"""
+        return dict(self._images)
+
+    @property
+    def sounds(self):
+        """Get the cached Sounds by lower-case name, oldest first"""
+        return dict(self._sounds)
+
+    @property
+    def bundled(self):
+        """Check if a prebuilt asset bundle is in use"""
+        return self._bundle is not None
@@ -0,0 +1,141 @@
+import json
+import os
+import pygame
+
+ASSET_DIR = "assets"
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+ATLAS_MAX_WIDTH = 1024
+FRAME_PADDING = 1
+
+# Semua sprite sheet game: nama -> (file sumber, jumlah frame horizontal).
+# Lebar frame = lebar sheet // jumlah frame, tinggi frame = tinggi sheet.
+SPRITE_SHEETS = {
+    "player": ("player.png", 8),
+    "player_roll": ("player_roll.png", 8),
+    "player_attack": ("player_attack.png", 8),
+    "coin": ("coin.png", 15),
+    "obstacle": ("obstacle.png", 1),
+    "obstacle_arrow": ("obstacle_arrow.png", 1),
+    "obstacle_enemy": ("obstacle_enemy.png", 4),
+    "shield": ("shield.png", 4),
+    "double_jump": ("double_jump.png", 4),
+    "multiplier": ("multiplier.png", 4),
+    "slow_motion": ("slow_motion.png", 4),
+    "start": ("start.png", 1),
+    "shop": ("shop.png", 1),
+    "setting": ("setting.png", 1),
+    "reset": ("reset.png", 1),
+}
+
+
+def _slice_rects(sheet_size, frame_count):
+    """Return the frame rects of a horizontal sprite sheet"""
+    frame_width = sheet_size[0] // frame_count
+    return [pygame.Rect(i * frame_width, 0, frame_width, sheet_size[1])
+            for i in range(frame_count)]
+
+
+def build_atlas(asset_dir=ASSET_DIR):
+    """Pack every frame of SPRITE_SHEETS into one atlas image plus a JSON index"""
+    files = {name.lower(): name for name in os.listdir(asset_dir)}
+    frames = []
+    for name, (filename, frame_count) in SPRITE_SHEETS.items():
+        sheet = pygame.image.load(os.path.join(asset_dir, files[filename]))
+        for i, rect in enumerate(_slice_rects(sheet.get_size(), frame_count)):
+            frames.append((name, i, sheet, rect))
+
+    # Shelf packing: frame tertinggi lebih dulu, satu baris sampai lebar maksimum
+    frames.sort(key=lambda f: (-f[3].height, f[0], f[1]))
+    placements = []
+    x = y = shelf_height = atlas_width = 0
+    for name, i, sheet, rect in frames:
+        if x + rect.width > ATLAS_MAX_WIDTH:
+            x = 0
+            y += shelf_height + FRAME_PADDING
+            shelf_height = 0
+        placements.append((name, i, sheet, rect, (x, y)))
+        x += rect.width + FRAME_PADDING
+        shelf_height = max(shelf_height, rect.height)
+        atlas_width = max(atlas_width, x)
+
+    atlas = pygame.Surface((atlas_width, y + shelf_height), pygame.SRCALPHA, 32)
+    index = {name: [None] * frame_count for name, (_, frame_count) in SPRITE_SHEETS.items()}
+    for name, i, sheet, rect, pos in placements:
+        atlas.blit(sheet, pos, rect)
+        index[name][i] = [pos[0], pos[1], rect.width, rect.height]
+
+    pygame.image.save(atlas, os.path.join(asset_dir, ATLAS_IMAGE))
+    with open(os.path.join(asset_dir, ATLAS_INDEX), "w") as f:
+        json.dump({"image": ATLAS_IMAGE, "frames": index}, f)
+    return atlas.get_size(), len(placements)
+
+
+class TextureAtlas:
+    def __init__(self, assets):
+        self._assets = assets
+        self._frames = {}
+        self._surface = None
+
+        if assets.exists(ATLAS_INDEX):
+            self._load_packed()
+        else:
+            self._load_sheets()
+
+    def _load_packed(self):
+        """Load the packed atlas with a single image decode"""
+        index = json.loads(self._assets.data(ATLAS_INDEX))
+        self._surface = self._assets.image(index["image"])
+        for name, rects in index["frames"].items():
+            self._frames[name] = [self._surface.subsurface(pygame.Rect(r)) for r in rects]
+
+    def _load_sheets(self):
+        """Fallback when the atlas has not been built: slice every sheet separately"""
+        for name, (filename, frame_count) in SPRITE_SHEETS.items():
+            sheet = self._assets.image(filename)
+            self._frames[name] = [sheet.subsurface(rect)
+                                  for rect in _slice_rects(sheet.get_size(), frame_count)]
+
+    def reload(self, filename):
+        """Reload the frames that come from filename after it changed on disk.
+
+        Returns True if any sprite was affected. An edited sheet is sliced on its
+        own (the packed atlas keeps serving every other sprite) until the atlas is
+        rebuilt, which reloads the whole atlas."""
+        key = filename.lower()
+        if key in (ATLAS_IMAGE, ATLAS_INDEX):
+            if not self.packed:
+                return False
+            self._frames.clear()
+            self._load_packed()
+            return True
+        for name, (source, frame_count) in SPRITE_SHEETS.items():
+            if source == key:
+                sheet = self._assets.image(source)
+                self._frames[name] = [sheet.subsurface(rect)
+                                      for rect in _slice_rects(sheet.get_size(), frame_count)]
+                return True
+        return False
+
+    def frames(self, name):
+        """Get all animation frames of a sprite"""
+        return self._frames[name]
+
+    def frame(self, name, index=0):
+        """Get a single frame of a sprite"""
+        return self._frames[name][index]
+
+    @property
+    def packed(self):
+        """Check if frames come from the packed atlas image"""
+        return self._surface is not None
+
+    @property
+    def names(self):
+        """Get all sprite names known to the atlas"""
+        return list(self._frames)
+
+
+if __name__ == "__main__":
+    size, count = build_atlas()
+    print(f"Packed {count} frames into {ATLAS_IMAGE} ({size[0]}x{size[1]})")
@@ -0,0 +1,213 @@
+import threading
+from collections import deque
+import pygame
+from projectiles import ARROW
+from particles import BLOOD, DUST
+
+# Aksi timeline dan parameter wajibnya
+BOSS_ACTIONS = {
+    "arrow": ("height",),
+    "summon": ("kind",),
+    "leave": (),
+}
+
+
+class BossEncounter:
+    """Boss fight started every time the score passes a milestone.
+
+    While the boss is on screen the obstacle, coin and powerup managers stop
+    spawning. Its attacks come from the timeline in the entity tables, compiled
+    into (time, action, argument) entries sorted by time; the fight consumes a
+    deque of them, so a tick only looks at the front entry. The boss is hurt by
+    thrown knives and reflected arrows and leaves when the timeline says so.
+
+    The boss sheet is not part of the atlas. Its file is read on a background
+    thread once the score gets within preload_lead of the milestone, decoded
+    on the main thread as soon as the read is done, played as a clip of the
+    shared animation clock and evicted from the asset cache when the fight is
+    over."""
+
+    ENTER_SPEED = 3
+    STAND_X = 140
+    CLIP = "boss"
+
+    def __init__(self, game):
+        self._game = game
+        self._frames = None
+        self._loader = None
+        self._config = None
+        self._next_at = float("inf")
+        self.retune()
+        self.reset()
+
+    def retune(self):
+        config = self._game.entities.boss
+        self._timeline = self._game.entities.boss_timeline
+        if config is None:
+            # Bagian boss dihapus: hentikan pertarungan dan buang sheet-nya
+            if self._loader is not None:
+                self._loader.join()
+                self._loader = None
+            if self._config is not None:
+                self._release()
+            self._config = None
+            self._active = False
+            self._events = deque()
+            self._next_at = float("inf")
+            return
+        if self._config is None:
+            self._next_at = config["first_score"]
+        self._config = config
+        # load_clips() baru saja mengganti semua clip; daftarkan lagi jika frame sudah ada
+        if self._frames is not None:
+            self._game.animations.add_clip(self.CLIP, self._frames, config["frame_ms"])
+
+    def reset(self):
+        config = self._config
+        if self._frames is not None:
+            self._release()
+        self._next_at = config["first_score"] if config else float("inf")
+        self._events = deque()
+        self._active = False
+        self._elapsed = 0
+        self._hp = 0
+        self._rect = pygame.Rect(0, 0, 0, 0)
+
+    def _preload(self):
+        """Read the sheet off the main thread; decoding waits for warm()"""
+        name = self._config["image"]
+        self._loader = threading.Thread(target=self._game.assets.prefetch, args=(name,),
+                                         name="boss-preload", daemon=True)
+        self._loader.start()
+
+    def _warm(self):
+        """Decode the prefetched sheet into frames (joins the loader if it is still reading)"""
+        if self._loader is not None:
+            self._loader.join()
+            self._loader = None
+        config = self._config
+        sheet = self._game.assets.image(config["image"])
+        width = sheet.get_width() // config["frames"]
+        self._frames = [sheet.subsurface((i * width, 0, width, sheet.get_height()))
+                        for i in range(config["frames"])]
+        self._game.animations.add_clip(self.CLIP, self._frames, config["frame_ms"])
+
+    def _release(self):
+        self._frames = None
+        self._game.animations.remove_clip(self.CLIP)
+        self._game.assets.evict(self._config["image"])
+
+    def update(self, dt):
+        """Start, run and finish encounters; called once per single-player tick"""
+        if self._config is None:
+            return
+        if not self._active:
+            score = self._game.player.score
+            if score >= self._next_at - self._config["preload_lead"] and self._frames is None:
+                if self._loader is None:
+                    self._preload()
+                elif not self._loader.is_alive():
+                    self._warm()
+            if score >= self._next_at:
+                self._start()
+            return
+
+        self._elapsed += dt
+        rect = self._rect
+        stand = self._game.WIDTH - self.STAND_X
+        if rect.left > stand:
+            rect.left = max(stand, rect.left - self.ENTER_SPEED)
+        events = self._events
+        while events and events[0][0] <= self._elapsed:
+            _, action, argument = events.popleft()
+            self._run(action, argument)
+            if not self._active:
+                return
+        self._take_hits()
+
+    def _start(self):
+        if self._frames is None:
+            self._warm()
+        config = self._config
+        self._active = True
+        self._elapsed = 0
+        self._hp = config["hp"]
+        self._events = deque(self._timeline)
+        width, height = self._frames[0].get_size()
+        self._rect = pygame.Rect(self._game.WIDTH, self._game.player.ground_level - height, width, height)
+
+    def _run(self, action, argument):
+        game = self._game
+        rect = self._rect
+        if action == "arrow":
+            projectiles = game.projectiles
+            projectiles.emit(ARROW, rect.left, game.player.ground_level - argument,
+                             -self._config["arrow_speed"], 0, projectiles.tuning["arrow_life"])
+        elif action == "summon":
+            game.obstacle_manager.spawn(argument, x=rect.left - 10)
+        else:
+            self._finish(defeated=False)
+
+    def _take_hits(self):
+        game = self._game
+        projectiles = game.projectiles
+        hit = projectiles.player_hit(self._rect)
+        while hit >= 0 and self._active:
+            x, y = projectiles.center(hit)
+            projectiles.remove(hit)
+            self._hp -= 1
+            game.particles.burst(x, y, 10, BLOOD)
+            if self._hp <= 0:
+                game.player.score += self._config["kill_score"]
+                game.stats.add("bosses")
+                game.particles.burst(self._rect.centerx, self._rect.centery, 40, BLOOD)
+                self._finish(defeated=True)
+                return
+            hit = projectiles.player_hit(self._rect)
+
+    def _finish(self, defeated):
+        if not defeated:
+            self._game.particles.burst(self._rect.centerx, self._rect.bottom, 20, DUST)
+        self._active = False
+        self._events.clear()
+        # Milestone berikutnya selalu di depan skor sekarang
+        every = self._config["every"]
+        while self._next_at <= self._game.player.score:
+            self._next_at += every
+        self._release()
+
+    def draw(self, screen):
+        if self._config is None or not self._active or self._frames is None:
+            return
+        screen.blit(self._game.animations.frame(self.CLIP), self._rect)
+        bar = pygame.Rect(self._rect.left, self._rect.top - 12, self._rect.width, 6)
+        screen.fill((60, 0, 0), bar)
+        bar.width = bar.width * self._hp // self._config["hp"]
+        screen.fill((220, 40, 40), bar)
+
+    def snapshot(self):
+        consumed = len(self._timeline) - len(self._events) if self._active else 0
+        return self._next_at, self._active, self._elapsed, self._hp, tuple(self._rect), consumed
+
+    def restore(self, state):
+        self._next_at, active, self._elapsed, self._hp, rect, consumed = state
+        if active and self._frames is None:
+            self._warm()
+        elif not active and self._frames is not None:
+            self._release()
+        self._active = active
+        self._rect = pygame.Rect(rect)
+        self._events = deque(self._timeline[consumed:]) if active else deque()
+
+    @property
+    def active(self):
+        """Check if a boss fight is on; managers do not spawn while it is"""
+        return self._active
+
+    @property
+    def hp(self):
+        return self._hp
+
+    @property
+    def rect(self):
+        return self._rect
@@ -0,0 +1,41 @@
+class BroadPhase:
+    """Uniform grid of obstacles along the screen's x axis.
+
+    Rebuilt once per tick; span() gives the cells an x range overlaps, so a
+    projectile only tests the few obstacles listed there (an obstacle spanning
+    two cells is listed in both). Cell lists are reused between ticks, so
+    neither rebuilding nor querying allocates."""
+
+    CELL = 64
+    MARGIN = 128
+
+    def __init__(self, width, cell=CELL, margin=MARGIN):
+        self._cell = cell
+        self._margin = margin
+        self._cells = [[] for _ in range((width + 2 * margin) // cell + 1)]
+        self._last = len(self._cells) - 1
+
+    def span(self, left, right):
+        """Get the first and last cell index overlapping [left, right)"""
+        first = (int(left) + self._margin) // self._cell
+        last = (int(right) - 1 + self._margin) // self._cell
+        return max(0, min(first, self._last)), max(0, min(last, self._last))
+
+    def rebuild(self, obstacles):
+        for cell in self._cells:
+            del cell[:]
+        cells = self._cells
+        for obstacle in obstacles:
+            first, last = self.span(obstacle.rect.left, obstacle.rect.right)
+            for i in range(first, last + 1):
+                cells[i].append(obstacle)
+
+    def remove(self, obstacle):
+        """Forget an obstacle removed in the middle of a tick"""
+        for cell in self._cells:
+            if obstacle in cell:
+                cell.remove(obstacle)
+
+    @property
+    def cells(self):
+        return self._cells
@@ -1,5 +1,4 @@
 import pygame
-import random
 
 class coinmanager:
     def __init__(self, game):
@@ -8,47 +7,40 @@ class coinmanager:
         self._load_assets()
     
     def _load_assets(self):
-        self.coin_frames = self._load_frames(
-            pygame.image.load("assets/coin.png").convert_alpha(),
-            240, 16, 15
-        )
-        self.coin_size = 16
+        self.coin_size = self.game.atlas.frame("coin").get_width()
     
-    def _load_frames(self, spritesheet, total_width, height, frame_count):
-        frame_width = total_width // frame_count
-        return [spritesheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, height)) 
-                for i in range(frame_count)]
+    def retune(self):
+        """Take new coin tuning; the spawn timer and the coins on screen are kept"""
+        self._load_assets()
+        self.coin_spawn_interval = self.game.entities.coins["spawn_interval"]
     
     def reset(self):
         self.coins = []
         self.coin_spawn_timer = 0
-        self.coin_spawn_interval = 1500
-        self.coin_frame_index = 0
-        self.coin_animation_timer = 0
-        self.coin_animation_speed = 100
+        self.coin_spawn_interval = self.game.entities.coins["spawn_interval"]
     
     def update(self, dt):
-        self.coin_spawn_timer += dt
-        self.coin_animation_timer += dt
+        # Selama pertarungan bos tidak ada koin baru
+        if not self.game.boss.active:
+            self.coin_spawn_timer += dt
         
         if self.coin_spawn_timer >= self.coin_spawn_interval:
             self._spawn_coin()
             self.coin_spawn_timer = 0
         
-        if self.coin_animation_timer >= self.coin_animation_speed:
-            self.coin_animation_timer = 0
-            self.coin_frame_index = (self.coin_frame_index + 1) % len(self.coin_frames)
-        
         self._update_coins()
     
     def _spawn_coin(self):
+        tuning = self.game.entities.coins
         rect = pygame.Rect(
-            self.game.WIDTH + random.randint(0, 100),
-            self.game.player.ground_level - random.randint(40, 80),
+            self.game.WIDTH + self.game.rng.randint(0, tuning["x_jitter"]),
+            self.game.player.ground_level - self.game.rng.randint(tuning["height_min"], tuning["height_max"]),
             self.coin_size,
             self.coin_size
         )
-        self.coins.append(rect)
+        # Koin yang tidak mendapat tempat kosong dilewati sampai giliran berikutnya
+        if self.game.placement.place(rect, tuning["x_jitter"]):
+            self.coins.append(rect)
     
     def _update_coins(self):
         for coin in self.coins[:]:
@@ -58,10 +50,19 @@ class coinmanager:
                 self.coins.remove(coin)
                 continue
     
-    def draw(self, screen):
+    def snapshot(self):
+        return self.coin_spawn_timer, self.coin_spawn_interval, tuple((c.x, c.y) for c in self.coins)
+    
+    def restore(self, state):
+        self.coin_spawn_timer, self.coin_spawn_interval, coins = state
+        self.coins = [pygame.Rect(x, y, self.coin_size, self.coin_size) for x, y in coins]
+    
+    def draw(self, screen, hidden=()):
+        quality = self.game.quality
+        frames = {1: self.game.animations.frame("coin")}
         for coin in self.coins:
-            frame = pygame.transform.scale(
-                self.coin_frames[self.coin_frame_index],
-                (coin.width, coin.height)
-            )
-            screen.blit(frame, coin)
\ No newline at end of file
+            if id(coin) not in hidden:
+                divisor = quality.animation_divisor(coin)
+                if divisor not in frames:
+                    frames[divisor] = self.game.animations.frame("coin", divisor=divisor)
+                screen.blit(frames[divisor], coin)
\ No newline at end of file
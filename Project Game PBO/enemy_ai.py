@@ -0,0 +1,279 @@
+import sys
+from array import array
+import pygame
+
+# Parameter wajib per jenis perilaku (angka, kecuali "arrow" yang berupa nama jenis rintangan)
+BEHAVIOURS = {
+    "charge": ("range", "windup", "speed"),
+    "hop": ("interval", "power", "gravity"),
+    "shoot": ("range", "windup", "cooldown", "arrow", "arrow_speed"),
+    "block": ("range", "guard", "open"),
+}
+
+IDLE, WINDUP, ACTIVE, COOLDOWN = range(4)
+TELL_COLORS = {WINDUP: (255, 60, 60), ACTIVE: (90, 140, 255)}
+
+
+class BehaviourPool:
+    """State of every live enemy of one behaviour type, in flat arrays.
+
+    Slots [0, count) are live. Removing an enemy moves the last slot into the
+    hole, so update() is a single loop over packed arrays regardless of how
+    many enemies use the behaviour. Obstacle kinds that share a behaviour type
+    share the pool; params maps each kind id to its own parameters."""
+
+    CAPACITY = 32
+
+    def __init__(self, name, params=None):
+        self.name = name
+        self.params = params or {}
+        self._count = 0
+        self._obstacles = []
+        self._kind = array("B")
+        self._state = array("B")
+        self._timer = array("f")
+        self._vy = array("f")
+        self._base_y = array("f")
+        self._grow(self.CAPACITY)
+
+    def _grow(self, capacity):
+        extra = capacity - len(self._state)
+        self._kind.extend(bytes(extra))
+        self._state.extend(bytes(extra))
+        self._timer.extend(bytes(4 * extra))
+        self._vy.extend(bytes(4 * extra))
+        self._base_y.extend(bytes(4 * extra))
+        self._obstacles.extend([None] * extra)
+
+    def add(self, obstacle, state=None):
+        i = self._count
+        if i == len(self._state):
+            self._grow(2 * i)
+        self._obstacles[i] = obstacle
+        self._kind[i] = obstacle.kind
+        self._state[i], self._timer[i], self._vy[i], self._base_y[i] = (
+            state if state is not None else (IDLE, self.params[obstacle.kind].get("interval", 0), 0, obstacle.rect.y))
+        obstacle.slot = i
+        self._count += 1
+
+    def remove(self, obstacle):
+        i = obstacle.slot
+        last = self._count - 1
+        if i != last:
+            moved = self._obstacles[last]
+            self._obstacles[i] = moved
+            self._kind[i] = self._kind[last]
+            self._state[i] = self._state[last]
+            self._timer[i] = self._timer[last]
+            self._vy[i] = self._vy[last]
+            self._base_y[i] = self._base_y[last]
+            moved.slot = i
+        self._obstacles[last] = None
+        self._count = last
+        obstacle.slot = -1
+
+    def holds(self, obstacle):
+        """Check if obstacle is tracked by this pool"""
+        return 0 <= obstacle.slot < self._count and self._obstacles[obstacle.slot] is obstacle
+
+    def rekind(self, obstacle):
+        """Take over a renumbered kind id of a tracked obstacle"""
+        self._kind[obstacle.slot] = obstacle.kind
+
+    def clear(self):
+        for i in range(self._count):
+            self._obstacles[i] = None
+        self._count = 0
+
+    def slot_state(self, obstacle):
+        i = obstacle.slot
+        return self._state[i], self._timer[i], self._vy[i], self._base_y[i]
+
+    def state_of(self, obstacle):
+        return self._state[obstacle.slot]
+
+    def update(self, dt, target, fire):
+        """Advance every enemy of this type one tick.
+
+        target is the player's Rect; fire(rect, arrow_kind, speed) spawns a shot."""
+        getattr(self, f"_update_{self.name}")(dt, target, fire)
+
+    def _update_charge(self, dt, target, fire):
+        params, kinds = self.params, self._kind
+        state, timer, obstacles = self._state, self._timer, self._obstacles
+        for i in range(self._count):
+            p = params[kinds[i]]
+            rect = obstacles[i].rect
+            s = state[i]
+            if s == IDLE:
+                if 0 <= rect.left - target.right < p["range"]:
+                    state[i] = WINDUP
+                    timer[i] = p["windup"]
+            elif s == WINDUP:
+                timer[i] -= dt
+                if timer[i] <= 0:
+                    state[i] = ACTIVE
+            else:
+                rect.x -= p["speed"]
+
+    def _update_hop(self, dt, target, fire):
+        params, kinds = self.params, self._kind
+        state, timer, vy, base_y, obstacles = self._state, self._timer, self._vy, self._base_y, self._obstacles
+        for i in range(self._count):
+            p = params[kinds[i]]
+            if state[i] == IDLE:
+                timer[i] -= dt
+                if timer[i] <= 0:
+                    state[i] = ACTIVE
+                    vy[i] = p["power"]
+            else:
+                rect = obstacles[i].rect
+                vy[i] += p["gravity"]
+                rect.y += int(vy[i])
+                if rect.y >= base_y[i]:
+                    rect.y = int(base_y[i])
+                    state[i] = IDLE
+                    timer[i] = p["interval"]
+
+    def _update_shoot(self, dt, target, fire):
+        params, kinds = self.params, self._kind
+        state, timer, obstacles = self._state, self._timer, self._obstacles
+        for i in range(self._count):
+            p = params[kinds[i]]
+            s = state[i]
+            if s == IDLE:
+                if 0 <= obstacles[i].rect.left - target.right < p["range"]:
+                    state[i] = WINDUP
+                    timer[i] = p["windup"]
+                continue
+            timer[i] -= dt
+            if timer[i] > 0:
+                continue
+            if s == WINDUP:
+                fire(obstacles[i].rect, p["arrow"], p["arrow_speed"])
+                state[i] = COOLDOWN
+                timer[i] = p["cooldown"]
+            else:
+                state[i] = IDLE
+
+    def _update_block(self, dt, target, fire):
+        params, kinds = self.params, self._kind
+        state, timer, obstacles = self._state, self._timer, self._obstacles
+        for i in range(self._count):
+            p = params[kinds[i]]
+            s = state[i]
+            if s == IDLE:
+                if 0 <= obstacles[i].rect.left - target.right < p["range"]:
+                    state[i] = ACTIVE
+                    timer[i] = p["guard"]
+                continue
+            timer[i] -= dt
+            if timer[i] <= 0:
+                # Bertahan dan terbuka bergantian, jadi ada celah untuk menyerang
+                state[i] = COOLDOWN if s == ACTIVE else ACTIVE
+                timer[i] = p["open"] if s == ACTIVE else p["guard"]
+
+    def draw_tells(self, screen, hidden):
+        """Mark winding-up (red) and guarding (blue) enemies"""
+        state, obstacles = self._state, self._obstacles
+        for i in range(self._count):
+            color = TELL_COLORS.get(state[i])
+            if color is not None and id(obstacles[i]) not in hidden:
+                rect = obstacles[i].rect
+                if state[i] == WINDUP:
+                    pygame.draw.rect(screen, color, (rect.centerx - 3, rect.top - 12, 6, 8))
+                elif self.name == "block":
+                    pygame.draw.rect(screen, color, rect.inflate(6, 6), 2)
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def memory_bytes(self):
+        arrays = (self._kind, self._state, self._timer, self._vy, self._base_y, self._obstacles)
+        return sum(sys.getsizeof(a) for a in arrays)
+
+
+class EnemyAI:
+    """Behaviour state machines for enemy obstacles, one BehaviourPool per
+    behaviour type, so a tick costs one loop per type however many kinds use it.
+
+    Which behaviour (and which parameters) a kind uses comes from the
+    obstacle_behaviour table. Obstacles of kinds without a behaviour are not
+    tracked and only slide with the world."""
+
+    def __init__(self, game):
+        self._game = game
+        self._pools = {}
+        self._kind_pools = ()
+        self.retune()
+
+    def retune(self, obstacles=()):
+        """Take behaviour parameters from the current entity tables.
+
+        obstacles are the live obstacles, already carrying their new kind ids.
+        Pools of behaviour types still in use are kept with their slots, so
+        charge timers and pending shots survive; only the parameters are
+        replaced. Enemies whose kind changed behaviour type start it from idle."""
+        behaviours = self._game.entities.obstacle_behaviour
+        params = {}
+        for kind, behaviour in enumerate(behaviours):
+            if behaviour is not None:
+                params.setdefault(behaviour[0], {})[kind] = behaviour[1]
+        old_pools = self._pools
+        self._pools = {name: old_pools.get(name) or BehaviourPool(name) for name in params}
+        for name, pool in self._pools.items():
+            pool.params = params[name]
+        self._kind_pools = tuple(self._pools[b[0]] if b is not None else None for b in behaviours)
+
+        for obstacle in obstacles:
+            pool = self._kind_pools[obstacle.kind]
+            old = next((p for p in old_pools.values() if p.holds(obstacle)), None)
+            if old is not None and old is pool:
+                pool.rekind(obstacle)
+                continue
+            if old is not None:
+                old.remove(obstacle)
+            if pool is not None:
+                pool.add(obstacle)
+
+    def reset(self):
+        for pool in self._pools.values():
+            pool.clear()
+
+    def add(self, obstacle, state=None):
+        pool = self._kind_pools[obstacle.kind]
+        if pool is not None:
+            pool.add(obstacle, state)
+
+    def remove(self, obstacle):
+        if obstacle.slot >= 0:
+            self._kind_pools[obstacle.kind].remove(obstacle)
+
+    def update(self, dt, fire):
+        target = self._game.player.rect
+        for pool in self._pools.values():
+            if pool.count:
+                pool.update(dt, target, fire)
+
+    def snapshot(self, obstacle):
+        """Get the behaviour state of one obstacle, or () if it has none"""
+        if obstacle.slot < 0:
+            return ()
+        return tuple(self._kind_pools[obstacle.kind].slot_state(obstacle))
+
+    def blocking(self, obstacle):
+        """Check if an enemy is guarding and cannot be hurt by attacks"""
+        pool = self._kind_pools[obstacle.kind]
+        return (pool is not None and obstacle.slot >= 0 and pool.name == "block"
+                and pool.state_of(obstacle) == ACTIVE)
+
+    def draw(self, screen, hidden=()):
+        for pool in self._pools.values():
+            if pool.count:
+                pool.draw_tells(screen, hidden)
+
+    @property
+    def memory_bytes(self):
+        return sum(pool.memory_bytes for pool in self._pools.values())
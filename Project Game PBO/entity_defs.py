@@ -0,0 +1,342 @@
+import json
+from bisect import bisect_right
+from animation import MODES
+from enemy_ai import BEHAVIOURS
+from stats import COUNTERS, SCOPES
+from boss import BOSS_ACTIONS
+
+ANCHORS = ("top", "bottom")
+TERRAIN_LIMITS = {
+    "safe_distance": 0,
+    "segment_min": 1,
+    "segment_max": 1,
+    "gap_chance": 0,
+    "gap_min": 0,
+    "gap_max": 0,
+    "platform_chance": 0,
+    "platform_min": 1,
+    "platform_max": 1,
+    "platform_thickness": 1,
+}
+MAX_TERRAIN_SEGMENT = 400
+POWERUP_PARAMS = ("spawn_interval", "duration", "max_hits", "value")
+# Tempat muncul koin dan powerup: x acak sampai x_jitter di kanan layar, tinggi di atas tanah
+PLACEMENT_TUNING = ("x_jitter", "height_min", "height_max")
+MAX_SHOP_LEVEL = 20
+PLAYER_TUNING = ("gravity", "jump_power", "coyote_time", "jump_buffer_time", "roll_duration")
+PROJECTILE_TUNING = ("throw_speed", "throw_life", "throw_cooldown", "arrow_life", "reflect_speed")
+BOSS_TUNING = ("first_score", "every", "preload_lead", "hp", "kill_score", "frame_ms", "arrow_speed")
+
+
+class EntityTables:
+    """Entity definitions compiled into flat per-kind tables.
+
+    Obstacle kinds are addressed by integer id; every obstacle_* tuple is indexed
+    by that id so spawning is a handful of tuple lookups. Shop upgrades are
+    precomputed per level: upgrade_prices[name][level] is the price of the next
+    level (None at max_level) and upgrade_effects[name][level] the powerup
+    parameters at that level. achievement_goals[(counter, scope)] lists the
+    (goal, id) pairs of that counter sorted by goal. boss_timeline holds the
+    boss attacks as (ms, action, argument) sorted by time, with repeats
+    expanded; boss is None when the definitions have no boss."""
+
+    def __init__(self):
+        self.obstacle_ids = {}
+        self.obstacle_names = ()
+        self.obstacle_frames = ()
+        self.obstacle_anchor_top = ()
+        self.obstacle_offsets = ()
+        self.obstacle_animation = ()
+        self.obstacle_kill_score = ()
+        self.obstacle_behaviour = ()
+        self.obstacle_projectile = ()
+        self.spawn_cdf = ()
+        self.animations = {}
+        self.player = {}
+        self.projectiles = {}
+        self.spawn = {}
+        self.coins = {}
+        self.terrain = {}
+        self.powerups = {}
+        self.upgrade_max_level = {}
+        self.upgrade_prices = {}
+        self.upgrade_effects = {}
+        self.achievements = {}
+        self.achievement_goals = {}
+        self.boss = None
+        self.boss_timeline = ()
+
+    def pick_obstacle(self, roll):
+        """Map a uniform roll in [0, 1) to an obstacle kind id"""
+        return min(bisect_right(self.spawn_cdf, roll * self.spawn_cdf[-1]), len(self.spawn_cdf) - 1)
+
+
+
+def _require(condition, path, message):
+    if not condition:
+        raise ValueError(f"{path}: {message}")
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_behaviour(behaviour, obstacles, path):
+    _require(isinstance(behaviour, dict), path, "must be an object")
+    _require(behaviour.get("type") in BEHAVIOURS, f"{path}.type", f"must be one of {tuple(BEHAVIOURS)}")
+    for key in BEHAVIOURS[behaviour["type"]]:
+        if key == "arrow":
+            _require(behaviour.get(key) in obstacles, f"{path}.arrow",
+                     f"unknown obstacle kind {behaviour.get(key)!r}")
+        else:
+            _require(_number(behaviour.get(key)), f"{path}.{key}", "must be a number")
+
+
+def _compile_behaviour(behaviour, obstacle_ids):
+    """Turn a behaviour definition into (type, params); arrow names become kind ids"""
+    if behaviour is None:
+        return None
+    params = {key: behaviour[key] for key in BEHAVIOURS[behaviour["type"]]}
+    if "arrow" in params:
+        params["arrow"] = obstacle_ids[params["arrow"]]
+    return behaviour["type"], params
+
+
+def _upgrade_value(formula, level):
+    """Evaluate an upgrade formula at a shop level"""
+    value = formula["base"] + formula["per_level"] * level
+    if formula.get("min") is not None:
+        value = max(formula["min"], value)
+    if formula.get("max") is not None:
+        value = min(formula["max"], value)
+    return value
+
+
+def _compile_shop(tables, name, powerup, path):
+    """Precompute the price and effect of every shop level of a powerup"""
+    shop = powerup["shop"]
+    _require(isinstance(shop, dict), f"{path}.shop", "must be an object")
+    _require(isinstance(shop.get("max_level"), int) and 1 <= shop["max_level"] <= MAX_SHOP_LEVEL,
+             f"{path}.shop.max_level", f"must be an integer from 1 to {MAX_SHOP_LEVEL}")
+    _require(_number(shop.get("price")) and shop["price"] >= 0, f"{path}.shop.price", "must be a number >= 0")
+    _require(_number(shop.get("price_growth", 1)) and shop.get("price_growth", 1) >= 1,
+             f"{path}.shop.price_growth", "must be a number >= 1")
+
+    upgrades = powerup.get("upgrades", {})
+    for param, formula in upgrades.items():
+        fpath = f"{path}.upgrades.{param}"
+        _require(param in POWERUP_PARAMS, fpath, "is not an upgradable parameter")
+        _require(param in powerup, fpath, f"is not a parameter of {name}")
+        _require(_number(formula.get("base")) and _number(formula.get("per_level")),
+                 fpath, "needs numeric base and per_level")
+
+    max_level = shop["max_level"]
+    # Indeks 0 tidak dipakai (level dimulai dari 1) supaya tabel bisa diindeks langsung dengan level
+    prices, price = [None], shop["price"]
+    for level in range(1, max_level):
+        prices.append(int(price))
+        price = int(price) * shop.get("price_growth", 1)
+    prices.append(None)
+    effects = tuple(
+        tuple((param, _upgrade_value(formula, level)) for param, formula in upgrades.items())
+        for level in range(max_level + 1)
+    )
+    tables.upgrade_max_level[name] = max_level
+    tables.upgrade_prices[name] = tuple(prices)
+    tables.upgrade_effects[name] = effects
+
+
+def _compile_timeline(timeline, obstacle_ids, path):
+    """Expand repeated timeline entries and sort everything by time"""
+    _require(isinstance(timeline, list) and timeline, path, "needs a list of events")
+    events = []
+    for i, event in enumerate(timeline):
+        epath = f"{path}[{i}]"
+        action = event.get("do")
+        _require(action in BOSS_ACTIONS, f"{epath}.do", f"must be one of {tuple(BOSS_ACTIONS)}")
+        _require(_number(event.get("at")) and event["at"] >= 0, f"{epath}.at", "must be a number >= 0")
+        _require(isinstance(event.get("times", 1), int) and event.get("times", 1) >= 1,
+                 f"{epath}.times", "must be an integer >= 1")
+        _require(_number(event.get("every", 0)) and event.get("every", 0) >= 0, f"{epath}.every", "must be >= 0")
+        for key in BOSS_ACTIONS[action]:
+            if key == "kind":
+                _require(event.get(key) in obstacle_ids, f"{epath}.kind", f"unknown obstacle kind {event.get(key)!r}")
+            else:
+                _require(_number(event.get(key)), f"{epath}.{key}", "must be a number")
+        # Argumen satu-satunya aksi disimpan langsung; nama jenis rintangan jadi id
+        argument = event.get(BOSS_ACTIONS[action][0]) if BOSS_ACTIONS[action] else None
+        if action == "summon":
+            argument = obstacle_ids[argument]
+        for n in range(event.get("times", 1)):
+            events.append((event["at"] + n * event.get("every", 0), i, action, argument))
+    events.sort(key=lambda e: (e[0], e[1]))
+    return tuple((at, action, argument) for at, _, action, argument in events)
+
+
+def _check_placement(entry, path):
+    for key in PLACEMENT_TUNING:
+        _require(isinstance(entry.get(key), int) and entry[key] >= 0, f"{path}.{key}", "must be an integer >= 0")
+    _require(entry["height_min"] <= entry["height_max"], f"{path}.height_min", "must not exceed height_max")
+
+
+def compile_entities(data, atlas, source="entities"):
+    """Validate raw definitions and compile them into EntityTables"""
+    tables = EntityTables()
+
+    animations = data.get("animations")
+    _require(isinstance(animations, dict), f"{source}.animations", "missing section")
+    for name, clip in animations.items():
+        path = f"{source}.animations.{name}"
+        _require(clip.get("sprite") in atlas.names, f"{path}.sprite", f"unknown sprite {clip.get('sprite')!r}")
+        _require(_number(clip.get("frame_ms")) and clip["frame_ms"] > 0, f"{path}.frame_ms", "must be > 0")
+        _require(clip.get("mode", "loop") in MODES, f"{path}.mode", f"must be one of {MODES}")
+        tables.animations[name] = (tuple(atlas.frames(clip["sprite"])), clip["frame_ms"], clip.get("mode", "loop"))
+
+    player = data.get("player")
+    _require(isinstance(player, dict), f"{source}.player", "missing section")
+    for key in PLAYER_TUNING:
+        _require(_number(player.get(key)), f"{source}.player.{key}", "must be a number")
+    tables.player = {key: player[key] for key in PLAYER_TUNING}
+
+    projectiles = data.get("projectiles")
+    _require(isinstance(projectiles, dict), f"{source}.projectiles", "missing section")
+    _require(projectiles.get("arrow_sprite") in atlas.names, f"{source}.projectiles.arrow_sprite",
+             f"unknown sprite {projectiles.get('arrow_sprite')!r}")
+    for key in PROJECTILE_TUNING:
+        _require(_number(projectiles.get(key)) and projectiles[key] >= 0,
+                 f"{source}.projectiles.{key}", "must be a number >= 0")
+    tables.projectiles = dict(projectiles)
+
+    spawn = data.get("obstacle_spawn")
+    _require(isinstance(spawn, dict), f"{source}.obstacle_spawn", "missing section")
+    for key in ("interval", "min_interval", "interval_step", "speed", "x_jitter"):
+        _require(_number(spawn.get(key)) and spawn[key] >= 0,
+                 f"{source}.obstacle_spawn.{key}", "must be a number >= 0")
+    tables.spawn = dict(spawn)
+
+    coins = data.get("coins")
+    _require(isinstance(coins, dict), f"{source}.coins", "missing section")
+    _require(_number(coins.get("spawn_interval")) and coins["spawn_interval"] > 0,
+             f"{source}.coins.spawn_interval", "must be > 0")
+    _check_placement(coins, f"{source}.coins")
+    tables.coins = {key: coins[key] for key in ("spawn_interval",) + PLACEMENT_TUNING}
+
+    terrain = data.get("terrain")
+    _require(isinstance(terrain, dict), f"{source}.terrain", "missing section")
+    for key, minimum in TERRAIN_LIMITS.items():
+        _require(_number(terrain.get(key)) and terrain[key] >= minimum,
+                 f"{source}.terrain.{key}", f"must be a number >= {minimum}")
+    for kind in ("segment", "gap", "platform"):
+        _require(terrain[f"{kind}_min"] <= terrain[f"{kind}_max"],
+                 f"{source}.terrain.{kind}_min", f"must not exceed {kind}_max")
+    # Terrain mengandalkan batas panjang segmen untuk query interval yang murah
+    for key in ("segment_max", "platform_max"):
+        _require(terrain[key] <= MAX_TERRAIN_SEGMENT, f"{source}.terrain.{key}",
+                 f"must be <= {MAX_TERRAIN_SEGMENT}")
+    _require(isinstance(terrain.get("platform_heights"), list) and terrain["platform_heights"]
+             and all(_number(h) for h in terrain["platform_heights"]),
+             f"{source}.terrain.platform_heights", "needs a list of numbers")
+    tables.terrain = dict(terrain)
+
+    obstacles = data.get("obstacles")
+    _require(isinstance(obstacles, dict) and obstacles, f"{source}.obstacles", "needs at least one kind")
+    names, frames, anchor_top, offsets, animation, kill_score, behaviour, projectile, cdf = (
+        [], [], [], [], [], [], [], [], [])
+    total = 0
+    for name, kind in obstacles.items():
+        path = f"{source}.obstacles.{name}"
+        _require(kind.get("sprite") in atlas.names, f"{path}.sprite", f"unknown sprite {kind.get('sprite')!r}")
+        _require(_number(kind.get("weight")) and kind["weight"] > 0, f"{path}.weight", "must be > 0")
+        _require(kind.get("anchor") in ANCHORS, f"{path}.anchor", f"must be one of {ANCHORS}")
+        _require(isinstance(kind.get("offsets"), list) and kind["offsets"]
+                 and all(_number(o) for o in kind["offsets"]), f"{path}.offsets", "needs a list of numbers")
+        _require(_number(kind.get("kill_score", 0)), f"{path}.kill_score", "must be a number")
+        _require(kind.get("animation") is None or kind["animation"] in tables.animations,
+                 f"{path}.animation", f"unknown animation {kind.get('animation')!r}")
+        if "behaviour" in kind:
+            _check_behaviour(kind["behaviour"], obstacles, f"{path}.behaviour")
+        _require(kind.get("projectile_speed") is None or _number(kind["projectile_speed"]),
+                 f"{path}.projectile_speed", "must be a number")
+
+        tables.obstacle_ids[name] = len(names)
+        names.append(name)
+        frames.append(tuple(atlas.frames(kind["sprite"])))
+        anchor_top.append(kind["anchor"] == "top")
+        offsets.append(tuple(kind["offsets"]))
+        animation.append(kind.get("animation"))
+        # kill_score > 0 berarti musuh ini bisa dibunuh dengan serangan
+        kill_score.append(kind.get("kill_score", 0))
+        behaviour.append(kind.get("behaviour"))
+        # Jenis dengan projectile_speed ditembakkan sebagai proyektil, bukan objek Obstacle
+        projectile.append(kind.get("projectile_speed"))
+        total += kind["weight"]
+        cdf.append(total)
+
+    tables.obstacle_names = tuple(names)
+    tables.obstacle_frames = tuple(frames)
+    tables.obstacle_anchor_top = tuple(anchor_top)
+    tables.obstacle_offsets = tuple(offsets)
+    tables.obstacle_animation = tuple(animation)
+    tables.obstacle_kill_score = tuple(kill_score)
+    tables.obstacle_behaviour = tuple(_compile_behaviour(b, tables.obstacle_ids) for b in behaviour)
+    tables.obstacle_projectile = tuple(projectile)
+    tables.spawn_cdf = tuple(cdf)
+
+    powerups = data.get("powerups")
+    _require(isinstance(powerups, dict), f"{source}.powerups", "missing section")
+    for name, powerup in powerups.items():
+        path = f"{source}.powerups.{name}"
+        _require(powerup.get("sprite") in atlas.names, f"{path}.sprite", f"unknown sprite {powerup.get('sprite')!r}")
+        _require(powerup.get("animation") in tables.animations, f"{path}.animation",
+                 f"unknown animation {powerup.get('animation')!r}")
+        params = {"frames": atlas.frames(powerup["sprite"]), "animation": powerup["animation"]}
+        for key in POWERUP_PARAMS:
+            if key in powerup:
+                _require(_number(powerup[key]), f"{path}.{key}", "must be a number")
+                params[key] = powerup[key]
+        _require("spawn_interval" in params, f"{path}.spawn_interval", "is required")
+        _check_placement(powerup, path)
+        params.update((key, powerup[key]) for key in PLACEMENT_TUNING)
+        if name == "slow_motion":
+            # Skala 0 akan menghentikan jam simulasi
+            _require(0 < params.get("value", 0) <= 1, f"{path}.value", "must be a time scale in (0, 1]")
+        tables.powerups[name] = params
+        if "shop" in powerup:
+            _compile_shop(tables, name, powerup, path)
+        else:
+            _require("upgrades" not in powerup, f"{path}.upgrades", "needs a shop section")
+
+    achievements = data.get("achievements", {})
+    _require(isinstance(achievements, dict), f"{source}.achievements", "must be an object")
+    goals = {}
+    for name, achievement in achievements.items():
+        path = f"{source}.achievements.{name}"
+        _require(isinstance(achievement.get("title"), str), f"{path}.title", "must be a string")
+        _require(achievement.get("counter") in COUNTERS, f"{path}.counter", f"must be one of {COUNTERS}")
+        _require(achievement.get("scope") in SCOPES, f"{path}.scope", f"must be one of {SCOPES}")
+        _require(_number(achievement.get("goal")) and achievement["goal"] > 0, f"{path}.goal", "must be > 0")
+        tables.achievements[name] = (achievement["title"], achievement["counter"], achievement["scope"],
+                                     achievement["goal"])
+        goals.setdefault((achievement["counter"], achievement["scope"]), []).append((achievement["goal"], name))
+    tables.achievement_goals = {key: tuple(sorted(entries)) for key, entries in goals.items()}
+
+    boss = data.get("boss")
+    if boss is not None:
+        path = f"{source}.boss"
+        _require(isinstance(boss, dict), path, "must be an object")
+        _require(isinstance(boss.get("image"), str), f"{path}.image", "must be a file name")
+        _require(isinstance(boss.get("frames"), int) and boss["frames"] >= 1, f"{path}.frames", "must be >= 1")
+        for key in BOSS_TUNING:
+            _require(_number(boss.get(key)) and boss[key] > 0, f"{path}.{key}", "must be a number > 0")
+        tables.boss_timeline = _compile_timeline(boss.get("timeline"), tables.obstacle_ids, f"{path}.timeline")
+        _require(tables.boss_timeline[-1][1] == "leave", f"{path}.timeline", "must end with a leave event")
+        tables.boss = {key: boss[key] for key in ("image", "frames") + BOSS_TUNING}
+
+    return tables
+
+
+def load_entity_definitions(path, atlas):
+    """Read, validate and compile the entity definition file"""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return compile_entities(data, atlas, path)
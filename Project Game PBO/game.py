@@ -2,17 +2,52 @@ import pygame
 import sys
 import json
 import os
+import random
 from player import Player
 from obstacle_manager import ObstacleManager
 from coin_manager import coinmanager
 from powerup_manager import PowerupManager
+from atlas import TextureAtlas
+from asset_cache import AssetCache
+from run_history import RunHistory
+from stats import Stats
+from ui import MenuScreen, ShopScreen, SettingsScreen, PauseScreen, ControlsScreen
+from input_handler import InputHandler, FramePacer, InputRecorder, now_ms, migrate_recording
+from input_mapping import InputMapper
+from profiler import FrameProfiler
+from entity_defs import load_entity_definitions
+from terrain import Terrain
+from particles import ParticleSystem, COIN, SHIELD
+from animation import AnimationClock
+from snapshot import GameSnapshot, CheckpointRing
+from hot_reload import HotReloader
+from race_mode import RaceMode
+from sync_service import SyncClient, GhostRecorder
+from memory_report import MemoryMonitor
+from quality import QualityController
+from upgrades import UpgradeShop, migrate_save, SAVE_VERSION
+from projectiles import ProjectileBuffer
+from spawn_placement import SpawnPlacement
+from boss import BossEncounter
+from sim_clock import SimClock
+from scenes import (SceneStack, MenuScene, GameplayScene, ShopScene, SettingsScene, ControlsScene,
+                    PauseScene, RaceScene, PlaybackScene)
 
 class Game:
     # Class constants
     DEBUG_HITBOX = True
     WIDTH, HEIGHT = 620, 360
+    FPS = 60
+    STEP_MS = 1000 / FPS
+    MAX_FRAME_MS = 250
     SAVE_FILE = "save_data.json"
-    MENU, GAMEPLAY, SHOP, SETTING = 0, 1, 2, 3
+    HISTORY_FILE = "run_history.db"
+    ENTITY_FILE = "Data/entities.json"
+    SUSPEND_FILE = "suspend.json"
+    RETRY_REWIND_MS = 3000
+    MEMORY_BUDGETS = {}
+    MENU, GAMEPLAY, SHOP, SETTING, PAUSED, RACE = "menu", "gameplay", "shop", "setting", "paused", "race"
+    CONTROLS, PLAYBACK = "controls", "playback"
 
     def __init__(self):
         self._initialize_pygame()
@@ -24,6 +59,7 @@ class Game:
         self._load_save_data()
         self.load_sounds()  
         self._setup_settings()
+        self._setup_scenes()
         self.play_menu_music()
 
     def _initialize_pygame(self):
@@ -31,16 +67,45 @@ class Game:
         pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=2048)
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Runner Saga")
+        self.assets = AssetCache()
+        self.atlas = TextureAtlas(self.assets)
         self.clock = pygame.time.Clock()
+        self.input = InputHandler()
+        self.controls = InputMapper()
+        self.profiler = FrameProfiler()
         self.font = pygame.font.SysFont(None, 36)
+        self.small_font = pygame.font.SysFont(None, 22)
 
     def _setup_game_components(self):
         """Initialize all game components"""
-        self.game_state = self.MENU
         self.running = True
+        self.rng = random.Random()
+        self.particles = ParticleSystem()
+        self.run_seed = 0
+        self.sim_clock = SimClock(self.STEP_MS)
+        self.coins_banked = 0
+        self.checkpoints = CheckpointRing()
+        self.retry_snapshot = None
+        self.suspended_run = GameSnapshot.load(self.SUSPEND_FILE)
+        self.hot_reload = None
+        self.race = None
+        self.playback = None
+        self._shop_levels = None
+        self.record_path = None
+        self.recorder = None
+        self.sync = None
+        self.ghost = GhostRecorder()
+        self.memory = MemoryMonitor(self, self.MEMORY_BUDGETS)
+        self.quality = QualityController(self)
+        self.entities = load_entity_definitions(self.ENTITY_FILE, self.atlas)
+        self.animations = AnimationClock(self.entities.animations)
+        self.projectiles = ProjectileBuffer(self)
+        self.boss = BossEncounter(self)
         
         # Initialize game objects
         self.player = Player(self)
+        self.terrain = Terrain(self)
+        self.placement = SpawnPlacement(self)
         self.obstacle_manager = ObstacleManager(self)
         self.coin_manager = coinmanager(self)
         self.powerup_manager = PowerupManager(self)
@@ -52,16 +117,15 @@ class Game:
     def _setup_constants(self):
         self.WIDTH, self.HEIGHT = 620, 360
         self.SAVE_FILE = "save_data.json"
-        self.MENU, self.GAMEPLAY, self.SHOP, self.SETTING = 0, 1, 2, 3
         self.DEBUG_HITBOX = True
         
     def _initialize_game_components(self):
-        self.game_state = self.MENU
         self.running = True
         self._initialize_sound_system()
         self._setup_settings()
         
         self.player = Player(self)
+        self.terrain = Terrain(self)
         self.obstacle_manager = ObstacleManager(self)
         self.coin_manager = coinmanager(self)
         self.powerup_manager = PowerupManager(self)
@@ -74,54 +138,108 @@ class Game:
         self.settings = {
             "music_enabled": True,
             "sound_effects_enabled": True,
-            "hitbox_visible": self.DEBUG_HITBOX
+            "hitbox_visible": self.DEBUG_HITBOX,
+            "frame_pacing": "adaptive"
         }
         
     def _load_assets(self):
         try:
-            self.bg_img = pygame.image.load("assets/menu_start.png").convert()
-            self.start_img = pygame.image.load("assets/start.png").convert_alpha()
-            self.shop_img = pygame.image.load("assets/shop.png").convert_alpha()
-            self.setting_img = pygame.image.load("assets/setting.png").convert_alpha()
-            self.reset_img = pygame.image.load("assets/reset.png").convert_alpha()
+            self._read_assets()
         except Exception as e:
             print(f"Failed to load assets: {e}")
             pygame.quit()
             sys.exit()
+    
+    def _read_assets(self):
+        bg_img = self.assets.image("menu_start.png", alpha=False)
+        start_img, shop_img = self.atlas.frame("start"), self.atlas.frame("shop")
+        setting_img, reset_img = self.atlas.frame("setting"), self.atlas.frame("reset")
+        # Baru diganti setelah semuanya berhasil dimuat
+        self.bg_img, self.start_img, self.shop_img = bg_img, start_img, shop_img
+        self.setting_img, self.reset_img = setting_img, reset_img
+    
+    def reload_assets(self):
+        """Pick up edited menu images; if one fails to load the previous images stay in use"""
+        try:
+            self._read_assets()
+        except (pygame.error, OSError, KeyError, IndexError) as e:
+            print(f"Hot reload: keeping previous menu images: {e}")
+            return False
+        self._setup_buttons()
+        return True
             
     def _setup_buttons(self):
         self.start_button_rect = self.start_img.get_rect(center=(self.WIDTH // 2, 140))
         self.shop_rect = self.shop_img.get_rect(center=(self.WIDTH // 2, 180))
         self.setting_rect = self.setting_img.get_rect(center=(self.WIDTH // 2, 220))
         self.reset_rect = self.reset_img.get_rect(center=(self.WIDTH // 2, 270))
+        self.screens = {
+            self.MENU: MenuScreen(self),
+            self.SHOP: ShopScreen(self),
+            self.SETTING: SettingsScreen(self),
+            self.PAUSED: PauseScreen(self),
+            self.CONTROLS: ControlsScreen(self)
+        }
         
+    def _setup_scenes(self):
+        """Register every scene, start preloading them and open the menu"""
+        self.scenes = SceneStack()
+        self.scenes.register(self.MENU, MenuScene(self, self.MENU))
+        self.scenes.register(self.SHOP, ShopScene(self, self.SHOP))
+        self.scenes.register(self.SETTING, SettingsScene(self, self.SETTING))
+        self.scenes.register(self.CONTROLS, ControlsScene(self, self.CONTROLS))
+        self.scenes.register(self.PAUSED, PauseScene(self, self.PAUSED))
+        self.scenes.register(self.GAMEPLAY, GameplayScene(self))
+        self.scenes.register(self.RACE, RaceScene(self))
+        self.scenes.register(self.PLAYBACK, PlaybackScene(self))
+        self.scenes.preload()
+        self.scenes.switch(self.MENU)
+    
+    @property
+    def game_state(self):
+        """Get the key of the active scene"""
+        return self.scenes.key
+    
+    @game_state.setter
+    def game_state(self, key):
+        self.scenes.switch(key)
+    
+    @property
+    def run_time(self):
+        """Get the simulated ms of the current run (kept by the simulation clock)"""
+        return self.sim_clock.time
+    
+    @run_time.setter
+    def run_time(self, value):
+        self.sim_clock.time = value
+    
     def _load_save_data(self):
-        self.save_data = {"high_score": 0, "total_coin": 0}
-        self.shop_items = {
-            "shield": {"level": 1, "price": 100, "max_level": 5},
-            "double_jump": {"level": 1, "price": 150, "max_level": 3},
-            "multiplier": {"level": 1, "price": 200, "max_level": 3}
-        }
+        self.save_data = {"version": SAVE_VERSION, "high_score": 0, "total_coin": 0, "upgrades": {}}
+        self.upgrades = UpgradeShop(self)
         
         if os.path.exists(self.SAVE_FILE):
             with open(self.SAVE_FILE, "r") as f:
-                data = json.load(f)
+                data = migrate_save(json.load(f))
                 self.save_data.update(data)
-                if "shop_items" in data:
-                    self.shop_items.update(data["shop_items"])
+                self.upgrades.load(data["upgrades"])
+                self.controls.load(data.get("bindings", {}))
+        
+        self.run_history = RunHistory(self.HISTORY_FILE)
+        self.stats = Stats(self)
+        self.stats.load(*self.run_history.load_stats())
     
     def load_sounds(self):
         self.sounds = {}
         try:
             sound_files = {
-                'menu_music': 'assets/sound_menu.wav',
-                'gameplay_music': 'assets/sound_gameplay.wav',
-                'collectible': 'assets/sound_collectible.wav'
+                'menu_music': 'sound_menu.wav',
+                'gameplay_music': 'sound_gameplay.wav',
+                'collectible': 'sound_collectible.wav'
             }
             
             for name, path in sound_files.items():
-                if os.path.exists(path):
-                    self.sounds[name] = pygame.mixer.Sound(path)
+                if self.assets.exists(path):
+                    self.sounds[name] = self.assets.sound(path)
                     self.sounds[name].set_volume(0.7)
                 else:
                     print(f"Warning: Sound file {path} not found!")
@@ -140,61 +258,105 @@ class Game:
             }
 
     def save_game(self):
-        self.save_data["shop_items"] = self.shop_items
+        self.save_data["upgrades"] = self.upgrades.levels
+        self.save_data["bindings"] = self.controls.bindings
         with open(self.SAVE_FILE, "w") as f:
             json.dump(self.save_data, f)
     
     def reset_data(self):
-        self.save_data = {"high_score": 0, "total_coin": 0}
-        self.shop_items = {
-            "shield": {"level": 1, "price": 100, "max_level": 5},
-            "double_jump": {"level": 1, "price": 150, "max_level": 3},
-            "multiplier": {"level": 1, "price": 200, "max_level": 3}
-        }
+        self.save_data = {"version": SAVE_VERSION, "high_score": 0, "total_coin": 0}
+        self.upgrades.reset()
         self.save_game()
     
     def reset_audio(self):
         pygame.mixer.quit()
         pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
+        self.assets.clear_sounds()
         self.load_sounds()
         if self.settings["music_enabled"]:
             self.play_menu_music()
 
-    def reset_game(self):
+    def reset_game(self, seed=None):
+        """Start a new run; the whole run is determined by seed and the inputs"""
+        self.run_seed = random.randrange(2 ** 31) if seed is None else seed
+        self.rng.seed(self.run_seed)
+        self.sim_clock.reset()
+        self.coins_banked = 0
+        self.retry_snapshot = None
+        self.ghost.reset()
+        self.input.clear()
+        self.controls.clear()
+        self.animations.reset()
         self.player.reset()
+        self.terrain.reset(self.run_seed)
+        self.placement.reset()
+        self.stats.start_run()
+        self.boss.reset()
         self.obstacle_manager.reset()
         self.coin_manager.reset()
         self.powerup_manager.reset()
-        self.apply_upgrades()
+        self.particles.reset()
+        self.projectiles.reset()
+        self.upgrades.apply(self.powerup_manager)
+        self.checkpoints.reset()
+        if self.record_path is not None:
+            self.recorder = InputRecorder(self.run_seed, self.upgrades.levels)
     
-    def apply_upgrades(self):
-        """Apply shop upgrades to powerups"""
-        # Update shield properties through the MultiplierPowerup instance
-        shield_powerup = self.powerup_manager._shield
-        shield_powerup._max_hits = 1 + self.shop_items["shield"]["level"]
-        
-        # Update double jump properties through the DoubleJumpPowerup instance
-        dj_powerup = self.powerup_manager._double_jump
-        dj_powerup._duration = 20000 + (self.shop_items["double_jump"]["level"] * 10000)
-        
-        # Update multiplier properties through the MultiplierPowerup instance
-        multiplier_powerup = self.powerup_manager._multiplier
-        multiplier_powerup._value = 1 + (0.5 * self.shop_items["multiplier"]["level"])
-        
-        # Update spawn intervals
-        self.powerup_manager._shield._spawn_interval = max(3000, 10000 - (self.shop_items["shield"]["level"] * 1500))
-        self.powerup_manager._double_jump._spawn_interval = max(5000, 15000 - (self.shop_items["double_jump"]["level"] * 3000))
-        self.powerup_manager._multiplier._spawn_interval = max(8000, 15000 - (self.shop_items["multiplier"]["level"] * 2000))
+    def enable_hot_reload(self):
+        """Watch assets and entity definitions and apply edits while the game runs"""
+        self.hot_reload = HotReloader(self)
+    
+    def record_inputs(self, path):
+        """Save the inputs of every run to path (overwritten per run) for replay.py"""
+        self.record_path = path
+    
+    def enable_sync(self, address):
+        """Share results and ghosts with the leaderboard server at (host, port)"""
+        self.sync = SyncClient(address)
+    
+    def retune(self, entities):
+        """Swap in new entity definitions and push them into the running game"""
+        previous = self.entities
+        self.entities = entities
+        self.animations.load_clips(entities.animations)
+        self.player.retune()
+        self.terrain.retune()
+        self.obstacle_manager.retune(previous)
+        self.coin_manager.retune()
+        self.powerup_manager.retune()
+        self.projectiles.retune()
+        self.boss.retune()
+        self.upgrades.retune()
+        self.upgrades.apply(self.powerup_manager)
+        self.stats.retune()
     
     def check_collisions(self):
+        if self.player.rect.top > self.HEIGHT:
+            self.game_over("fall")
+            return
+        
+        arrow = self.projectiles.arrow_hit(self.player.rect.inflate(-80, -30))
+        if arrow >= 0:
+            if not self.powerup_manager.shield_active:
+                self.game_over("arrow")
+                return
+            # Perisai memantulkan panah kembali ke arah musuh
+            x, y = self.projectiles.center(arrow)
+            self.projectiles.reflect(arrow)
+            self.particles.burst(x, y, 12, SHIELD)
+            self.particles.flash(self.player.rect, (120, 160, 255))
+            self.powerup_manager.register_shield_hit()
+        
         # Update untuk obstacle berbasis class
         for obstacle in self.obstacle_manager.obstacles[:]:
             if self.player.rect.inflate(-80, -30).colliderect(obstacle.rect):
                 if self.powerup_manager.shield_active:
-                    self.obstacle_manager.obstacles.remove(obstacle)
+                    self.obstacle_manager.remove(obstacle)
+                    self.particles.burst(obstacle.rect.centerx, obstacle.rect.centery, 12, SHIELD)
+                    self.particles.flash(self.player.rect, (120, 160, 255))
                     if self.powerup_manager.register_shield_hit():
                         continue
-                self.game_over()
+                self.game_over(obstacle.type)
                 break
         
         # Update untuk coin collision
@@ -202,106 +364,145 @@ class Game:
             if self.player.rect.inflate(-80, -30).colliderect(coin):
                 self.coin_manager.coins.remove(coin)
                 self.player.coin_score += 1
+                self.stats.add("coins")
+                self.particles.burst(coin.centerx, coin.centery, 10, COIN, speed=2.0)
                 self.play_collectible_sound()
     
-    def game_over(self):
+    def game_over(self, cause="unknown"):
+        if self.playback is not None:
+            # Rekaman yang diputar ulang bukan run baru: tidak disimpan dan tidak dihitung
+            self.stop_playback()
+            return
+        # Slow motion berakhir bersama run-nya
+        self.sim_clock.time_scale = 1.0
         if self.player.score > self.save_data["high_score"]:
             self.save_data["high_score"] = self.player.score
-        self.save_data["total_coin"] += self.player.coin_score
+        # Koin yang sudah dihitung sebelum retry dari checkpoint tidak dihitung dua kali
+        self.save_data["total_coin"] += self.player.coin_score - self.coins_banked
+        self.coins_banked = self.player.coin_score
         self.save_game()
-        self.game_state = self.MENU
+        self.stats.end_run()
+        self.run_history.record_run(
+            self.player.score,
+            self.player.coin_score,
+            self.run_time,
+            self.run_seed,
+            self.powerup_manager.powerups_used,
+            cause
+        )
+        if self.recorder is not None:
+            self.recorder.save(self.record_path, round(self.run_time / self.STEP_MS))
+            self.recorder = None
+        # Di luar gameplay: aman untuk mengecek budget memori dan membuang aset
+        self.memory.enforce()
+        if self.sync is not None:
+            self.sync.submit_run(self.player.score, self.player.coin_score, self.run_time,
+                                 self.run_seed, cause, self.ghost.samples)
+        self.retry_snapshot = self.checkpoints.before(self.run_time - self.RETRY_REWIND_MS)
+        self.scenes.switch(self.MENU)
         self.play_menu_music()
     
-    def update(self, dt):
-        if self.game_state == self.GAMEPLAY:
-            self.player.update(dt)
-            self.obstacle_manager.update(dt)
-            self.coin_manager.update(dt)
-            self.powerup_manager.update(dt)
-            self.check_collisions()
-            
-            if self.player.score_timer >= self.player.score_interval:
-                self.player.score_timer = 0
-                self.player.score += self.powerup_manager.multiplier_value
+    def start_run(self):
+        self.scenes.switch(self.GAMEPLAY)
+        self.play_gameplay_music()
+        self.reset_game()
+    
+    def pause_game(self):
+        """Show the pause overlay over the frozen gameplay frame"""
+        self.scenes.push(self.PAUSED)
+    
+    def resume_game(self):
+        self.scenes.pop()
+    
+    def retry_from_checkpoint(self):
+        """Restart the last run from a checkpoint a few seconds before it ended"""
+        self.retry_snapshot.restore(self)
+        self.retry_snapshot = None
+        self.ghost.truncate(self.run_time)
+        # Rekaman input hanya valid untuk run yang dimulai dari seed-nya
+        self.recorder = None
+        self.coins_banked = self.player.coin_score
+        self.checkpoints.reset()
+        self.scenes.switch(self.GAMEPLAY)
+        self.play_gameplay_music()
+    
+    def continue_suspended_run(self):
+        """Resume the run that was in progress when the game was last closed"""
+        self.reset_game()
+        self.suspended_run.restore(self)
+        self.suspended_run = None
+        if os.path.exists(self.SUSPEND_FILE):
+            os.remove(self.SUSPEND_FILE)
+        self.scenes.switch(self.GAMEPLAY)
+        self.play_gameplay_music()
+    
+    def start_race(self):
+        """Start a two-player split-screen race on a fresh seeded track"""
+        RaceMode(self).start()
+        self.scenes.switch(self.RACE)
+        self.play_gameplay_music()
+    
+    def end_race(self):
+        self.race.stop()
+        self.scenes.switch(self.MENU)
+        self.play_menu_music()
+    
+    def play_recording(self, path):
+        """Watch a recording made with --record in the replay viewer"""
+        with open(path, "r") as f:
+            recording = migrate_recording(json.load(f))
+        # Level toko rekaman hanya dipakai selama diputar; level pemain dikembalikan setelahnya
+        self._shop_levels = self.upgrades.levels
+        for name, level in recording["shop"].items():
+            self.upgrades.set_level(name, level)
+        self.playback = recording
+        self.scenes.switch(self.PLAYBACK)
+        self.play_gameplay_music()
+        self.reset_game(recording["seed"])
+        self.recorder = None
+    
+    def stop_playback(self):
+        for name, level in self._shop_levels.items():
+            self.upgrades.set_level(name, level)
+        self.playback = None
+        self.scenes.switch(self.MENU)
+        self.play_menu_music()
+    
+    def suspend_run(self):
+        """Write the run in progress to disk so it can be continued next launch"""
+        try:
+            GameSnapshot.capture(self).save(self.SUSPEND_FILE)
+        except OSError as e:
+            print(f"Warning: could not suspend run: {e}")
+    
+    def update(self, dt, until=None):
+        """Advance one simulation tick of the active scene"""
+        self.scenes.update(dt, until)
     
     def handle_events(self):
-        for event in pygame.event.get():
+        for stamp, event in self.input.poll():
+            self.controls.device_event(event)
             if event.type == pygame.QUIT:
                 self.running = False
-            
-            if self.game_state == self.MENU:
-                self._handle_menu_events(event)
-            elif self.game_state == self.GAMEPLAY:
-                self._handle_gameplay_events(event)
-            elif self.game_state == self.SHOP:
-                self._handle_shop_events(event)
-            elif self.game_state == self.SETTING:
-                self._handle_settings_events(event)
-    
-    def _handle_menu_events(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
-            if self.start_button_rect.collidepoint(mouse_pos):
-                self.game_state = self.GAMEPLAY
-                self.play_gameplay_music()
-                self.reset_game()
-            elif self.shop_rect.collidepoint(mouse_pos):
-                self.game_state = self.SHOP
-            elif self.setting_rect.collidepoint(mouse_pos):
-                self.game_state = self.SETTING
-            elif self.reset_rect.collidepoint(mouse_pos):
-                self.reset_data()
-    
-    def _handle_gameplay_events(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_DOWN:
-                self.player.start_roll()
-            elif event.key in (pygame.K_SPACE, pygame.K_UP):
-                self.player.jump()
-            elif event.key == pygame.K_s:
-                self.player.attack()
-            elif event.key == pygame.K_ESCAPE:
-                self.game_state = self.MENU
-                self.play_menu_music()
-            elif event.key == pygame.K_q:
-                self.settings["hitbox_visible"] = not self.settings["hitbox_visible"]
+                if self.GAMEPLAY in self.scenes:
+                    self.suspend_run()
+            self.scenes.handle_event(stamp, event)
     
-    def _handle_shop_events(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
-            back_btn, buy_buttons = self.draw_shop()
-            
-            if back_btn.collidepoint(mouse_pos):
-                self.game_state = self.MENU
-            else:
-                for item, btn_rect in buy_buttons:
-                    if btn_rect.collidepoint(mouse_pos):
-                        self.buy_item(item)
-                        self.play_collectible_sound()
-                        break
-
-    def _handle_settings_events(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
-            back_btn, music_btn, sfx_btn = self.draw_settings()
-            
-            if back_btn.collidepoint(mouse_pos):
-                self.game_state = self.MENU
-            elif music_btn.collidepoint(mouse_pos):
-                self.toggle_music()
-            elif sfx_btn.collidepoint(mouse_pos):
-                self.toggle_sound_effects()
+    def print_memory_report(self):
+        """Print bytes per asset, sound and entity pool plus the top Python allocations"""
+        for line in self.memory.format():
+            print(line)
+        allocations = self.memory.python_snapshot()
+        if not allocations:
+            print("tracemalloc started; press F4 again for Python allocations")
+        for where, size, growth in allocations:
+            print(f"  {where}: {size / 1024:.1f} KB ({growth / 1024:+.1f} KB)")
     
     def buy_item(self, item):
-        if self.save_data['total_coin'] >= self.shop_items[item]['price']:
-            self.save_data['total_coin'] -= self.shop_items[item]['price']
-            self.shop_items[item]['level'] += 1
-            self.shop_items[item]['price'] = int(self.shop_items[item]['price'] * 1.5)
+        spent = self.upgrades.buy(item, self.save_data['total_coin'])
+        if spent:
+            self.save_data['total_coin'] -= spent
             self.save_game()
-            
-            self.draw_shop()
-            pygame.display.flip()
-            pygame.time.delay(100)
     
     def toggle_music(self):
         self.settings["music_enabled"] = not self.settings["music_enabled"]
@@ -343,172 +544,39 @@ class Game:
             return
         self.sounds['collectible'].play()
     
-    def draw_shop(self):
-        self.screen.blit(self.bg_img, (0, 0))
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        coins_text = self.font.render(f"Coins: {self.save_data['total_coin']}", True, (255, 255, 0))
-        self.screen.blit(coins_text, (self.WIDTH - 150, 20))
-        
-        title = self.font.render("SHOP", True, (255, 255, 255))
-        self.screen.blit(title, (self.WIDTH//2 - title.get_width()//2, 50))
-        
-        back_btn = pygame.Rect(20, 20, 80, 40)
-        pygame.draw.rect(self.screen, (200, 50, 50), back_btn)
-        self.screen.blit(self.font.render("Back", True, (255, 255, 255)), (back_btn.x + 20, back_btn.y + 10))
-        
-        buttons = []
-        y_pos = 100
-        
-        for item, data in self.shop_items.items():
-            img = None
-            if item == "shield":
-                img = self.powerup_manager._shield._frames[0]
-            elif item == "double_jump":
-                img = self.powerup_manager._double_jump._frames[0]
-            else:
-                img = self.powerup_manager._multiplier._frames[0]
-            
-            img = pygame.transform.scale(img, (50, 50))
-            self.screen.blit(img, (50, y_pos))
-            
-            self.screen.blit(self.font.render(f"{item.replace('_', ' ').title()}", True, (255, 255, 255)), (120, y_pos))
-            self.screen.blit(self.font.render(f"Lvl: {data['level']}/{data['max_level']}", True, (200, 200, 200)), (120, y_pos + 25))
-            
-            if data['level'] < data['max_level']:
-                btn_rect = pygame.Rect(self.WIDTH - 150, y_pos + 10, 120, 40)
-                btn_color = (50, 200, 50) if self.save_data['total_coin'] >= data['price'] else (100, 100, 100)
-                pygame.draw.rect(self.screen, btn_color, btn_rect)
-                self.screen.blit(self.font.render(f"Buy: {data['price']}", True, (255, 255, 255)), (self.WIDTH - 140, y_pos + 20))
-                buttons.append((item, btn_rect))
-            
-            y_pos += 80
-        
-        return back_btn, buttons
-    
-    def draw_settings(self):
-        self.screen.blit(self.bg_img, (0, 0))
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        title = self.font.render("SETTINGS", True, (255, 255, 255))
-        self.screen.blit(title, (self.WIDTH//2 - title.get_width()//2, 50))
-        
-        back_btn = pygame.Rect(20, 20, 90, 40)
-        pygame.draw.rect(self.screen, (200, 50, 50), back_btn)
-        self.screen.blit(self.font.render("Back", True, (255, 255, 255)), (back_btn.x + 15, back_btn.y + 10))
-
-        music_btn = pygame.Rect(self.WIDTH//2 - 100, 120, 260, 50)
-        btn_color = (50, 200, 50) if self.settings["music_enabled"] else (200, 50, 50)
-        pygame.draw.rect(self.screen, btn_color, music_btn)
-        status = "ON" if self.settings["music_enabled"] else "OFF"
-        self.screen.blit(self.font.render(f"Music:            {status}", True, (255, 255, 255)), 
-                        (music_btn.x + 50, music_btn.y + 15))
-        
-        sfx_btn = pygame.Rect(self.WIDTH//2 - 100, 190, 260, 50)
-        btn_color = (50, 200, 50) if self.settings["sound_effects_enabled"] else (200, 50, 50)
-        pygame.draw.rect(self.screen, btn_color, sfx_btn)
-        status = "ON" if self.settings["sound_effects_enabled"] else "OFF"
-        self.screen.blit(self.font.render(f"Sound Effects: {status}", True, (255, 255, 255)), 
-                        (sfx_btn.x + 30, sfx_btn.y + 15))
-        
-        hitbox_text = self.font.render("Press Q in-game to toggle hitboxes", True, (255, 255, 255))
-        self.screen.blit(hitbox_text, (self.WIDTH//2 - hitbox_text.get_width()//2, 260))
-        
-        return back_btn, music_btn, sfx_btn
-    
     def render(self):
-        if self.game_state == self.MENU:
-            self._render_menu()
-        elif self.game_state == self.SHOP:
-            self.draw_shop()
-        elif self.game_state == self.SETTING:
-            self.draw_settings()
-        elif self.game_state == self.GAMEPLAY:
-            self._render_gameplay()
-        
+        self.scenes.render(self.screen)
         pygame.display.flip()
     
-    def _render_menu(self):
-        self.screen.blit(self.bg_img, (0, 0))
-        self.screen.blit(self.start_img, self.start_button_rect)
-        self.screen.blit(self.shop_img, self.shop_rect)
-        self.screen.blit(self.setting_img, self.setting_rect)
-        self.screen.blit(self.reset_img, self.reset_rect)
-        
-        self.screen.blit(
-            self.font.render(f"High Score: {int(self.save_data['high_score'])}", True, (255, 255, 255)), 
-            (10, 10)
-        )
-        self.screen.blit(
-            self.font.render(f"Total Coins: {self.save_data['total_coin']}", True, (255, 255, 0)), 
-            (10, 40)
-        )
-    
-    def _render_gameplay(self):
-        self.screen.blit(self.bg_img, (self.player.bg_scroll_x - self.WIDTH, 0))
-        self.screen.blit(self.bg_img, (self.player.bg_scroll_x, 0))
-        
-        self.obstacle_manager.draw(self.screen)
-        self.coin_manager.draw(self.screen)
-        self.powerup_manager.draw(self.screen)
-        self.player.draw(self.screen)
-        
-        self.screen.blit(
-            self.font.render(f"Score: {int(self.player.score)}", True, (255, 255, 255)), 
-            (10, 10)
-        )
-        self.screen.blit(
-            self.font.render(f"Coins: {self.player.coin_score}", True, (255, 255, 0)), 
-            (10, 40)
-        )
-        
-        if self.powerup_manager.double_jump_active:
-            dj_powerup = self.powerup_manager._double_jump
-            elapsed = pygame.time.get_ticks() - dj_powerup._timer
-            self.screen.blit(
-                self.font.render(f"Double Jump: {(dj_powerup._duration - elapsed)//1000}s", True, (0, 255, 0)), 
-                (self.WIDTH - 220, 10)
-            )
-        
-        if self.powerup_manager.shield_active:
-            shield_powerup = self.powerup_manager._shield
-            self.screen.blit(
-                self.font.render(f"Shield: {shield_powerup.hits_remaining} hits", True, (128, 128, 255)), 
-                (self.WIDTH - 220, 40)
-            )
-        
-        if self.powerup_manager.multiplier_active:
-            multiplier_powerup = self.powerup_manager._multiplier
-            elapsed = pygame.time.get_ticks() - multiplier_powerup._timer
-            self.screen.blit(
-                self.font.render(f"Multiplier: {(multiplier_powerup._duration - elapsed)//1000}s", True, (255, 215, 0)), 
-                (self.WIDTH - 220, 70)
-            )
-        
-        if self.settings["hitbox_visible"]:
-            pygame.draw.rect(self.screen, (255, 0, 0), self.player.rect.inflate(-80, -30), 2)
-            for c in self.coin_manager.coins:
-                pygame.draw.rect(self.screen, (255, 255, 0), c, 2)
-            for obstacle in self.obstacle_manager.obstacles:
-                color = (255, 255, 255) if obstacle.type == "arrow" else (0, 0, 255)
-                pygame.draw.rect(self.screen, color, obstacle.rect, 2)
-            for dj in self.powerup_manager._double_jump._instances:
-                pygame.draw.rect(self.screen, (0, 255, 0), dj, 2)
-            for s in self.powerup_manager._shield._instances:
-                pygame.draw.rect(self.screen, (0, 0, 255), s, 2)
-            for m in self.powerup_manager._multiplier._instances:
-                pygame.draw.rect(self.screen, (255, 165, 0), m, 2)
-    
     def run(self):
+        pacer = FramePacer(self.clock, self.FPS, self.settings["frame_pacing"])
+        previous = now_ms()
         while self.running:
-            dt = self.clock.tick(60)
+            pacer.wait()
+            # Event di-poll sebelum now diambil, jadi semuanya jatuh tempo di tick frame ini
             self.handle_events()
-            self.update(dt)
+            now = now_ms()
+            self.profiler.frame_started(now)
+            elapsed = min(now - previous, self.MAX_FRAME_MS)
+            previous = now
+            
+            if self.hot_reload is not None:
+                self.hot_reload.apply()
+            self.scenes.warm_pending()
+            # Fixed timestep: sim_clock menentukan berapa tick yang jatuh tempo, berakhir di tick_end
+            for tick_end in self.sim_clock.ticks(now, elapsed):
+                self.update(self.STEP_MS, tick_end)
+            
             self.render()
-        
+            self.profiler.frame_presented(now_ms())
+            self.quality.update()
+        
+        print(f"Profiler: {self.profiler.report()}")
+        if self.hot_reload is not None:
+            self.hot_reload.close()
+        if self.sync is not None:
+            self.sync.close()
+        self.stats.flush()
+        self.run_history.close()
         pygame.quit()
         sys.exit()
\ No newline at end of file
@@ -0,0 +1,137 @@
+import os
+import queue
+import threading
+import pygame
+from asset_bundle import ASSET_DIR, BUNDLE_FILE
+from entity_defs import load_entity_definitions
+
+SOUND_EXTENSIONS = (".wav", ".ogg", ".mp3")
+
+
+class FileWatcher:
+    """Polls modification times of files and directories on a daemon thread.
+
+    The thread only calls os.stat; changed paths are handed over through a queue
+    and picked up by the main loop with changes(), so nothing is loaded or drawn
+    off the main thread. A change is reported once the file has looked the same
+    for two polls, so half-written files from an editor are skipped."""
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self._paths = paths
+        self._interval = interval
+        self._changes = queue.Queue()
+        self._stop = threading.Event()
+        self._seen = self._scan()
+        self._pending = {}
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def _scan(self):
+        """Get (mtime, size) of every watched file"""
+        files = {}
+        for path in self._paths:
+            names = [os.path.join(path, name) for name in os.listdir(path)] if os.path.isdir(path) else [path]
+            for name in names:
+                try:
+                    stat = os.stat(name)
+                except OSError:
+                    continue
+                files[name] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            current = self._scan()
+            for path, signature in current.items():
+                if self._seen.get(path) == signature:
+                    self._pending.pop(path, None)
+                elif self._pending.get(path) == signature:
+                    # Tidak berubah sejak poll sebelumnya: penulisan sudah selesai
+                    del self._pending[path]
+                    self._seen[path] = signature
+                    self._changes.put(path)
+                else:
+                    self._pending[path] = signature
+
+    def changes(self):
+        """Get the paths that changed since the last call (never blocks)"""
+        changed = set()
+        while True:
+            try:
+                changed.add(self._changes.get_nowait())
+            except queue.Empty:
+                return changed
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class HotReloader:
+    """Development mode that applies edited assets and tuning to the running game.
+
+    Only the changed files are reloaded: an edited sheet is re-sliced into the
+    atlas, the entity definitions are recompiled from the already decoded frames,
+    and the result is pushed into the live managers without resetting the run."""
+
+    def __init__(self, game):
+        self._game = game
+        self._watcher = FileWatcher([ASSET_DIR, game.ENTITY_FILE])
+
+    def apply(self):
+        """Apply pending changes; called once per frame from the main loop"""
+        changed = self._watcher.changes()
+        if not changed:
+            return
+        game = self._game
+        entity_file = os.path.normpath(game.ENTITY_FILE)
+        images = sounds = False
+        for path in sorted(changed):
+            if os.path.normpath(path) == entity_file:
+                continue
+            name = os.path.basename(path)
+            if name.lower() == BUNDLE_FILE:
+                print("Hot reload: asset bundle rebuilt, restart to use it")
+                continue
+            game.assets.reload(name)
+            if name.lower().endswith(SOUND_EXTENSIONS):
+                sounds = True
+            elif self._reload_image(name):
+                images = True
+
+        if sounds:
+            game.load_sounds()
+        if images and not game.reload_assets():
+            for screen in game.screens.values():
+                screen.invalidate()
+        if images or entity_file in map(os.path.normpath, changed):
+            self._reload_entities()
+
+    def _reload_image(self, name):
+        """Reload one image; a file that cannot be decoded leaves the old one in use"""
+        game = self._game
+        if name.lower().endswith(".json"):
+            return game.atlas.reload(name)
+        try:
+            game.assets.image(name)
+        except (pygame.error, OSError) as e:
+            print(f"Hot reload: skipped {name}: {e}")
+            return False
+        game.atlas.reload(name)
+        print(f"Hot reload: {name}")
+        return True
+
+    def _reload_entities(self):
+        game = self._game
+        try:
+            entities = load_entity_definitions(game.ENTITY_FILE, game.atlas)
+        except (OSError, ValueError) as e:
+            print(f"Hot reload: keeping previous definitions: {e}")
+            return
+        game.retune(entities)
+        print(f"Hot reload: {game.ENTITY_FILE}")
+
+    def close(self):
+        self._watcher.close()
@@ -0,0 +1,127 @@
+import json
+import time
+from collections import deque
+import pygame
+from input_mapping import DEFAULT_KEYS, ACTION_BITS
+
+RECORDING_VERSION = 2
+
+
+def now_ms():
+    """High resolution monotonic time in milliseconds"""
+    return time.perf_counter() * 1000.0
+
+
+def migrate_recording(data):
+    """Version 1 stored pygame key names; they become action masks under the default bindings"""
+    if data.get("version", 1) == 1:
+        bits = {key: ACTION_BITS[name] for name, keys in DEFAULT_KEYS.items() for key in keys}
+        data["inputs"] = [(tick, bits[key]) for tick, key in data["inputs"] if key in bits]
+        data["version"] = 2
+    return data
+
+
+class InputHandler:
+    """Timestamps events when they are polled so the fixed-step loop can apply each
+    one at the simulation tick it belongs to.
+
+    pygame does not say when an event arrived, only that it arrived since the
+    previous poll, so events are stamped with the middle of that interval. The
+    latency measured from the stamp therefore includes the wait for the poll."""
+
+    def __init__(self):
+        self._pending = deque()
+        self._last_poll = now_ms()
+
+    def poll(self):
+        """Drain the pygame queue and return (timestamp_ms, event) pairs"""
+        polled = now_ms()
+        stamp = (self._last_poll + polled) / 2
+        self._last_poll = polled
+        return [(stamp, event) for event in pygame.event.get()]
+
+    def queue(self, stamp, event):
+        """Keep a gameplay event until the tick covering its timestamp runs"""
+        self._pending.append((stamp, event))
+
+    def due(self, until=None):
+        """Pop every queued event stamped before until (all of them if None)"""
+        pending = self._pending
+        while pending and (until is None or pending[0][0] < until):
+            yield pending.popleft()
+
+    def clear(self):
+        self._pending.clear()
+
+    @property
+    def pending(self):
+        """Get the number of events waiting for their tick"""
+        return len(self._pending)
+
+
+class FramePacer:
+    """Frame limiter with selectable strategy:
+    - "default": pygame Clock.tick (cheap, can oversleep by a few ms)
+    - "busy": Clock.tick_busy_loop (exact, burns a core)
+    - "adaptive": sleep until shortly before the deadline, then spin"""
+
+    MODES = ("default", "busy", "adaptive")
+    SPIN_MS = 2.0
+
+    def __init__(self, clock, fps, mode="adaptive"):
+        self._clock = clock
+        self._fps = fps
+        self._frame_ms = 1000.0 / fps
+        self._deadline = now_ms() + self._frame_ms
+        self.mode = mode
+
+    def wait(self):
+        """Block until the next frame should start"""
+        if self.mode == "default":
+            self._clock.tick(self._fps)
+        elif self.mode == "busy":
+            self._clock.tick_busy_loop(self._fps)
+        else:
+            remaining = self._deadline - now_ms()
+            if remaining > self.SPIN_MS:
+                time.sleep((remaining - self.SPIN_MS) / 1000.0)
+            while now_ms() < self._deadline:
+                pass
+        current = now_ms()
+        self._deadline += self._frame_ms
+        # Jika tertinggal lebih dari satu frame, jangan coba mengejar
+        if self._deadline < current:
+            self._deadline = current + self._frame_ms
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, value):
+        if value not in self.MODES:
+            raise ValueError(f"Unknown frame pacing mode: {value}")
+        self._mode = value
+
+
+class InputRecorder:
+    """Collects the action mask of every tick of a run that had any action pressed"""
+
+    def __init__(self, seed, shop_levels):
+        self._seed = seed
+        self._shop_levels = shop_levels
+        self._inputs = []
+
+    def record(self, tick, actions):
+        if actions:
+            self._inputs.append((tick, actions))
+
+    def save(self, path, ticks):
+        with open(path, "w") as f:
+            json.dump({
+                "version": RECORDING_VERSION,
+                "seed": self._seed,
+                "shop": self._shop_levels,
+                "ticks": ticks,
+                "inputs": self._inputs,
+            }, f)
@@ -0,0 +1,143 @@
+import pygame
+
+# Satu bit per aksi; game logic hanya menguji bit ini, tidak lagi membaca event
+ACTIONS = ("jump", "roll", "attack", "throw", "pause", "hitboxes")
+JUMP, ROLL, ATTACK, THROW, PAUSE, HITBOXES = (1 << i for i in range(len(ACTIONS)))
+ACTION_BITS = {name: 1 << i for i, name in enumerate(ACTIONS)}
+
+DEFAULT_KEYS = {
+    "jump": ("space", "up"),
+    "roll": ("down",),
+    "attack": ("s",),
+    "throw": ("a",),
+    "pause": ("escape", "p"),
+    "hitboxes": ("q",),
+}
+# Tata letak tombol gamepad umum (A, B, X, Y, ..., Start)
+DEFAULT_BUTTONS = {
+    "jump": (0,),
+    "roll": (1,),
+    "attack": (2,),
+    "throw": (3,),
+    "pause": (7,),
+    "hitboxes": (),
+}
+
+
+class InputMapper:
+    """Maps keyboard and gamepad input to a bitmask of actions, once per tick.
+
+    Discrete presses (keys, pad buttons) come in as the timestamped events that
+    are due this tick, so a tap shorter than a tick is never lost. The D-pad and
+    the left stick are polled once per tick and count as pressed on the tick
+    they cross into a direction. Replays inject recorded masks instead."""
+
+    AXIS_DEADZONE = 0.6
+
+    def __init__(self):
+        self._keys = {}
+        self._buttons = {}
+        self._joysticks = {}
+        self._pad_held = 0
+        self._injected = 0
+        self.pressed = 0
+        self.reset_bindings()
+
+    def reset_bindings(self):
+        self.load({"keys": DEFAULT_KEYS, "buttons": DEFAULT_BUTTONS})
+
+    def load(self, bindings):
+        """Take saved bindings; actions missing from them keep the defaults"""
+        keys = dict(DEFAULT_KEYS, **bindings.get("keys", {}))
+        buttons = dict(DEFAULT_BUTTONS, **bindings.get("buttons", {}))
+        self._keys = {}
+        self._buttons = {}
+        for name in ACTIONS:
+            for key in keys[name]:
+                self._keys[pygame.key.key_code(key)] = ACTION_BITS[name]
+            for button in buttons[name]:
+                self._buttons[int(button)] = ACTION_BITS[name]
+
+    def rebind(self, action, key):
+        """Make key the only key of action; it is taken away from any other action"""
+        bit = ACTION_BITS[action]
+        self._keys = {k: b for k, b in self._keys.items() if b != bit and k != key}
+        self._keys[key] = bit
+
+    def rebind_button(self, action, button):
+        bit = ACTION_BITS[action]
+        self._buttons = {k: b for k, b in self._buttons.items() if b != bit and k != button}
+        self._buttons[button] = bit
+
+    def key_names(self, action):
+        bit = ACTION_BITS[action]
+        return [pygame.key.name(key) for key, b in self._keys.items() if b == bit]
+
+    def button_numbers(self, action):
+        bit = ACTION_BITS[action]
+        return sorted(button for button, b in self._buttons.items() if b == bit)
+
+    @property
+    def bindings(self):
+        """Get the bindings in the form kept in the save data"""
+        return {
+            "keys": {name: self.key_names(name) for name in ACTIONS},
+            "buttons": {name: self.button_numbers(name) for name in ACTIONS},
+        }
+
+    def event_bits(self, event):
+        """Get the action bits pressed by one event (0 for anything else)"""
+        if event.type == pygame.KEYDOWN:
+            return self._keys.get(event.key, 0)
+        if event.type == pygame.JOYBUTTONDOWN:
+            return self._buttons.get(event.button, 0)
+        return 0
+
+    def device_event(self, event):
+        """Open or forget a gamepad when it is plugged in or out (in every scene)"""
+        if event.type == pygame.JOYDEVICEADDED:
+            joystick = pygame.joystick.Joystick(event.device_index)
+            self._joysticks[joystick.get_instance_id()] = joystick
+        elif event.type == pygame.JOYDEVICEREMOVED:
+            self._joysticks.pop(event.instance_id, None)
+
+    def _poll_pads(self):
+        """Read the D-pad and left stick of every pad into held bits"""
+        held = 0
+        for joystick in self._joysticks.values():
+            if joystick.get_numhats():
+                _, hat_y = joystick.get_hat(0)
+                if hat_y > 0:
+                    held |= JUMP
+                elif hat_y < 0:
+                    held |= ROLL
+            if joystick.get_numaxes() > 1:
+                stick_y = joystick.get_axis(1)
+                if stick_y < -self.AXIS_DEADZONE:
+                    held |= JUMP
+                elif stick_y > self.AXIS_DEADZONE:
+                    held |= ROLL
+        return held
+
+    def poll(self, pressed=0):
+        """Finish this tick's mask: pressed bits from due events plus pad edges and injected bits"""
+        held = self._poll_pads() if self._joysticks else 0
+        pressed |= held & ~self._pad_held
+        self._pad_held = held
+        self.pressed = pressed | self._injected
+        self._injected = 0
+        return self.pressed
+
+    def inject(self, mask):
+        """Press actions on the next tick without a device (replays, tools)"""
+        self._injected |= mask
+
+    def clear(self):
+        """Drop pending presses; a direction still held does not count as a new press"""
+        self._injected = 0
+        self.pressed = 0
+        self._pad_held = self._poll_pads() if self._joysticks else 0
+
+    @property
+    def joysticks(self):
+        return len(self._joysticks)
@@ -1,5 +1,17 @@
+import sys
 from game import Game
+from sync_service import parse_address
 
 if __name__ == "__main__":
     game = Game()
+    if "--hot-reload" in sys.argv:
+        game.enable_hot_reload()
+    if "--record" in sys.argv[:-1]:
+        game.record_inputs(sys.argv[sys.argv.index("--record") + 1])
+    if "--sync" in sys.argv[:-1]:
+        game.enable_sync(parse_address(sys.argv[sys.argv.index("--sync") + 1]))
+    if "--play" in sys.argv[:-1]:
+        game.play_recording(sys.argv[sys.argv.index("--play") + 1])
+    if "--quality" in sys.argv[:-1]:
+        game.quality.pin(int(sys.argv[sys.argv.index("--quality") + 1]))
     game.run()
\ No newline at end of file
@@ -0,0 +1,173 @@
+import sys
+import tracemalloc
+import pygame
+
+MB = 1024 * 1024
+
+# Batas default per kategori dalam byte; bisa diganti lewat Game.MEMORY_BUDGETS
+DEFAULT_BUDGETS = {
+    "images": 32 * MB,
+    "sounds": 48 * MB,
+    "entities": 1 * MB,
+    "python": 64 * MB,
+}
+
+
+def surface_bytes(surface):
+    """Pixel bytes owned by a Surface; subsurfaces share their parent's pixels"""
+    if surface.get_parent() is not None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+
+def sound_bytes(sound):
+    """PCM bytes held by a mixer Sound, derived from its length and the mixer format"""
+    mixer = pygame.mixer.get_init()
+    if mixer is None:
+        return 0
+    frequency, size, channels = mixer
+    return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+
+def _object_bytes(obj):
+    """Shallow size of an object plus its instance dict"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def nested_bytes(value):
+    """Size of a tree of tuples and lists, such as a captured snapshot"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(nested_bytes(item) for item in value)
+    return size
+
+
+def pool_bytes(items):
+    """Size of an entity list and the objects (plus their Rects) in it"""
+    size = sys.getsizeof(items)
+    for item in items:
+        size += _object_bytes(item)
+        rect = getattr(item, "rect", None)
+        if rect is not None:
+            size += sys.getsizeof(rect)
+    return size
+
+
+class MemoryMonitor:
+    """Memory accounting for assets, mixer sounds and entity pools.
+
+    measure() walks the caches and pools (cheap, no allocation tracking) and
+    returns bytes per item and per category. Python heap usage is only known
+    while tracemalloc is tracing, which python_snapshot() turns on when first
+    asked since tracing slows every allocation down. enforce() compares the
+    totals with the budgets, evicts cached assets that nothing else references
+    and warns about the rest."""
+
+    def __init__(self, game, budgets=None):
+        self._game = game
+        self.budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        self._baseline = None
+
+    def measure(self):
+        """Get {category: {"total": bytes, "items": {name: bytes}}}"""
+        game = self._game
+        images = {name: surface_bytes(surface) for name, surface in game.assets.images.items()}
+        sounds = {name: sound_bytes(sound) for name, sound in game.assets.sounds.items()}
+        for name, sound in game.sounds.items():
+            # Suara cadangan yang tidak berasal dari cache tetap dihitung
+            if sound is not None and all(sound is not cached for cached in game.assets.sounds.values()):
+                sounds[f"<{name}>"] = sound_bytes(sound)
+        particles = game.particles
+        entities = {
+            "obstacles": pool_bytes(game.obstacle_manager.obstacles),
+            "enemy_ai": game.obstacle_manager.ai.memory_bytes,
+            "coins": pool_bytes(game.coin_manager.coins),
+            "powerups": sum(pool_bytes(p.instances) for p in game.powerup_manager.powerups.values()),
+            "particles": particles.memory_bytes,
+            "projectiles": game.projectiles.memory_bytes,
+            "terrain": game.terrain.memory_bytes,
+            "placement": game.placement.memory_bytes,
+            "checkpoints": self._checkpoint_bytes(),
+        }
+        report = {
+            "images": images,
+            "sounds": sounds,
+            "entities": entities,
+        }
+        if tracemalloc.is_tracing():
+            report["python"] = {"traced": tracemalloc.get_traced_memory()[0]}
+        return {category: {"total": sum(items.values()), "items": items}
+                for category, items in report.items()}
+
+    def _checkpoint_bytes(self):
+        """Estimate the checkpoint ring from its newest snapshot (they are all alike)"""
+        snapshots = self._game.checkpoints.snapshots
+        if not snapshots:
+            return 0
+        return len(snapshots) * nested_bytes(snapshots[-1].state)
+
+    def python_snapshot(self, limit=10):
+        """Get the source lines that allocated the most Python memory.
+
+        The first call starts tracemalloc and returns nothing; later calls list
+        the top allocations and the growth since the previous call."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._baseline = tracemalloc.take_snapshot()
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),))
+        growth = snapshot.compare_to(self._baseline, "lineno")
+        self._baseline = snapshot
+        return [(str(stat.traceback), stat.size, stat.size_diff) for stat in growth[:limit]]
+
+    def enforce(self, report=None):
+        """Check budgets; evict unreferenced cached assets and warn about what stays over.
+
+        Returns the categories still over budget."""
+        report = report or self.measure()
+        over = []
+        for category, budget in self.budgets.items():
+            total = report.get(category, {"total": 0})["total"]
+            if total <= budget:
+                continue
+            items = report[category]["items"]
+            if category in ("images", "sounds") and self._evict_unused(category, total - budget):
+                items = self.measure()[category]["items"]
+                total = sum(items.values())
+            if total > budget:
+                largest = sorted(items, key=items.get, reverse=True)[:3]
+                print(f"Warning: {category} use {total / MB:.1f} MB over budget "
+                      f"{budget / MB:.1f} MB (largest: {', '.join(largest)})")
+                over.append(category)
+        return over
+
+    def _evict_unused(self, category, excess):
+        """Evict the oldest cached assets that only the cache still holds"""
+        assets = self._game.assets
+        # Ambil daftar nama sebelum menyalin cache, karena salinan juga memegang referensi
+        names = assets.unreferenced(category)
+        cache = assets.images if category == "images" else assets.sounds
+        measure = surface_bytes if category == "images" else sound_bytes
+        freed = 0
+        for name in names:
+            if freed >= excess:
+                break
+            freed += measure(cache[name])
+            assets.evict(name)
+        return freed
+
+    def format(self, report=None):
+        """Get the report as printable lines"""
+        report = report or self.measure()
+        lines = []
+        for category, data in report.items():
+            budget = self.budgets.get(category)
+            limit = f" / {budget / MB:.1f} MB" if budget else ""
+            lines.append(f"{category}: {data['total'] / 1024:.0f} KB{limit}")
+            for name, size in sorted(data["items"].items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"  {name}: {size / 1024:.1f} KB")
+        return lines
@@ -1,28 +1,49 @@
-import pygame
-import random
-from abc import ABC, abstractmethod
+from particles import BLOOD, DUST
+from enemy_ai import EnemyAI
+from broad_phase import BroadPhase
+from projectiles import ARROW
 
-class Obstacle(ABC):
-    def __init__(self, game, rect):
+class Obstacle:
+    """Obstacle of any kind; its sprite, placement and behaviour come from the
+    compiled entity tables (see entity_defs.py)"""
+    
+    def __init__(self, game, kind, rect, speed):
         self._game = game
+        self._kind = kind
         self._rect = rect
-        self._speed = 4
+        self._speed = speed
+        # Slot di BehaviourPool jenisnya; -1 jika jenis ini tidak punya perilaku
+        self.slot = -1
     
     def update(self):
         """Update obstacle position and return True if it should be removed"""
         self._rect.x -= self._speed
         return self._rect.right < 0
     
-    @abstractmethod
     def draw(self, screen):
         """Draw the obstacle on the screen"""
-        pass
+        entities = self._game.entities
+        animation = entities.obstacle_animation[self._kind]
+        if animation is not None:
+            divisor = self._game.quality.animation_divisor(self._rect)
+            screen.blit(self._game.animations.frame(animation, divisor=divisor), self._rect)
+        else:
+            screen.blit(entities.obstacle_frames[self._kind][0], self._rect)
+    
+    @property
+    def kind(self):
+        """Get the obstacle kind id"""
+        return self._kind
+    
+    @kind.setter
+    def kind(self, value):
+        """Set the kind id (ids are renumbered when the definitions are reloaded)"""
+        self._kind = value
     
     @property
-    @abstractmethod
     def type(self):
         """Return the type of obstacle"""
-        pass
+        return self._game.entities.obstacle_names[self._kind]
     
     @property
     def rect(self):
@@ -42,150 +63,196 @@ class Obstacle(ABC):
         else:
             raise ValueError("Speed cannot be negative")
 
-class NormalObstacle(Obstacle):
-    def __init__(self, game):
-        self._image = pygame.image.load("assets/obstacle.png").convert_alpha()
-        rect = self._image.get_rect(
-            bottom=game.player.ground_level, 
-            left=game.WIDTH + random.randint(0, 100))
-        super().__init__(game, rect)
-    
-    def draw(self, screen):
-        screen.blit(self._image, self.rect)
-    
-    @property
-    def type(self):
-        return "normal"
-    
-    @property
-    def image(self):
-        """Get the obstacle's image (read-only)"""
-        return self._image
-
-class ArrowObstacle(Obstacle):
-    def __init__(self, game):
-        self._image = pygame.image.load("assets/obstacle_arrow.png").convert_alpha()
-        arrow_y = game.player.ground_level - random.choice([60, 80])
-        rect = self._image.get_rect(
-            left=game.WIDTH + random.randint(0, 100), 
-            top=arrow_y)
-        super().__init__(game, rect)
-    
-    def draw(self, screen):
-        screen.blit(self._image, self.rect)
-    
-    @property
-    def type(self):
-        return "arrow"
-    
-    @property
-    def image(self):
-        """Get the obstacle's image (read-only)"""
-        return self._image
-
-class EnemyObstacle(Obstacle):
-    def __init__(self, game):
-        img = pygame.image.load("assets/obstacle_enemy.png").convert_alpha()
-        self._frames = self._load_frames(img, 135, 64, 4)
-        rect = pygame.Rect(
-            game.WIDTH + random.randint(0, 100), 
-            game.player.ground_level - 64, 
-            self._frames[0].get_width(), 
-            self._frames[0].get_height()
-        )
-        super().__init__(game, rect)
-    
-    def _load_frames(self, spritesheet, total_width, height, frame_count):
-        """Private method to load animation frames"""
-        frame_width = total_width // frame_count
-        return [spritesheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, height)) 
-                for i in range(frame_count)]
-    
-    def draw(self, screen):
-        screen.blit(self._frames[self._game.powerup_manager.enemy_frame_index], self.rect)
-    
-    @property
-    def type(self):
-        return "enemy"
-    
-    @property
-    def frames(self):
-        """Get the enemy's animation frames (read-only)"""
-        return self._frames
-
 class ObstacleManager:
     def __init__(self, game):
         self._game = game
-        self._obstacles = []
-        self._obstacle_spawn_timer = 0
-        self._obstacle_spawn_interval = 1500
-        self._obstacle_speed = 4
-        self._load_assets()
-    
-    def _load_assets(self):
-        """Private method to load obstacle assets"""
-        self._obstacle_img = pygame.image.load("assets/obstacle.png").convert_alpha()
-        self._obstacle_arrow_img = pygame.image.load("assets/obstacle_arrow.png").convert_alpha()
-        enemy_img = pygame.image.load("assets/obstacle_enemy.png").convert_alpha()
-        self._enemy_frames = self._load_frames(enemy_img, 135, 64, 4)
-    
-    def _load_frames(self, spritesheet, total_width, height, frame_count):
-        """Private method to load animation frames"""
-        frame_width = total_width // frame_count
-        return [spritesheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, height)) 
-                for i in range(frame_count)]
+        self._ai = EnemyAI(game)
+        self._broad = BroadPhase(game.WIDTH)
+        self.reset()
     
     def reset(self):
         """Reset the obstacle manager to initial state"""
+        spawn = self._game.entities.spawn
         self._obstacles = []
+        self._ai.reset()
         self._obstacle_spawn_timer = 0
-        self._obstacle_spawn_interval = 1500
-        self._obstacle_speed = 4
+        self._obstacle_spawn_interval = spawn["interval"]
+        self._obstacle_speed = spawn["speed"]
     
     def update(self, dt):
         """Update obstacle spawning and movement"""
-        self._obstacle_spawn_timer += dt
+        # Spawn normal berhenti selama pertarungan bos; bos memanggil musuhnya sendiri
+        if not self._game.boss.active:
+            self._obstacle_spawn_timer += dt
         
         if self._obstacle_spawn_timer >= self._obstacle_spawn_interval:
             self._spawn_obstacle()
             self._obstacle_spawn_timer = 0
-            self._obstacle_spawn_interval = max(800, self._obstacle_spawn_interval - 10)
+            spawn = self._game.entities.spawn
+            self._obstacle_spawn_interval = max(
+                spawn["min_interval"], self._obstacle_spawn_interval - spawn["interval_step"])
         
         self._update_obstacles()
+        self._ai.update(dt, self._fire)
+        self._broad.rebuild(self._obstacles)
+        self._game.projectiles.update(dt, self._obstacle_speed, self._broad, self.projectile_hit)
     
     def _spawn_obstacle(self):
         """Private method to spawn a new obstacle"""
-        rand = random.random()
-        if rand < 0.5:
-            self._obstacles.append(NormalObstacle(self._game))
-        elif rand < 0.8:
-            self._obstacles.append(ArrowObstacle(self._game))
+        self.spawn(self._game.entities.pick_obstacle(self._game.rng.random()))
+    
+    def spawn(self, kind, x=None):
+        """Spawn an obstacle by kind id; x defaults to just off the right edge"""
+        rng = self._game.rng
+        entities = self._game.entities
+        offsets = entities.obstacle_offsets[kind]
+        offset = rng.choice(offsets) if len(offsets) > 1 else offsets[0]
+        placed = x is None
+        if placed:
+            x = self._game.WIDTH + rng.randint(0, entities.spawn["x_jitter"])
+        
+        rect = entities.obstacle_frames[kind][0].get_rect(left=x)
+        if entities.obstacle_anchor_top[kind]:
+            rect.top = self._game.player.ground_level - offset
+        else:
+            rect.bottom = self._game.player.ground_level - offset
+        if placed:
+            # Geser ke celah kosong terdekat agar tidak menumpuk dengan koin/powerup
+            x = self._game.placement.find(rect.left, rect.width, rect.top, rect.bottom, entities.spawn["x_jitter"])
+            if x is None:
+                return None
+            rect.left = x
+        # Rintangan di tanah tidak boleh muncul di atas lubang
+        if not entities.obstacle_anchor_top[kind] and not self._game.terrain.solid_ground(rect.left, rect.right):
+            return None
+        self._game.placement.reserve(rect)
+        
+        projectile_speed = entities.obstacle_projectile[kind]
+        if projectile_speed is not None:
+            projectiles = self._game.projectiles
+            projectiles.emit(ARROW, rect.x, rect.y, -projectile_speed, 0, projectiles.tuning["arrow_life"])
+            return None
+        
+        obstacle = Obstacle(self._game, kind, rect, self._obstacle_speed)
+        self._obstacles.append(obstacle)
+        self._ai.add(obstacle)
+        return obstacle
+    
+    def _fire(self, rect, kind, speed):
+        """Spawn a shot of the given kind from the front of an enemy at rect"""
+        if self._game.entities.obstacle_projectile[kind] is not None:
+            self._game.projectiles.shoot(rect, speed)
+            return
+        shot = self._game.entities.obstacle_frames[kind][0].get_rect(midright=(rect.left, rect.centery))
+        self._obstacles.append(Obstacle(self._game, kind, shot, self._obstacle_speed + speed))
+    
+    def remove(self, obstacle):
+        """Remove an obstacle and free its behaviour slot"""
+        self._obstacles.remove(obstacle)
+        self._ai.remove(obstacle)
+        self._broad.remove(obstacle)
+    
+    def projectile_hit(self, kind, owner, obstacle):
+        """Resolve a thrown or reflected projectile hitting an obstacle; True uses it up"""
+        game = self._game
+        if game.race is not None:
+            return game.race.projectile_hit(owner, obstacle)
+        kill_score = game.entities.obstacle_kill_score[obstacle.kind]
+        if kill_score and not self._ai.blocking(obstacle):
+            self.remove(obstacle)
+            game.player.score += kill_score
+            game.particles.burst(obstacle.rect.centerx, obstacle.rect.centery, 16, BLOOD)
         else:
-            self._obstacles.append(EnemyObstacle(self._game))
+            game.particles.burst(obstacle.rect.left, obstacle.rect.centery, 6, DUST)
+        return True
     
     def _update_obstacles(self):
         """Private method to update all obstacles"""
         for obstacle in self._obstacles[:]:
             should_remove = obstacle.update()
             
-            if obstacle.type == "enemy" and self._check_attack_collision(obstacle):
-                self._obstacles.remove(obstacle)
-                self._game.player.score += 50
+            kill_score = self._game.entities.obstacle_kill_score[obstacle.kind]
+            # Dalam mode balapan, RaceMode yang menangani tabrakan tiap pemain
+            if kill_score and self._game.race is None and self._check_attack_collision(obstacle):
+                self.remove(obstacle)
+                self._game.player.score += kill_score
+                self._game.stats.add("kills")
+                self._game.particles.burst(obstacle.rect.centerx, obstacle.rect.centery, 16, BLOOD)
                 continue
             
             if should_remove:
-                self._obstacles.remove(obstacle)
+                self.remove(obstacle)
     
     def _check_attack_collision(self, obstacle):
         """Private method to check attack collision with enemy"""
         return (self._game.player.is_attacking and 
                 self._game.player.attack_hitbox and 
-                self._game.player.attack_hitbox.colliderect(obstacle.rect))
+                self._game.player.attack_hitbox.colliderect(obstacle.rect) and
+                not self._ai.blocking(obstacle))
     
-    def draw(self, screen):
-        """Draw all obstacles on the screen"""
+    def retune(self, previous):
+        """Apply changed tuning to the running game in place; previous is the old EntityTables.
+
+        Live obstacles and their behaviour state are kept. Obstacles of a kind that
+        no longer exists are dropped."""
+        spawn = self._game.entities.spawn
+        # Pertahankan progres kesulitan: geser interval sebesar perubahan nilai awalnya
+        self._obstacle_spawn_interval = max(
+            spawn["min_interval"],
+            self._obstacle_spawn_interval + spawn["interval"] - previous.spawn["interval"])
+        # Tembakan bergerak lebih cepat dari dunia, jadi kecepatan digeser, bukan diganti
+        speed_change = spawn["speed"] - self._obstacle_speed
+        self._obstacle_speed = spawn["speed"]
+        
+        # Id jenis bisa bergeser jika definisi diubah urutannya, jadi dipetakan lewat nama
+        ids = self._game.entities.obstacle_ids
+        obstacles = []
+        for obstacle in self._obstacles:
+            kind = ids.get(previous.obstacle_names[obstacle.kind])
+            if kind is None:
+                self._ai.remove(obstacle)
+                self._broad.remove(obstacle)
+                continue
+            obstacle.kind = kind
+            obstacle.speed = max(0, obstacle.speed + speed_change)
+            obstacles.append(obstacle)
+        self._obstacles = obstacles
+        self._ai.retune(obstacles)
+    
+    def snapshot(self):
+        """Capture spawn timers and every obstacle as (kind, x, y, speed, behaviour state)"""
+        return (
+            self._obstacle_spawn_timer, self._obstacle_spawn_interval, self._obstacle_speed,
+            tuple((o.kind, o.rect.x, o.rect.y, o.speed, self._ai.snapshot(o)) for o in self._obstacles)
+        )
+    
+    def restore(self, state):
+        """Restore a state captured by snapshot()"""
+        self._obstacle_spawn_timer, self._obstacle_spawn_interval, self._obstacle_speed, obstacles = state
+        frames = self._game.entities.obstacle_frames
+        self._ai.reset()
+        self._obstacles = []
+        for kind, x, y, speed, behaviour in obstacles:
+            obstacle = Obstacle(self._game, kind, frames[kind][0].get_rect(topleft=(x, y)), speed)
+            self._obstacles.append(obstacle)
+            self._ai.add(obstacle, behaviour or None)
+    
+    def draw(self, screen, hidden=()):
+        """Draw all obstacles on the screen except those whose id is in hidden"""
         for obstacle in self._obstacles:
-            obstacle.draw(screen)
+            if id(obstacle) not in hidden:
+                obstacle.draw(screen)
+        self._ai.draw(screen, hidden)
+    
+    @property
+    def broad_phase(self):
+        """Get the grid of this tick's obstacles"""
+        return self._broad
+    
+    @property
+    def ai(self):
+        """Get the enemy behaviour system"""
+        return self._ai
     
     @property
     def obstacles(self):
@@ -0,0 +1,167 @@
+import math
+import time
+from array import array
+import pygame
+
+COIN, BLOOD, DUST, SHIELD, TRAIL = range(5)
+COLORS = (
+    (255, 220, 0),
+    (220, 40, 40),
+    (200, 200, 200),
+    (120, 160, 255),
+    (0, 255, 0),
+)
+SIZES = (2, 3)
+
+
+class ParticleSystem:
+    """Fixed-capacity particle buffer.
+
+    Particle state lives in flat arrays (struct of arrays); live particles are
+    always packed in [0, count) and a dead one is replaced by the last live one,
+    so there is no per-particle object, no allocation while playing and one loop
+    per tick. If integration takes longer than BUDGET_MS the emission scale is
+    lowered until it fits again."""
+
+    CAPACITY = 512
+    BUDGET_MS = 1.0
+    GRAVITY = 0.25
+
+    def __init__(self, capacity=CAPACITY):
+        self._capacity = capacity
+        self._x = array("f", bytes(4 * capacity))
+        self._y = array("f", bytes(4 * capacity))
+        self._vx = array("f", bytes(4 * capacity))
+        self._vy = array("f", bytes(4 * capacity))
+        self._life = array("f", bytes(4 * capacity))
+        self._max_life = array("f", bytes(4 * capacity))
+        self._color = array("B", bytes(capacity))
+        self._count = 0
+        self._load_scale = 1.0
+        self._jitter = 0.0
+        self.quality = 1.0
+        self._flash_rect = None
+        self._flash_surface = None
+        self._flash_time = 0
+        self._flash_duration = 1
+        self._sprites = [[self._make_sprite(color, size) for size in SIZES] for color in COLORS]
+
+    def _make_sprite(self, color, size):
+        sprite = pygame.Surface((size, size))
+        sprite.fill(color)
+        return sprite
+
+    def reset(self):
+        self._count = 0
+        self._flash_rect = None
+
+    def emit(self, x, y, vx, vy, life, color):
+        """Add one particle; silently dropped when the buffer is full"""
+        i = self._count
+        if i >= self._capacity:
+            return False
+        self._x[i] = x
+        self._y[i] = y
+        self._vx[i] = vx
+        self._vy[i] = vy
+        self._life[i] = life
+        self._max_life[i] = life
+        self._color[i] = color
+        self._count = i + 1
+        return True
+
+    def burst(self, x, y, count, color, speed=3.0, life=400):
+        """Emit a radial burst; count is scaled down by quality and load"""
+        count = int(count * self.quality * self._load_scale)
+        step = 2 * math.pi / max(count, 1)
+        for n in range(count):
+            angle = n * step
+            # Variasi kecepatan deterministik, tidak memakai RNG gameplay
+            self._jitter = (self._jitter + 0.618034) % 1.0
+            jitter = 0.5 + self._jitter
+            if not self.emit(x, y, math.cos(angle) * speed * jitter,
+                             math.sin(angle) * speed * jitter - 1.0, life, color):
+                break
+
+    def trail(self, x, y, color, life=250):
+        """Emit a single trail particle (skipped when degraded)"""
+        if self.quality * self._load_scale >= 0.5:
+            self.emit(x, y, -1.0, 0.0, life, color)
+
+    def flash(self, rect, color, duration=150):
+        """Show a translucent flash around rect (followed while it moves) for duration ms"""
+        self._flash_rect = rect
+        self._flash_surface = pygame.Surface(rect.inflate(24, 24).size, pygame.SRCALPHA)
+        pygame.draw.ellipse(self._flash_surface, color, self._flash_surface.get_rect())
+        self._flash_time = duration
+        self._flash_duration = duration
+
+    def update(self, dt, scroll):
+        """Integrate every live particle; scroll moves them with the world"""
+        start = time.perf_counter()
+        x, y, vx, vy, life = self._x, self._y, self._vx, self._vy, self._life
+        gravity = self.GRAVITY
+        i = 0
+        count = self._count
+        while i < count:
+            remaining = life[i] - dt
+            if remaining <= 0:
+                count -= 1
+                self._move(count, i)
+                continue
+            life[i] = remaining
+            vy[i] += gravity
+            x[i] += vx[i] - scroll
+            y[i] += vy[i]
+            i += 1
+        self._count = count
+
+        if self._flash_rect is not None:
+            self._flash_time -= dt
+            if self._flash_time <= 0:
+                self._flash_rect = None
+
+        elapsed = (time.perf_counter() - start) * 1000
+        if elapsed > self.BUDGET_MS:
+            self._load_scale = max(0.1, self._load_scale * 0.5)
+        elif self._load_scale < 1.0:
+            self._load_scale = min(1.0, self._load_scale + 0.01)
+
+    def _move(self, source, target):
+        """Copy particle source into slot target"""
+        self._x[target] = self._x[source]
+        self._y[target] = self._y[source]
+        self._vx[target] = self._vx[source]
+        self._vy[target] = self._vy[source]
+        self._life[target] = self._life[source]
+        self._max_life[target] = self._max_life[source]
+        self._color[target] = self._color[source]
+
+    def draw(self, screen):
+        """Draw all particles with one batched blit call"""
+        if self._count:
+            sprites = self._sprites
+            x, y, life, max_life, color = self._x, self._y, self._life, self._max_life, self._color
+            screen.blits([
+                (sprites[color[i]][life[i] * 2 > max_life[i]], (int(x[i]), int(y[i])))
+                for i in range(self._count)
+            ], False)
+
+        if self._flash_rect is not None:
+            self._flash_surface.set_alpha(int(160 * self._flash_time / self._flash_duration))
+            screen.blit(self._flash_surface, self._flash_surface.get_rect(center=self._flash_rect.center))
+
+    @property
+    def count(self):
+        """Get the number of live particles"""
+        return self._count
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def memory_bytes(self):
+        """Get the bytes held by the particle buffers"""
+        buffers = (self._x, self._y, self._vx, self._vy, self._life, self._max_life, self._color)
+        return sum(buffer.itemsize * len(buffer) for buffer in buffers)
@@ -5,9 +5,6 @@ class Player:
         self.game = game
         self.reset()
         
-        # Load sprites
-        self._load_sprites()
-        
         # Hitboxes
         self.normal_hitbox = pygame.Rect(0, 0, 768//8, 64)
         self.roll_hitbox = pygame.Rect(0, 0, 768//8, 32)
@@ -17,54 +14,27 @@ class Player:
         self._has_double_jump = False
         self._has_shield = False
     
-    def _load_sprites(self):
-        player_spritesheet = pygame.image.load("assets/player.png").convert_alpha()
-        self.frames = self._load_frames(player_spritesheet, 768, 64, 8)
-        
-        self.roll_frames = self._load_frames(
-            pygame.image.load("assets/player_roll.png").convert_alpha(), 
-            768, 32, 8
-        )
-        
-        self.attack_frames = self._load_frames(
-            pygame.image.load("assets/player_attack.png").convert_alpha(),
-            768, 64, 8
-        )
-    
-    def _load_frames(self, spritesheet, total_width, height, frame_count):
-        frame_width = total_width // frame_count
-        return [spritesheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, height)) 
-                for i in range(frame_count)]
-    
     def reset(self):
         self.rect = pygame.Rect(100, self.game.HEIGHT - 64 - 50, 768//8, 64)
         self.speed_y = 0
-        self.gravity = 0.5
-        self.jump_power = -10
+        self.previous_bottom = self.rect.bottom
         self.ground_level = self.game.HEIGHT - 50
         self.bg_scroll_x = 0
         self.bg_speed = 2
         
-        # Animation
-        self.frame_index = 0
-        self.animation_timer = 0
-        self.animation_speed = 100
-        
         # Rolling
         self.is_rolling = False
         self.roll_timer = 0
-        self.roll_duration = 1000
         
         # Attacking
         self.is_attacking = False
-        self.attack_frame_index = 0
-        self.attack_animation_timer = 0
-        self.attack_animation_speed = 80
+        self.attack_started = 0
         self.attack_timer = 0
         self.attack_duration = 1000
         self.attack_cooldown = 0
-        self.last_attack_time = 0
-        self.attack_hitbox = None
+        self.last_attack_time = -1
+        self.attack_hitbox = pygame.Rect(0, 0, 0, 0)
+        self.last_throw_time = None
         
         # Game stats
         self.score = 0
@@ -74,70 +44,74 @@ class Player:
         
         # Jumping
         self.has_jumped_once = False
-
-        # Jumping
-        self.has_jumped_once = False
+        self.on_ground = True
+        self.air_time = 0
+        self.coyote_available = True
+        self.jump_buffer = 0
         
         # Powerup states
         self._has_double_jump = False
         self._has_shield = False
+        self.retune()
+    
+    def retune(self):
+        """Read gravity, jump power and timing windows from the entity definitions"""
+        for key, value in self.game.entities.player.items():
+            setattr(self, key, value)
     
     def update(self, dt):
         self._apply_gravity()
         self._check_ground_collision()
+        self._update_jump_timers(dt)
         self._check_roll_end()
-        self._update_animations(dt)
+        self._update_attack()
         self._update_background_scroll()
         self._update_score_timer(dt)
     
     def _apply_gravity(self):
+        self.previous_bottom = self.rect.bottom
         self.speed_y += self.gravity
         self.rect.y += self.speed_y
     
     def _check_ground_collision(self):
-        if self.rect.bottom >= self.ground_level:
-            self.rect.bottom = self.ground_level
+        # Hanya segmen terrain di bawah kaki pemain yang diperiksa
+        feet = self.rect.inflate(-60, 0)
+        support = None
+        if self.speed_y >= 0:
+            support = self.game.terrain.support_top(
+                feet.left, feet.right, self.previous_bottom, self.rect.bottom)
+        if support is not None:
+            self.rect.bottom = support
             self.speed_y = 0
             self.has_jumped_once = False
+            self.on_ground = True
+            self.coyote_available = True
+        else:
+            self.on_ground = False
+    
+    def _update_jump_timers(self, dt):
+        """Coyote time after leaving the ground and buffered jumps before landing"""
+        self.air_time = 0 if self.on_ground else self.air_time + dt
+        if self.jump_buffer > 0:
+            if self.on_ground:
+                self.jump()
+            else:
+                self.jump_buffer = max(0, self.jump_buffer - dt)
     
     def _check_roll_end(self):
-        if self.is_rolling and pygame.time.get_ticks() - self.roll_timer >= self.roll_duration:
+        if self.is_rolling and self.game.run_time - self.roll_timer >= self.roll_duration:
             self.end_roll()
     
-    def _update_animations(self, dt):
-        if self.is_rolling:
-            self._update_roll_animation(dt)
-        elif self.is_attacking:
-            self._update_attack_animation(dt)
+    def _update_attack(self):
+        if not self.is_attacking:
+            return
+        if self.game.animations.finished("player_attack", self.attack_started):
+            self.is_attacking = False
         else:
-            self._update_normal_animation(dt)
-    
-    def _update_roll_animation(self, dt):
-        self.animation_timer += dt
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            self.frame_index = (self.frame_index + 1) % len(self.roll_frames)
-    
-    def _update_attack_animation(self, dt):
-        self.attack_animation_timer += dt
-        if self.attack_animation_timer >= self.attack_animation_speed:
-            self.attack_animation_timer = 0
-            self.attack_frame_index += 1
-            if self.attack_frame_index >= len(self.attack_frames):
-                self.attack_frame_index = 0
-                self.is_attacking = False
-            else:
-                self.attack_hitbox = pygame.Rect(
-                    self.rect.right - 20, 
-                    self.rect.top + 20, 
-                    60, 
-                    self.rect.height - 40)
-    
-    def _update_normal_animation(self, dt):
-        self.animation_timer += dt
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            self.frame_index = (self.frame_index + 1) % len(self.frames)
+            self._place_attack_hitbox()
+    
+    def _place_attack_hitbox(self):
+        self.attack_hitbox.update(self.rect.right - 20, self.rect.top + 20, 60, self.rect.height - 40)
     
     def _update_background_scroll(self):
         self.bg_scroll_x = (self.bg_scroll_x - self.bg_speed) % self.game.WIDTH
@@ -149,53 +123,94 @@ class Player:
         if not self.is_rolling and not self.is_attacking:
             self.is_rolling = True
             self.is_attacking = False
-            self.roll_timer = pygame.time.get_ticks()
+            self.roll_timer = self.game.run_time
             bottom = self.rect.bottom
             self.rect.height = 32
             self.rect.bottom = bottom
     
     def end_roll(self):
         self.is_rolling = False
+        bottom = self.rect.bottom
         self.rect.height = 64
-        new_bottom = self.rect.bottom
-        self.rect.bottom = new_bottom
+        self.rect.bottom = bottom
         
-        if self.rect.bottom > self.ground_level:
-            self.rect.bottom = self.ground_level
+        # Sama seperti gravitasi: hanya permukaan terrain di bawah kaki yang menahan pemain,
+        # jadi roll yang berakhir di atas lubang tetap jatuh
+        feet = self.rect.inflate(-60, 0)
+        support = self.game.terrain.support_top(
+            feet.left, feet.right, min(self.previous_bottom, self.rect.bottom), self.rect.bottom)
+        if support is not None:
+            self.rect.bottom = support
             self.speed_y = 0
     
     def jump(self):
-        if self.rect.bottom >= self.ground_level:
+        if self.on_ground or (self.coyote_available and self.air_time <= self.coyote_time):
             self.speed_y = self.jump_power
             self.has_jumped_once = False
-        elif self.game.powerup_manager.double_jump_active and not self.has_jumped_once:
+            self.on_ground = False
+            self.coyote_available = False
+            self.jump_buffer = 0
+        elif self._has_double_jump and not self.has_jumped_once:
             self.speed_y = self.jump_power
             self.has_jumped_once = True
+            self.game.stats.add("double_jumps")
+        else:
+            # Lompatan yang ditekan sedikit sebelum mendarat tetap dijalankan saat mendarat
+            self.jump_buffer = self.jump_buffer_time
     
     def attack(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.run_time
         if current_time - self.last_attack_time > self.attack_cooldown:
             if self.is_rolling:
                 self.end_roll()
             
             self.is_attacking = True
             self.is_rolling = False
-            self.attack_frame_index = 0
+            self.attack_started = self.game.animations.time
             self.last_attack_time = current_time
-            self.attack_hitbox = pygame.Rect(
-                self.rect.right - 20, 
-                self.rect.top + 20, 
-                60, 
-                self.rect.height - 40
-            )
+            self._place_attack_hitbox()
+    
+    def throw(self, owner=0):
+        """Throw a knife forward if the throw cooldown has passed"""
+        current_time = self.game.run_time
+        cooldown = self.game.entities.projectiles["throw_cooldown"]
+        if self.last_throw_time is not None and current_time - self.last_throw_time < cooldown:
+            return False
+        if not self.game.projectiles.throw(self.rect, owner):
+            return False
+        self.last_throw_time = current_time
+        return True
+    
+    def snapshot(self):
+        """Capture the run state as a flat tuple"""
+        return (
+            tuple(self.rect), self.speed_y, self.previous_bottom, self.bg_scroll_x,
+            self.is_rolling, self.roll_timer,
+            self.is_attacking, self.attack_started, self.last_attack_time, tuple(self.attack_hitbox),
+            self.last_throw_time, self.score, self.coin_score, self.score_timer,
+            self.has_jumped_once, self.on_ground, self.air_time, self.coyote_available, self.jump_buffer,
+            self._has_double_jump, self._has_shield
+        )
+    
+    def restore(self, state):
+        """Restore a state captured by snapshot()"""
+        (rect, self.speed_y, self.previous_bottom, self.bg_scroll_x,
+         self.is_rolling, self.roll_timer,
+         self.is_attacking, self.attack_started, self.last_attack_time, attack_hitbox,
+         self.last_throw_time, self.score, self.coin_score, self.score_timer,
+         self.has_jumped_once, self.on_ground, self.air_time, self.coyote_available, self.jump_buffer,
+         self._has_double_jump, self._has_shield) = state
+        self.rect.update(rect)
+        self.attack_hitbox.update(attack_hitbox)
     
     def draw(self, screen):
+        animations = self.game.animations
         if self.is_attacking:
-            screen.blit(self.attack_frames[self.attack_frame_index], self.rect)
+            screen.blit(animations.frame("player_attack", self.attack_started), self.rect)
         elif self.is_rolling:
-            screen.blit(self.roll_frames[self.frame_index], self.rect)
+            screen.blit(animations.frame("player_roll"), self.rect)
         else:
-            screen.blit(self.frames[self.frame_index], self.rect)
+            screen.blit(animations.frame("player_run"), self.rect)
     
     def enable_double_jump(self):
         """Enable double jump ability"""
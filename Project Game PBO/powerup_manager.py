@@ -1,18 +1,20 @@
 import pygame
-import random
 from abc import ABC, abstractmethod
 
 class Powerup(ABC):
-    def __init__(self, game, frames, spawn_interval):
+    # Parameter yang boleh diubah lewat set_param (tabel upgrade)
+    PARAMS = ("spawn_interval",)
+    
+    def __init__(self, game, params):
         self._game = game
-        self._frames = frames
-        self._spawn_interval = spawn_interval
+        self._frames = params["frames"]
+        self._animation = params["animation"]
+        self._spawn_interval = params["spawn_interval"]
+        self._placement = (params["x_jitter"], params["height_min"], params["height_max"])
         self._spawn_timer = 0
         self._active = False
-        self._frame_index = 0
-        self._animation_timer = 0
-        self._animation_speed = 100
         self._instances = []
+        self._uses = 0
     
     @abstractmethod
     def _activate_effect(self):
@@ -28,13 +30,12 @@ class Powerup(ABC):
         """Update powerup state"""
         self._update_spawning(dt)
         self._update_instances(dt)
-        self._update_animation(dt)
         if self._active:
             self._update_active()
     
     def _update_spawning(self, dt):
         """Update powerup spawning logic"""
-        if not self._active:
+        if not self._active and not self._game.boss.active:
             self._spawn_timer += dt
             if self._spawn_timer >= self._spawn_interval:
                 self._spawn_instance()
@@ -42,13 +43,15 @@ class Powerup(ABC):
     
     def _spawn_instance(self):
         """Spawn a new powerup instance"""
+        x_jitter, height_min, height_max = self._placement
         rect = pygame.Rect(
-            self._game.WIDTH + random.randint(0, 100),
-            self._game.player.ground_level - random.randint(40, 80),
+            self._game.WIDTH + self._game.rng.randint(0, x_jitter),
+            self._game.player.ground_level - self._game.rng.randint(height_min, height_max),
             self._frames[0].get_width(),
             self._frames[0].get_height()
         )
-        self._instances.append(rect)
+        if self._game.placement.place(rect, x_jitter):
+            self._instances.append(rect)
     
     def _update_instances(self, dt):
         """Update all powerup instances"""
@@ -59,26 +62,59 @@ class Powerup(ABC):
                 self._instances.remove(instance)
                 continue
             
-            if self._game.player.rect.inflate(-80, -30).colliderect(instance):
+            if self._game.race is None and self._game.player.rect.inflate(-80, -30).colliderect(instance):
                 self._instances.remove(instance)
+                self._uses += 1
                 self._activate_effect()
                 self._game.play_collectible_sound()
     
-    def _update_animation(self, dt):
-        """Update animation frames"""
-        self._animation_timer += dt
-        if self._animation_timer >= self._animation_speed:
-            self._animation_timer = 0
-            self._frame_index = (self._frame_index + 1) % len(self._frames)
+    def retune(self, params):
+        """Apply changed definitions without touching spawn timers or the active effect"""
+        self._frames = params["frames"]
+        self._animation = params["animation"]
+        self._spawn_interval = params["spawn_interval"]
+        self._placement = (params["x_jitter"], params["height_min"], params["height_max"])
+        self._retune_effect(params)
+    
+    def _retune_effect(self, params):
+        pass
+    
+    def set_param(self, name, value):
+        """Set one tunable parameter (used by the upgrade tables)"""
+        if name not in self.PARAMS:
+            raise ValueError(f"{type(self).__name__} has no parameter {name!r}")
+        setattr(self, f"_{name}", value)
+    
+    def snapshot(self):
+        """Capture spawn state, instance positions and the effect state"""
+        return (
+            self._spawn_timer, self._spawn_interval, self._active, self._uses,
+            tuple((r.x, r.y) for r in self._instances), self._snapshot_effect()
+        )
+    
+    def restore(self, state):
+        """Restore a state captured by snapshot()"""
+        self._spawn_timer, self._spawn_interval, self._active, self._uses, instances, effect = state
+        width, height = self._frames[0].get_size()
+        self._instances = [pygame.Rect(x, y, width, height) for x, y in instances]
+        self._restore_effect(effect)
+    
+    def _snapshot_effect(self):
+        return ()
     
-    def draw(self, screen):
-        """Draw all powerup instances"""
+    def _restore_effect(self, state):
+        pass
+    
+    def draw(self, screen, hidden=()):
+        """Draw all powerup instances except those whose id is in hidden"""
+        quality = self._game.quality
+        frames = {1: self._game.animations.frame(self._animation)}
         for instance in self._instances:
-            frame = pygame.transform.scale(
-                self._frames[self._frame_index],
-                (32, 32)
-            )
-            screen.blit(frame, instance)
+            if id(instance) not in hidden:
+                divisor = quality.animation_divisor(instance)
+                if divisor not in frames:
+                    frames[divisor] = self._game.animations.frame(self._animation, divisor=divisor)
+                screen.blit(frames[divisor], instance)
     
     @property
     def active(self):
@@ -89,31 +125,49 @@ class Powerup(ABC):
     def instances(self):
         """Get powerup instances (read-only)"""
         return self._instances
+    
+    @property
+    def uses(self):
+        """Get how many times this powerup was picked up in the current run"""
+        return self._uses
 
 class DoubleJumpPowerup(Powerup):
-    def __init__(self, game, frames):
-        super().__init__(game, frames, 7000)
-        self._duration = 30000
+    PARAMS = Powerup.PARAMS + ("duration",)
+    
+    def __init__(self, game, params):
+        super().__init__(game, params)
+        self._duration = params["duration"]
         self._timer = 0
     
     def _activate_effect(self):
         """Activate double jump effect"""
         self._active = True
-        self._timer = pygame.time.get_ticks()
+        self._timer = self._game.run_time
         self._game.player.enable_double_jump()
     
+    def _retune_effect(self, params):
+        self._duration = params["duration"]
+    
+    def _snapshot_effect(self):
+        return self._duration, self._timer
+    
+    def _restore_effect(self, state):
+        self._duration, self._timer = state
+    
     def _update_active(self):
         """Update active double jump state"""
-        elapsed = pygame.time.get_ticks() - self._timer
+        elapsed = self._game.run_time - self._timer
         if elapsed >= self._duration:
             self._active = False
             self._game.player.disable_double_jump()
 
 class ShieldPowerup(Powerup):
-    def __init__(self, game, frames):
-        super().__init__(game, frames, 10000)
+    PARAMS = Powerup.PARAMS + ("max_hits",)
+    
+    def __init__(self, game, params):
+        super().__init__(game, params)
         self._hits = 0
-        self._max_hits = 2
+        self._max_hits = params["max_hits"]
     
     def _activate_effect(self):
         """Activate shield effect"""
@@ -131,6 +185,15 @@ class ShieldPowerup(Powerup):
             return True
         return False
     
+    def _retune_effect(self, params):
+        self._max_hits = params["max_hits"]
+    
+    def _snapshot_effect(self):
+        return self._hits, self._max_hits
+    
+    def _restore_effect(self, state):
+        self._hits, self._max_hits = state
+    
     @property
     def hits_remaining(self):
         """Get remaining shield hits"""
@@ -141,90 +204,120 @@ class ShieldPowerup(Powerup):
         pass
 
 class MultiplierPowerup(Powerup):
-    def __init__(self, game, frames):
-        super().__init__(game, frames, 12000)
-        self._duration = 10000
+    PARAMS = Powerup.PARAMS + ("duration", "value")
+    
+    def __init__(self, game, params):
+        super().__init__(game, params)
+        self._duration = params["duration"]
         self._timer = 0
-        self._value = 1
+        # _value adalah parameter (bisa di-upgrade), _current yang sedang berlaku
+        self._value = params["value"]
+        self._current = 1
     
     def _activate_effect(self):
         """Activate score multiplier"""
         self._active = True
-        self._timer = pygame.time.get_ticks()
-        self._value = 2
+        self._timer = self._game.run_time
+        self._current = self._value
+    
+    def _retune_effect(self, params):
+        self._duration = params["duration"]
+        self._value = params["value"]
+    
+    def _snapshot_effect(self):
+        return self._duration, self._timer, self._current, self._value
+    
+    def _restore_effect(self, state):
+        self._duration, self._timer, self._current, self._value = state
     
     def _update_active(self):
         """Update active multiplier state"""
-        elapsed = pygame.time.get_ticks() - self._timer
+        elapsed = self._game.run_time - self._timer
         if elapsed >= self._duration:
             self._active = False
-            self._value = 1
+            self._current = 1
     
     @property
     def value(self):
         """Get current multiplier value"""
-        return self._value
+        return self._current
+
+class SlowMotionPowerup(Powerup):
+    """Slows the whole simulation to value times normal speed. The duration is
+    simulated time, so in real time it lasts duration / value ms."""
+    # value tidak termasuk: time_scale hanya diset saat aktif/retune
+    PARAMS = Powerup.PARAMS + ("duration",)
+
+    def __init__(self, game, params):
+        super().__init__(game, params)
+        self._duration = params["duration"]
+        self._value = params["value"]
+        self._timer = 0
+    
+    def _activate_effect(self):
+        """Activate slow motion"""
+        self._active = True
+        self._timer = self._game.run_time
+        self._game.sim_clock.time_scale = self._value
+    
+    def _retune_effect(self, params):
+        self._duration = params["duration"]
+        self._value = params["value"]
+        if self._active:
+            self._game.sim_clock.time_scale = self._value
+    
+    def _snapshot_effect(self):
+        return self._duration, self._timer, self._value
+    
+    def _restore_effect(self, state):
+        self._duration, self._timer, self._value = state
+        self._game.sim_clock.time_scale = self._value if self._active else 1.0
+    
+    def _update_active(self):
+        """Update active slow motion state"""
+        elapsed = self._game.run_time - self._timer
+        if elapsed >= self._duration:
+            self._active = False
+            self._game.sim_clock.time_scale = 1.0
 
 class PowerupManager:
     def __init__(self, game):
         self._game = game
-        self._load_assets()
         self.reset()
     
-    def _load_assets(self):
-        """Load all powerup assets"""
-        self._dj_frames = self._load_frames(
-            pygame.image.load("assets/double_jump.png").convert_alpha(),
-            128, 32, 4
-        )
-        self._shield_frames = self._load_frames(
-            pygame.image.load("assets/shield.png").convert_alpha(),
-            128, 32, 4
-        )
-        self._multiplier_frames = self._load_frames(
-            pygame.image.load("assets/multiplier.png").convert_alpha(),
-            128, 32, 4
-        )
-        self._enemy_frames = self._load_frames(
-            pygame.image.load("assets/obstacle_enemy.png").convert_alpha(),
-            135, 64, 4
-        )
-    
-    def _load_frames(self, spritesheet, total_width, height, frame_count):
-        """Helper method to load animation frames"""
-        frame_width = total_width // frame_count
-        return [spritesheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, height)) 
-                for i in range(frame_count)]
-    
     def reset(self):
         """Reset all powerup states"""
-        self._double_jump = DoubleJumpPowerup(self._game, self._dj_frames)
-        self._shield = ShieldPowerup(self._game, self._shield_frames)
-        self._multiplier = MultiplierPowerup(self._game, self._multiplier_frames)
-        
-        self._enemy_frame_index = 0
-        self._enemy_animation_timer = 0
-        self._enemy_animation_speed = 150
+        params = self._game.entities.powerups
+        self._double_jump = DoubleJumpPowerup(self._game, params["double_jump"])
+        self._shield = ShieldPowerup(self._game, params["shield"])
+        self._multiplier = MultiplierPowerup(self._game, params["multiplier"])
+        self._slow_motion = SlowMotionPowerup(self._game, params["slow_motion"])
+        self._powerups = {
+            "double_jump": self._double_jump,
+            "shield": self._shield,
+            "multiplier": self._multiplier,
+            "slow_motion": self._slow_motion
+        }
+    
+    def retune(self):
+        """Push changed powerup definitions into the live powerups"""
+        params = self._game.entities.powerups
+        for name, powerup in self._powerups.items():
+            powerup.retune(params[name])
     
     def update(self, dt):
         """Update all powerups"""
         self._double_jump.update(dt)
         self._shield.update(dt)
         self._multiplier.update(dt)
-        self._update_enemy_animation(dt)
-    
-    def _update_enemy_animation(self, dt):
-        """Update enemy animation frames"""
-        self._enemy_animation_timer += dt
-        if self._enemy_animation_timer >= self._enemy_animation_speed:
-            self._enemy_animation_timer = 0
-            self._enemy_frame_index = (self._enemy_frame_index + 1) % len(self._enemy_frames)
+        self._slow_motion.update(dt)
     
-    def draw(self, screen):
+    def draw(self, screen, hidden=()):
         """Draw all powerups"""
-        self._double_jump.draw(screen)
-        self._shield.draw(screen)
-        self._multiplier.draw(screen)
+        self._double_jump.draw(screen, hidden)
+        self._shield.draw(screen, hidden)
+        self._multiplier.draw(screen, hidden)
+        self._slow_motion.draw(screen, hidden)
     
     # Property getters for powerup states
     @property
@@ -243,15 +336,36 @@ class PowerupManager:
     def multiplier_value(self):
         return self._multiplier.value
     
+    @property
+    def slow_motion_active(self):
+        return self._slow_motion.active
+    
     @property
     def shield_hits_remaining(self):
         return self._shield.hits_remaining
     
+    def snapshot(self):
+        return tuple(powerup.snapshot() for powerup in self._powerups.values())
+    
+    def restore(self, state):
+        for powerup, powerup_state in zip(self._powerups.values(), state):
+            powerup.restore(powerup_state)
+    
+    def powerup(self, name):
+        """Get a powerup instance by its entity definition name"""
+        return self._powerups[name]
+    
+    @property
+    def powerups(self):
+        """Get the powerups by entity definition name"""
+        return self._powerups
+    
     @property
-    def enemy_frame_index(self):
-        return self._enemy_frame_index
+    def powerups_used(self):
+        return {name: powerup.uses for name, powerup in self._powerups.items()}
     
     # Methods for shield interaction
     def register_shield_hit(self):
         """Register a hit on the shield"""
+        self._game.stats.add("shield_hits")
         return self._shield.register_hit()
\ No newline at end of file
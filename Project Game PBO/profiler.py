@@ -0,0 +1,90 @@
+from collections import deque
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of an iterable of numbers (0 if empty)"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return ordered[index]
+
+
+class FrameProfiler:
+    """Rolling frame-time and input-to-photon latency statistics"""
+
+    WINDOW = 240
+
+    def __init__(self):
+        self._frame_times = deque(maxlen=self.WINDOW)
+        self._work_times = deque(maxlen=self.WINDOW)
+        self._latencies = deque(maxlen=self.WINDOW)
+        self._unpresented = []
+        self._last_present = None
+        self._frame_start = None
+        self.overlay_visible = False
+    
+    def frame_started(self, now):
+        """Call when the pacer releases a frame; the time until present is its work time"""
+        self._frame_start = now
+
+    def input_applied(self, stamp):
+        """Remember an input that changed the simulation; measured at the next present"""
+        self._unpresented.append(stamp)
+
+    def frame_presented(self, now):
+        """Call right after display.flip() with the current time in ms"""
+        if self._last_present is not None:
+            self._frame_times.append(now - self._last_present)
+        self._last_present = now
+        if self._frame_start is not None:
+            self._work_times.append(now - self._frame_start)
+            self._frame_start = None
+        if self._unpresented:
+            self._latencies.extend(now - stamp for stamp in self._unpresented)
+            self._unpresented.clear()
+
+    def frame_time(self, fraction=0.5):
+        return percentile(self._frame_times, fraction)
+
+    def work_time(self, fraction=0.5):
+        """Frame time without the pacer's sleep"""
+        return percentile(self._work_times, fraction)
+
+    def input_latency(self, fraction=0.5):
+        return percentile(self._latencies, fraction)
+
+    def clear(self):
+        """Forget the frame and work times, e.g. after rendering settings changed"""
+        self._frame_times.clear()
+        self._work_times.clear()
+
+    @property
+    def frames(self):
+        """Get the number of work time samples in the window"""
+        return len(self._work_times)
+
+    def report(self):
+        """Get a summary of the current window"""
+        return {
+            "frames": len(self._frame_times),
+            "frame_ms_p50": self.frame_time(0.5),
+            "frame_ms_p95": self.frame_time(0.95),
+            "frame_ms_p99": self.frame_time(0.99),
+            "work_ms_p95": self.work_time(0.95),
+            "input_latency_ms_p50": self.input_latency(0.5),
+            "input_latency_ms_p95": self.input_latency(0.95),
+            "input_samples": len(self._latencies),
+        }
+
+    def draw(self, screen, font, pos):
+        """Draw the profiler overlay"""
+        lines = [
+            f"frame p50/p95: {self.frame_time(0.5):.1f}/{self.frame_time(0.95):.1f} ms",
+            f"work p50/p95: {self.work_time(0.5):.1f}/{self.work_time(0.95):.1f} ms",
+            f"input->photon p50/p95: {self.input_latency(0.5):.1f}/{self.input_latency(0.95):.1f} ms",
+        ]
+        x, y = pos
+        for line in lines:
+            screen.blit(font.render(line, True, (0, 255, 255)), (x, y))
+            y += font.get_linesize()
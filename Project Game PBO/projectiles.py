@@ -0,0 +1,208 @@
+from array import array
+import pygame
+
+THROWN, ARROW, REFLECTED = range(3)
+# Lebar/tinggi tetap per jenis; pisau lempar digambar sendiri karena tidak ada aset
+KNIFE_SIZE = (16, 4)
+KNIFE_COLOR = (210, 210, 220)
+
+
+class ProjectileBuffer:
+    """Fixed-capacity projectile buffer for thrown knives, enemy arrows and
+    arrows reflected by the shield.
+
+    Like ParticleSystem, state lives in flat arrays with live projectiles packed
+    in [0, count) and no object per projectile. Collision tests reuse one probe
+    Rect, and player-owned projectiles only test the obstacles in the broad-phase
+    cells they overlap. Velocities are relative to the world; the world scroll is
+    subtracted every tick.
+
+    owner is 0 for single player and the lane number in a race. hit_mask holds
+    one bit per race lane that an arrow has already hit, since race lanes share
+    the projectiles the same way they share obstacles."""
+
+    CAPACITY = 128
+    OFFSCREEN = 64
+
+    def __init__(self, game, capacity=CAPACITY):
+        self._game = game
+        self._capacity = capacity
+        self._x = array("f", bytes(4 * capacity))
+        self._y = array("f", bytes(4 * capacity))
+        self._vx = array("f", bytes(4 * capacity))
+        self._vy = array("f", bytes(4 * capacity))
+        self._life = array("f", bytes(4 * capacity))
+        self._kind = array("B", bytes(capacity))
+        self._owner = array("B", bytes(capacity))
+        self._hit_mask = array("B", bytes(capacity))
+        self._count = 0
+        self._probe = pygame.Rect(0, 0, 0, 0)
+        self.retune()
+
+    def retune(self):
+        """Take sprites and tuning from the entity tables"""
+        self.tuning = self._game.entities.projectiles
+        arrow = self._game.atlas.frame(self.tuning["arrow_sprite"])
+        knife = pygame.Surface(KNIFE_SIZE)
+        knife.fill(KNIFE_COLOR)
+        self._sprites = (knife, arrow, pygame.transform.flip(arrow, True, False))
+        self._sizes = tuple(sprite.get_size() for sprite in self._sprites)
+
+    def reset(self):
+        self._count = 0
+
+    def emit(self, kind, x, y, vx, vy, life, owner=0):
+        """Add one projectile with its top-left at (x, y); dropped when the buffer is full"""
+        i = self._count
+        if i >= self._capacity:
+            return False
+        self._x[i] = x
+        self._y[i] = y
+        self._vx[i] = vx
+        self._vy[i] = vy
+        self._life[i] = life
+        self._kind[i] = kind
+        self._owner[i] = owner
+        self._hit_mask[i] = 0
+        self._count = i + 1
+        return True
+
+    def throw(self, rect, owner=0):
+        """Throw a knife forward from a player at rect"""
+        tuning = self.tuning
+        width, height = self._sizes[THROWN]
+        return self.emit(THROWN, rect.right - 30, rect.centery - height // 2,
+                         tuning["throw_speed"], 0, tuning["throw_life"], owner)
+
+    def shoot(self, rect, speed):
+        """Shoot an arrow to the left from the front of an enemy at rect"""
+        width, height = self._sizes[ARROW]
+        return self.emit(ARROW, rect.left - width, rect.centery - height // 2,
+                         -speed, 0, self.tuning["arrow_life"])
+
+    def reflect(self, i):
+        """Turn an enemy arrow around; it now hurts enemies instead of the player"""
+        self._kind[i] = REFLECTED
+        self._owner[i] = 0
+        self._vx[i] = self.tuning["reflect_speed"]
+        self._vy[i] = -1.0
+
+    def remove(self, i):
+        """Free slot i by moving the last live projectile into it"""
+        last = self._count - 1
+        if i != last:
+            self._x[i] = self._x[last]
+            self._y[i] = self._y[last]
+            self._vx[i] = self._vx[last]
+            self._vy[i] = self._vy[last]
+            self._life[i] = self._life[last]
+            self._kind[i] = self._kind[last]
+            self._owner[i] = self._owner[last]
+            self._hit_mask[i] = self._hit_mask[last]
+        self._count = last
+
+    def update(self, dt, scroll, broad_phase, on_hit):
+        """Move every projectile, expire old or offscreen ones and resolve hits.
+
+        Player-owned projectiles are tested against the broad-phase cells they
+        overlap; on_hit(kind, owner, obstacle) returns True if the projectile is
+        used up by the hit."""
+        x, y, vx, vy, life, kind, owner = self._x, self._y, self._vx, self._vy, self._life, self._kind, self._owner
+        sizes, probe, cells = self._sizes, self._probe, broad_phase.cells
+        right_edge = self._game.WIDTH + self.OFFSCREEN
+        i = 0
+        while i < self._count:
+            remaining = life[i] - dt
+            x[i] += vx[i] - scroll
+            y[i] += vy[i]
+            width, height = sizes[kind[i]]
+            if remaining <= 0 or x[i] + width < -self.OFFSCREEN or x[i] > right_edge:
+                self.remove(i)
+                continue
+            life[i] = remaining
+            if kind[i] != ARROW:
+                probe.update(int(x[i]), int(y[i]), width, height)
+                first, last = broad_phase.span(probe.left, probe.right)
+                if self._hits_obstacle(probe, cells, first, last, kind[i], owner[i], on_hit):
+                    self.remove(i)
+                    continue
+            i += 1
+
+    def _hits_obstacle(self, probe, cells, first, last, kind, owner, on_hit):
+        for c in range(first, last + 1):
+            for obstacle in cells[c]:
+                if probe.colliderect(obstacle.rect) and on_hit(kind, owner, obstacle):
+                    return True
+        return False
+
+    def arrow_hit(self, rect, lane_bit=0):
+        """Get the slot of an enemy arrow overlapping rect, or -1.
+
+        With lane_bit set, arrows that already hit that race lane are skipped and
+        the returned arrow is marked as having hit it."""
+        x, y, kind, hit_mask = self._x, self._y, self._kind, self._hit_mask
+        width, height = self._sizes[ARROW]
+        probe = self._probe
+        for i in range(self._count):
+            if kind[i] != ARROW or hit_mask[i] & lane_bit:
+                continue
+            probe.update(int(x[i]), int(y[i]), width, height)
+            if probe.colliderect(rect):
+                hit_mask[i] |= lane_bit
+                return i
+        return -1
+
+    def player_hit(self, rect):
+        """Get the slot of a thrown knife or reflected arrow overlapping rect, or -1"""
+        x, y, kind = self._x, self._y, self._kind
+        probe = self._probe
+        for i in range(self._count):
+            if kind[i] == ARROW:
+                continue
+            width, height = self._sizes[kind[i]]
+            probe.update(int(x[i]), int(y[i]), width, height)
+            if probe.colliderect(rect):
+                return i
+        return -1
+
+    def center(self, i):
+        width, height = self._sizes[self._kind[i]]
+        return int(self._x[i]) + width // 2, int(self._y[i]) + height // 2
+
+    def draw(self, screen, lane_bit=0):
+        """Draw all projectiles with one batched blit, except arrows that already hit lane_bit"""
+        if self._count:
+            sprites, kind, hit_mask, x, y = self._sprites, self._kind, self._hit_mask, self._x, self._y
+            screen.blits([
+                (sprites[kind[i]], (int(x[i]), int(y[i])))
+                for i in range(self._count) if not (hit_mask[i] & lane_bit)
+            ], False)
+
+    def snapshot(self):
+        """Capture every live projectile as (kind, owner, hit_mask, x, y, vx, vy, life)"""
+        return tuple(
+            (self._kind[i], self._owner[i], self._hit_mask[i],
+             self._x[i], self._y[i], self._vx[i], self._vy[i], self._life[i])
+            for i in range(self._count)
+        )
+
+    def restore(self, state):
+        self._count = 0
+        for kind, owner, hit_mask, x, y, vx, vy, life in state:
+            self.emit(kind, x, y, vx, vy, life, owner)
+            self._hit_mask[self._count - 1] = hit_mask
+
+    def live(self):
+        """Get (kind, x, y, width, height) of every live projectile (for tools and bots)"""
+        return [(self._kind[i], int(self._x[i]), int(self._y[i])) + self._sizes[self._kind[i]]
+                for i in range(self._count)]
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def memory_bytes(self):
+        """Get the bytes held by the projectile buffers"""
+        buffers = (self._x, self._y, self._vx, self._vy, self._life, self._kind, self._owner, self._hit_mask)
+        return sum(buffer.itemsize * len(buffer) for buffer in buffers)
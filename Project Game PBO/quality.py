@@ -0,0 +1,141 @@
+import json
+import os
+import platform
+import time
+import pygame
+
+# Level 0 adalah kualitas penuh; setiap level berikutnya lebih murah
+LEVELS = (
+    {"particles": 1.0, "parallax": True, "far_animation": 1, "hitboxes": True, "hud_interval": 1},
+    {"particles": 0.5, "parallax": True, "far_animation": 1, "hitboxes": True, "hud_interval": 2},
+    {"particles": 0.5, "parallax": True, "far_animation": 2, "hitboxes": False, "hud_interval": 4},
+    {"particles": 0.25, "parallax": False, "far_animation": 3, "hitboxes": False, "hud_interval": 6},
+    {"particles": 0.0, "parallax": False, "far_animation": 4, "hitboxes": False, "hud_interval": 10},
+)
+
+
+def device_info():
+    """Describe the machine so quality logs can be grouped by device type"""
+    info = pygame.display.Info()
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "video_driver": pygame.display.get_driver(),
+        "display": [info.current_w, info.current_h],
+    }
+
+
+class QualityController:
+    """Steps rendering features down when frames run long and back up when
+    there is headroom.
+
+    Decisions use the profiler's work time (frame start to present, without the
+    pacer's sleep), so spare time is visible even while the frame rate is capped.
+    After a change the profiler window is cleared and a full window is collected
+    before the next decision. A step up that has to be undone right away doubles
+    the wait before the next step up, which keeps the level from oscillating. Every
+    change is appended to LOG_FILE as one JSON line with the device description."""
+
+    LOG_FILE = "quality_log.jsonl"
+    MIN_SAMPLES = 120
+    DOWN_AT = 0.9
+    UP_AT = 0.5
+    # Entitas lebih jauh dari ini (px) dari pemain dianggap di luar fokus
+    FOCUS_DISTANCE = 250
+    MAX_UP_DELAY = 16
+
+    def __init__(self, game, log_file=LOG_FILE):
+        self._game = game
+        self._profiler = game.profiler
+        self._frame_ms = 1000 / game.FPS
+        self._log_file = log_file
+        self._device = None
+        self.level = 0
+        self.enabled = True
+        self._up_delay = 1
+        self._frames_at_level = 0
+        self._stepped_up = False
+        self._apply()
+
+    def pin(self, level):
+        """Use a fixed level and stop adapting"""
+        self.level = max(0, min(level, len(LEVELS) - 1))
+        self.enabled = False
+        self._apply()
+
+    def update(self):
+        """Call once per frame after the profiler has recorded it"""
+        if not self.enabled:
+            return
+        self._frames_at_level += 1
+        if self._profiler.frames < self.MIN_SAMPLES:
+            return
+        work = self._profiler.work_time(0.95)
+        if work > self._frame_ms * self.DOWN_AT and self.level < len(LEVELS) - 1:
+            if self._stepped_up:
+                self._up_delay = min(self._up_delay * 2, self.MAX_UP_DELAY)
+            self._change(self.level + 1, work)
+        elif (work < self._frame_ms * self.UP_AT and self.level > 0
+              and self._frames_at_level >= self.MIN_SAMPLES * self._up_delay):
+            self._change(self.level - 1, work)
+            self._stepped_up = True
+        elif self._stepped_up:
+            # Level baru bertahan satu jendela penuh, jadi kenaikan berikutnya tidak perlu ditunda
+            self._stepped_up = False
+            self._up_delay = 1
+
+    def _change(self, level, work):
+        previous = self.level
+        self.level = level
+        self._frames_at_level = 0
+        self._stepped_up = False
+        self._apply()
+        self._log(previous, work)
+        self._profiler.clear()
+
+    def _apply(self):
+        self.settings = LEVELS[self.level]
+        self._game.particles.quality = self.settings["particles"]
+
+    def _log(self, previous, work):
+        if self._device is None:
+            self._device = device_info()
+        entry = {
+            "time": time.time(),
+            "from": previous,
+            "to": self.level,
+            "work_ms_p95": round(work, 2),
+            "frame_ms_p95": round(self._profiler.frame_time(0.95), 2),
+            "settings": self.settings,
+            "device": self._device,
+        }
+        print(f"Quality level {previous} -> {self.level} (work p95 {work:.1f} ms)")
+        try:
+            with open(self._log_file, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Warning: could not write quality log: {e}")
+
+    @property
+    def parallax(self):
+        return self.settings["parallax"]
+
+    def animation_divisor(self, rect):
+        """Get the animation frame divisor for an entity drawn at rect"""
+        if abs(rect.centerx - self._game.player.rect.centerx) > self.FOCUS_DISTANCE:
+            return self.settings["far_animation"]
+        return 1
+
+    @property
+    def hitboxes(self):
+        return self.settings["hitboxes"]
+
+    @property
+    def hud_interval(self):
+        """Get after how many frames the HUD text is rendered again"""
+        return self.settings["hud_interval"]
@@ -0,0 +1,292 @@
+import pygame
+from player import Player
+from particles import COIN, SHIELD
+
+WHITE = (255, 255, 255)
+YELLOW = (255, 255, 0)
+
+# Tombol tiap pemain: P1 memakai tombol single-player, P2 di sebelah kanannya
+KEYS_P1 = {pygame.K_UP: "jump", pygame.K_SPACE: "jump", pygame.K_DOWN: "roll", pygame.K_s: "attack",
+           pygame.K_a: "throw"}
+KEYS_P2 = {pygame.K_i: "jump", pygame.K_k: "roll", pygame.K_j: "attack", pygame.K_l: "throw"}
+
+
+class RaceLane:
+    """One racer: its Player plus everything that differs between the racers.
+
+    Track entities are shared, so a coin taken or an obstacle smashed by this
+    racer is only recorded in consumed (by object id) and hidden for this lane.
+    Enemy arrows are shared the same way; lane_bit marks the arrows that already
+    hit this racer."""
+
+    def __init__(self, game, name, keys, color, lane_bit):
+        self.name = name
+        self.lane_bit = lane_bit
+        self.keys = keys
+        self.color = color
+        self.player = Player(game)
+        self.reset()
+
+    def reset(self):
+        self.player.reset()
+        self.consumed = set()
+        self.alive = True
+        self.distance = 0
+        self.cause = None
+        self.double_jump_until = 0
+        self.shield_hits = 0
+        self.multiplier = 1
+        self.multiplier_until = 0
+
+
+class RaceMode:
+    """Two-player split-screen race on one seeded track.
+
+    The terrain and the obstacle, coin and powerup managers are updated once per
+    tick exactly as in single player; only the players, their collisions and their
+    powerup effects are per lane. The shared part of the frame (background and
+    terrain) is drawn once and each lane adds its entities and player before being
+    scaled into its viewport."""
+
+    SCALE = 0.5
+
+    def __init__(self, game):
+        self._game = game
+        self.lanes = [
+            RaceLane(game, "P1", KEYS_P1, (80, 160, 255), 1),
+            RaceLane(game, "P2", KEYS_P2, (255, 120, 80), 2),
+        ]
+        view_width, view_height = int(game.WIDTH * self.SCALE), int(game.HEIGHT * self.SCALE)
+        self._viewports = [pygame.Rect(0, i * view_height, view_width, view_height) for i in range(2)]
+        self._world = pygame.Surface((game.WIDTH, game.HEIGHT)).convert()
+        self._lane_surface = pygame.Surface((game.WIDTH, game.HEIGHT)).convert()
+        self._solo_player = None
+        self.finished = False
+        self.slow_until = 0
+
+    def start(self):
+        """Start a race; the single-player Player is put back by stop()"""
+        game = self._game
+        game.reset_game()
+        self._solo_player = game.player
+        for lane in self.lanes:
+            lane.reset()
+        # Terrain dan manager membaca ground_level dari game.player
+        game.player = self.lanes[0].player
+        game.race = self
+        self.finished = False
+        self.slow_until = 0
+
+    def stop(self):
+        game = self._game
+        game.player = self._solo_player
+        game.race = None
+        game.sim_clock.time_scale = 1.0
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        for number, lane in enumerate(self.lanes, 1):
+            action = lane.keys.get(event.key)
+            if action is None or not lane.alive:
+                continue
+            if action == "jump":
+                lane.player.jump()
+            elif action == "roll":
+                lane.player.start_roll()
+            elif action == "throw":
+                lane.player.throw(owner=number)
+            else:
+                lane.player.attack()
+
+    def update(self, dt):
+        """Advance the shared track once, then every racer still running"""
+        game = self._game
+        game.sim_clock.tick(dt)
+        if self.slow_until and game.run_time >= self.slow_until:
+            game.sim_clock.time_scale = 1.0
+            self.slow_until = 0
+        game.animations.advance(dt)
+        game.terrain.update()
+        game.obstacle_manager.update(dt)
+        game.coin_manager.update(dt)
+        game.powerup_manager.update(dt)
+
+        live = {id(o) for o in game.obstacle_manager.obstacles}
+        live.update(id(c) for c in game.coin_manager.coins)
+        for powerup in game.powerup_manager.powerups.values():
+            live.update(id(r) for r in powerup.instances)
+
+        for lane in self.lanes:
+            if not lane.alive:
+                continue
+            # Id objek yang sudah hilang bisa dipakai ulang oleh Python
+            lane.consumed &= live
+            lane.player.update(dt)
+            self._update_effects(lane)
+            self._check_collisions(lane)
+            player = lane.player
+            if player.score_timer >= player.score_interval:
+                player.score_timer = 0
+                player.score += lane.multiplier
+        game.particles.update(dt, game.obstacle_manager.obstacle_speed)
+
+        self.finished = not any(lane.alive for lane in self.lanes)
+
+    def _update_effects(self, lane):
+        run_time = self._game.run_time
+        if lane.player.has_double_jump and run_time >= lane.double_jump_until:
+            lane.player.disable_double_jump()
+        if lane.multiplier != 1 and run_time >= lane.multiplier_until:
+            lane.multiplier = 1
+
+    def _check_collisions(self, lane):
+        game = self._game
+        player = lane.player
+        if player.rect.top > game.HEIGHT:
+            self._finish(lane, "fall")
+            return
+        hitbox = player.rect.inflate(-80, -30)
+        consumed = lane.consumed
+
+        if game.projectiles.arrow_hit(hitbox, lane.lane_bit) >= 0:
+            # Panah dipakai bersama, jadi perisai di mode balapan hanya menahan, tidak memantulkan
+            if not lane.shield_hits:
+                self._finish(lane, "arrow")
+                return
+            self._shield_hit(lane)
+
+        for obstacle in game.obstacle_manager.obstacles:
+            if id(obstacle) in consumed:
+                continue
+            kill_score = game.entities.obstacle_kill_score[obstacle.kind]
+            if (kill_score and player.is_attacking and player.attack_hitbox.colliderect(obstacle.rect)
+                    and not game.obstacle_manager.ai.blocking(obstacle)):
+                consumed.add(id(obstacle))
+                player.score += kill_score
+                continue
+            if hitbox.colliderect(obstacle.rect):
+                if lane.shield_hits:
+                    consumed.add(id(obstacle))
+                    self._shield_hit(lane)
+                    game.particles.burst(obstacle.rect.centerx, obstacle.rect.centery, 12, SHIELD)
+                    continue
+                self._finish(lane, obstacle.type)
+                return
+
+        for coin in game.coin_manager.coins:
+            if id(coin) not in consumed and hitbox.colliderect(coin):
+                consumed.add(id(coin))
+                player.coin_score += 1
+                game.particles.burst(coin.centerx, coin.centery, 10, COIN, speed=2.0)
+                game.play_collectible_sound()
+
+        for name, powerup in game.powerup_manager.powerups.items():
+            for instance in powerup.instances:
+                if id(instance) not in consumed and hitbox.colliderect(instance):
+                    consumed.add(id(instance))
+                    self._activate(lane, name)
+                    game.play_collectible_sound()
+
+    def _shield_hit(self, lane):
+        lane.shield_hits -= 1
+        if not lane.shield_hits:
+            lane.player.deactivate_shield()
+
+    def projectile_hit(self, owner, obstacle):
+        """Resolve a racer's thrown knife hitting an obstacle; True uses the knife up"""
+        game = self._game
+        if not owner:
+            return True
+        lane = self.lanes[owner - 1]
+        if id(obstacle) in lane.consumed:
+            # Rintangan yang sudah dihancurkan pemain ini sudah tidak ada baginya
+            return False
+        kill_score = game.entities.obstacle_kill_score[obstacle.kind]
+        if kill_score and not game.obstacle_manager.ai.blocking(obstacle):
+            lane.consumed.add(id(obstacle))
+            lane.player.score += kill_score
+        return True
+
+    def _activate(self, lane, name):
+        """Apply a powerup to one racer; races use the base values, not shop upgrades"""
+        params = self._game.entities.powerups[name]
+        run_time = self._game.run_time
+        if name == "double_jump":
+            lane.player.enable_double_jump()
+            lane.double_jump_until = run_time + params["duration"]
+        elif name == "shield":
+            lane.player.activate_shield()
+            lane.shield_hits = params["max_hits"]
+        elif name == "multiplier":
+            lane.multiplier = params["value"]
+            lane.multiplier_until = run_time + params["duration"]
+        elif name == "slow_motion":
+            # Waktu dipakai bersama, jadi slow motion berlaku untuk kedua pemain
+            self._game.sim_clock.time_scale = params["value"]
+            self.slow_until = run_time + params["duration"]
+
+    def _finish(self, lane, cause):
+        lane.alive = False
+        lane.cause = cause
+        lane.distance = self._game.terrain.distance
+
+    def winner(self):
+        """Get the lane that went furthest (score breaks ties), or None on a draw"""
+        first, second = sorted(self.lanes, key=lambda l: (l.distance, l.player.score), reverse=True)
+        if (first.distance, first.player.score) == (second.distance, second.player.score):
+            return None
+        return first
+
+    def draw(self, screen):
+        game = self._game
+        world = self._world
+        bg_scroll = self.lanes[0].player.bg_scroll_x
+        world.blit(game.bg_img, (bg_scroll - game.WIDTH, 0))
+        world.blit(game.bg_img, (bg_scroll, 0))
+        game.terrain.draw(world)
+
+        screen.fill((0, 0, 0))
+        for lane, viewport in zip(self.lanes, self._viewports):
+            surface = self._lane_surface
+            surface.blit(world, (0, 0))
+            game.obstacle_manager.draw(surface, lane.consumed)
+            game.projectiles.draw(surface, lane.lane_bit)
+            game.coin_manager.draw(surface, lane.consumed)
+            game.powerup_manager.draw(surface, lane.consumed)
+            if lane.alive:
+                lane.player.draw(surface)
+            game.particles.draw(surface)
+            pygame.transform.scale(surface, viewport.size, screen.subsurface(viewport))
+            pygame.draw.rect(screen, lane.color, viewport, 2)
+            self._draw_hud(screen, lane, viewport)
+
+        if self.finished:
+            winner = self.winner()
+            text = f"{winner.name} wins!" if winner else "Draw!"
+            screen.blit(game.font.render(text, True, YELLOW), (self._viewports[0].right + 20, game.HEIGHT // 2 - 30))
+            screen.blit(game.small_font.render("Enter: back to menu", True, WHITE),
+                        (self._viewports[0].right + 20, game.HEIGHT // 2 + 5))
+
+    def _draw_hud(self, screen, lane, viewport):
+        font = self._game.small_font
+        x = viewport.right + 20
+        y = viewport.top + 15
+        player = lane.player
+        lines = [
+            (f"{lane.name}", lane.color),
+            (f"Score: {int(player.score)}", WHITE),
+            (f"Coins: {player.coin_score}", YELLOW),
+        ]
+        if not lane.alive:
+            lines.append((f"Out ({lane.cause}) at {int(lane.distance)} px", WHITE))
+        else:
+            if player.has_double_jump:
+                lines.append(("Double jump", (0, 255, 0)))
+            if lane.shield_hits:
+                lines.append((f"Shield: {lane.shield_hits} hits", (128, 128, 255)))
+            if lane.multiplier != 1:
+                lines.append((f"Multiplier x{lane.multiplier}", (255, 215, 0)))
+        for text, color in lines:
+            screen.blit(font.render(text, True, color), (x, y))
+            y += 22
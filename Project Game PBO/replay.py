@@ -0,0 +1,255 @@
+"""Replay regression harness.
+
+Runs every recorded input file in replays/ through Game.update headlessly,
+digests the simulation state after every tick and compares the digests with
+the golden file next to the recording.
+
+    python replay.py                  check the whole corpus (and a run without a boss)
+    python replay.py --update         rewrite the golden files
+    python replay.py --generate NAME --seed 7 --ticks 3000
+                                      add a run played by a scripted bot
+
+Recordings of real play are made with `python main.py --record FILE` and can
+be watched (paused, stepped and fast-forwarded) with `python main.py --play FILE`."""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+import zlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game import Game
+from entity_defs import compile_entities
+from input_handler import RECORDING_VERSION, migrate_recording
+from input_mapping import JUMP, ROLL, ATTACK
+from projectiles import ARROW
+
+REPLAY_DIR = "replays"
+# JUMP dua kali, sama seperti space/up pada rekaman versi 1
+GENERATED_ACTIONS = (JUMP, JUMP, ROLL, ATTACK)
+BOT_NOISE = 0.01
+
+
+def state_digest(game):
+    """Get (crc32, state) of everything a player can observe about the simulation"""
+    player = game.player
+    powerups = game.powerup_manager.powerups
+    state = (
+        tuple(player.rect), player.speed_y, player.score, player.coin_score,
+        player.is_rolling, player.is_attacking, player.on_ground,
+        tuple((o.kind, o.rect.x, o.rect.y) for o in game.obstacle_manager.obstacles),
+        tuple((c.x, c.y) for c in game.coin_manager.coins),
+        tuple((name, p.active, tuple((r.x, r.y) for r in p.instances)) for name, p in powerups.items()),
+        game.terrain.distance,
+        tuple(game.projectiles.live()),
+        game.boss.snapshot(),
+    )
+    return zlib.crc32(repr(state).encode()), state
+
+
+class HeadlessGame(Game):
+    """Game that never writes the save file or the run history and plays no audio"""
+
+    HISTORY_FILE = ":memory:"
+
+    def __init__(self):
+        super().__init__()
+        self.settings["music_enabled"] = False
+        self.settings["sound_effects_enabled"] = False
+        pygame.mixer.stop()
+
+    def save_game(self):
+        # Replay tidak boleh mengubah data simpanan pemain
+        pass
+
+
+class ReplayRunner:
+    def __init__(self):
+        self._game = HeadlessGame()
+
+    def run(self, recording):
+        """Replay a recording; returns the per-tick digests and how the run ended"""
+        game = self._game
+        game.reset_data()
+        for name, level in recording["shop"].items():
+            game.upgrades.set_level(name, level)
+        game.game_state = game.GAMEPLAY
+        game.reset_game(recording["seed"])
+
+        inputs = dict(recording["inputs"])
+
+        digests = []
+        for tick in range(recording["ticks"]):
+            game.controls.inject(inputs.get(tick, 0))
+            game.update(game.STEP_MS, float("inf"))
+            digests.append(state_digest(game)[0])
+            if game.game_state != game.GAMEPLAY:
+                break
+        return digests, {"score": game.player.score, "coins": game.player.coin_score}
+
+    def generate(self, seed, ticks):
+        """Play a run with a simple scripted bot and return it as a recording"""
+        game = self._game
+        game.reset_data()
+        game.game_state = game.GAMEPLAY
+        game.reset_game(seed)
+        rng = random.Random(seed)
+        inputs = []
+        for tick in range(ticks):
+            actions = self._bot_actions(game, rng)
+            if actions:
+                inputs.append((tick, actions))
+                game.controls.inject(actions)
+            game.update(game.STEP_MS, float("inf"))
+            if game.game_state != game.GAMEPLAY:
+                ticks = tick + 1
+                break
+        return {"version": RECORDING_VERSION, "seed": seed, "shop": {}, "ticks": ticks, "inputs": inputs}
+
+    def _bot_actions(self, game, rng):
+        """Jump over ground obstacles and gaps, roll under arrows, attack enemies"""
+        player = game.player
+        if rng.random() < BOT_NOISE:
+            return rng.choice(GENERATED_ACTIONS)
+        if not player.on_ground:
+            return 0
+        if not game.terrain.solid_ground(player.rect.right - 30, player.rect.right + 10):
+            return JUMP
+        hitbox = player.rect.inflate(-80, -30)
+        for kind, x, y, width, height in game.projectiles.live():
+            # Panah setinggi badan dihindari dengan berguling
+            if kind == ARROW and 0 <= x - hitbox.right < 40 and y + height > hitbox.top and not player.is_rolling:
+                return ROLL
+        for obstacle in game.obstacle_manager.obstacles:
+            distance = obstacle.rect.left - hitbox.right
+            if game.entities.obstacle_kill_score[obstacle.kind]:
+                if 0 <= distance < 60:
+                    return ATTACK
+            elif game.entities.obstacle_anchor_top[obstacle.kind]:
+                if 0 <= distance < 40 and obstacle.rect.bottom > hitbox.top and not player.is_rolling:
+                    return ROLL
+            elif 0 <= distance < 24:
+                return JUMP
+        return 0
+
+    def run_without_boss(self, seed, ticks):
+        """Play ticks of a run whose entity definitions have no boss section.
+
+        The section is dropped by a retune during a boss fight, the way a hot
+        reload would, and a second run is then started without it. Both runs
+        begin at the first milestone score."""
+        game = self._game
+        with open(game.ENTITY_FILE, "r") as f:
+            data = json.load(f)
+        del data["boss"]
+        entities = game.entities
+        game.reset_data()
+        game.game_state = game.GAMEPLAY
+        game.reset_game(seed)
+        game.player.score = entities.boss["first_score"]
+        try:
+            game.update(game.STEP_MS, float("inf"))
+            game.retune(compile_entities(data, game.atlas, game.ENTITY_FILE))
+            for restart in (False, True):
+                if restart:
+                    game.game_state = game.GAMEPLAY
+                    game.reset_game(seed)
+                    game.player.score = entities.boss["first_score"]
+                for _ in range(ticks):
+                    game.update(game.STEP_MS, float("inf"))
+                    game.render()
+                    if game.game_state != game.GAMEPLAY:
+                        break
+            return game.boss.active
+        finally:
+            game.retune(entities)
+
+    def state_at(self, recording, tick):
+        """Replay up to tick and return the readable state there"""
+        self.run(dict(recording, ticks=tick + 1))
+        return state_digest(self._game)[1]
+
+    def close(self):
+        self._game.run_history.close()
+
+
+def golden_path(path):
+    return path[:-len(".json")] + ".golden"
+
+
+def check_corpus(runner, update=False):
+    """Replay every recording; returns the number of recordings that diverged"""
+    failures = 0
+    total_ticks = 0
+    start = time.perf_counter()
+    for path in sorted(glob.glob(os.path.join(REPLAY_DIR, "*.json"))):
+        with open(path, "r") as f:
+            recording = migrate_recording(json.load(f))
+        digests, end = runner.run(recording)
+        total_ticks += len(digests)
+        golden = golden_path(path)
+
+        if update or not os.path.exists(golden):
+            with open(golden, "w") as f:
+                json.dump({"digests": digests, "end": end}, f)
+            print(f"{path}: wrote {len(digests)} ticks")
+            continue
+
+        with open(golden, "r") as f:
+            expected = json.load(f)["digests"]
+        diverged = next((tick for tick, (a, b) in enumerate(zip(digests, expected)) if a != b), None)
+        if diverged is None and len(digests) != len(expected):
+            diverged = min(len(digests), len(expected))
+        if diverged is None:
+            print(f"{path}: ok ({len(digests)} ticks)")
+        else:
+            failures += 1
+            print(f"{path}: DIVERGED at tick {diverged} ({len(digests)} ticks, golden {len(expected)})")
+            print(f"  state now: {runner.state_at(recording, diverged)}")
+
+    elapsed = time.perf_counter() - start
+    print(f"{total_ticks} ticks in {elapsed:.2f} s ({total_ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    return failures
+
+
+def check_without_boss(runner, ticks=120):
+    """Run a few ticks with the boss section removed; returns 1 on failure"""
+    try:
+        active = runner.run_without_boss(1, ticks)
+    except Exception as e:
+        print(f"no boss section: FAILED ({type(e).__name__}: {e})")
+        return 1
+    if active:
+        print("no boss section: FAILED (a boss fight is still on)")
+        return 1
+    print(f"no boss section: ok ({ticks} ticks)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay regression harness")
+    parser.add_argument("--update", action="store_true", help="rewrite the golden files")
+    parser.add_argument("--generate", metavar="NAME", help="add a scripted recording to the corpus")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=3600)
+    args = parser.parse_args()
+
+    runner = ReplayRunner()
+    try:
+        if args.generate:
+            with open(os.path.join(REPLAY_DIR, f"{args.generate}.json"), "w") as f:
+                json.dump(runner.generate(args.seed, args.ticks), f)
+        failures = check_corpus(runner, args.update) + check_without_boss(runner)
+    finally:
+        runner.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    score REAL NOT NULL,
+    coins INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    powerups TEXT NOT NULL,
+    cause TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, score DESC);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    total REAL NOT NULL,
+    best REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS achievements (
+    id TEXT PRIMARY KEY,
+    unlocked_at REAL NOT NULL
+);
+"""
+
+_INSERT = """
+INSERT INTO runs (played_at, day, score, coins, duration_ms, seed, powerups, cause)
+VALUES (:played_at, :day, :score, :coins, :duration_ms, :seed, :powerups, :cause)
+"""
+_SAVE_STAT = "INSERT OR REPLACE INTO stats (name, total, best) VALUES (?, ?, ?)"
+_SAVE_ACHIEVEMENT = "INSERT OR IGNORE INTO achievements (id, unlocked_at) VALUES (?, ?)"
+
+
+class RunHistory:
+    """SQLite run log plus lifetime stats; all writes happen in batches on a
+    background thread"""
+
+    TOP_COUNT = 3
+    DAY_COUNT = 7
+
+    def __init__(self, path):
+        self._path = path
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._summary = {"top": [], "days": [], "today_best": 0, "runs": 0, "last_rank": None}
+        self._thread = threading.Thread(target=self._writer_loop, name="run-history", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self._path)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def record_run(self, score, coins, duration_ms, seed, powerups, cause):
+        """Queue a finished run; returns immediately"""
+        now = time.time()
+        self._queue.put(("run", {
+            "played_at": now,
+            "day": time.strftime("%Y-%m-%d", time.localtime(now)),
+            "score": score,
+            "coins": coins,
+            "duration_ms": int(duration_ms),
+            "seed": seed,
+            "powerups": json.dumps(powerups),
+            "cause": cause,
+        }))
+
+    def record_stats(self, totals, best, unlocked):
+        """Queue stat values and newly unlocked achievements; returns immediately"""
+        self._queue.put(("stats", (totals, best, dict(unlocked))))
+
+    def load_stats(self):
+        """Read (totals, best, {achievement: unlocked_at}) back; done once at startup"""
+        with closing(self._connect()) as connection:
+            connection.executescript(_SCHEMA)
+            stats = connection.execute("SELECT name, total, best FROM stats").fetchall()
+            achievements = connection.execute("SELECT id, unlocked_at FROM achievements").fetchall()
+        return ({row["name"]: row["total"] for row in stats}, {row["name"]: row["best"] for row in stats},
+                {row["id"]: row["unlocked_at"] for row in achievements})
+
+    def _writer_loop(self):
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        self._refresh_summary(connection, None)
+        while True:
+            batch = [self._queue.get()]
+            # Kumpulkan semua run yang sudah mengantre supaya ditulis dalam satu transaksi
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            runs = [item for kind, item in filter(None, batch) if kind == "run"]
+            stats = [item for kind, item in filter(None, batch) if kind == "stats"]
+            if runs or stats:
+                with connection:
+                    connection.executemany(_INSERT, runs)
+                    self._write_stats(connection, stats)
+            if runs:
+                self._refresh_summary(connection, runs[-1]["score"])
+            if None in batch:
+                break
+        connection.close()
+
+    def _write_stats(self, connection, stats):
+        if not stats:
+            return
+        # Nilai terakhir sudah mencakup yang sebelumnya, jadi cukup itu yang ditulis
+        totals, best, _ = stats[-1]
+        connection.executemany(_SAVE_STAT, [(name, totals[name], best[name]) for name in totals])
+        connection.executemany(_SAVE_ACHIEVEMENT, [
+            (achievement, unlocked_at) for _, _, unlocked in stats for achievement, unlocked_at in unlocked.items()])
+
+    def _refresh_summary(self, connection, last_score):
+        """Recompute the cached menu summary after a write"""
+        summary = {
+            "top": [row["score"] for row in self._top_runs(connection, self.TOP_COUNT)],
+            "days": [tuple(row) for row in self._daily_bests(connection, self.DAY_COUNT)],
+            "runs": connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0],
+            "last_rank": None,
+        }
+        today = time.strftime("%Y-%m-%d")
+        summary["today_best"] = next((best for day, best in summary["days"] if day == today), 0)
+        if last_score is not None:
+            summary["last_rank"] = self._percentile_rank(connection, last_score)
+        with self._lock:
+            self._summary = summary
+
+    def _top_runs(self, connection, n):
+        return connection.execute(
+            "SELECT * FROM runs ORDER BY score DESC LIMIT ?", (n,)).fetchall()
+
+    def _daily_bests(self, connection, days):
+        return connection.execute(
+            "SELECT day, MAX(score) FROM runs GROUP BY day ORDER BY day DESC LIMIT ?",
+            (days,)).fetchall()
+
+    def _percentile_rank(self, connection, score):
+        total = connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        if total == 0:
+            return 100.0
+        below = connection.execute(
+            "SELECT COUNT(*) FROM runs WHERE score < ?", (score,)).fetchone()[0]
+        return 100.0 * below / total
+
+    def top_runs(self, n=10):
+        """Get the n best runs as dicts"""
+        with closing(self._connect()) as connection:
+            return [dict(row) for row in self._top_runs(connection, n)]
+
+    def daily_bests(self, days=7):
+        """Get (day, best score) for the most recent days"""
+        with closing(self._connect()) as connection:
+            return [tuple(row) for row in self._daily_bests(connection, days)]
+
+    def percentile_rank(self, score):
+        """Get the percentage of recorded runs that scored below score"""
+        with closing(self._connect()) as connection:
+            return self._percentile_rank(connection, score)
+
+    def close(self):
+        """Write pending runs and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    @property
+    def summary(self):
+        """Get the cached menu summary (never touches the database)"""
+        with self._lock:
+            return self._summary
@@ -0,0 +1,558 @@
+import threading
+import pygame
+from particles import TRAIL
+from input_mapping import JUMP, ROLL, ATTACK, THROW, PAUSE, HITBOXES
+
+
+class Scene:
+    """One screen of the game.
+
+    Scenes are created once and kept for the whole session, so a scene that is
+    switched away from keeps its caches and is warm when it comes back. ASSETS
+    are prefetched on the preload thread (file reads only, no pygame calls) and
+    decoded on the main thread by warm(). An OVERLAY scene is drawn on top of a
+    frozen copy of the scene underneath, which is not rendered again while the
+    overlay is shown."""
+
+    OVERLAY = False
+    ASSETS = ()
+
+    def __init__(self, game):
+        self._game = game
+
+    def preload(self):
+        """Read the scene's asset files into memory; runs on the preload thread"""
+        for name in self.ASSETS:
+            self._game.assets.prefetch(name)
+
+    def warm(self):
+        """Decode prefetched assets and build caches; runs on the main thread"""
+        assets = self._game.assets
+        for name in self.ASSETS:
+            if not assets.exists(name):
+                continue
+            if name.lower().endswith(".wav"):
+                assets.sound(name)
+            else:
+                assets.image(name)
+
+    def enter(self, previous):
+        """Called when the scene becomes active; previous is the key of the scene it replaced"""
+
+    def exit(self):
+        """Called when the scene is switched away from or popped"""
+
+    def suspend(self):
+        """Called when an overlay is pushed on top of the scene"""
+
+    def resume(self):
+        """Called when the overlay on top of the scene is popped"""
+
+    def handle_event(self, stamp, event):
+        pass
+
+    def update(self, dt, until):
+        pass
+
+    def render(self, screen):
+        pass
+
+
+class SceneStack:
+    """Active scenes, bottom first; only the top one gets events, ticks and renders"""
+
+    def __init__(self):
+        self._scenes = {}
+        self._stack = []
+        self._preloaded = {}
+        self._warm = set()
+        self._thread = None
+
+    def register(self, key, scene):
+        self._scenes[key] = scene
+
+    def preload(self):
+        """Prefetch the assets of every registered scene on a background thread"""
+        keys = list(self._scenes)
+        for key in keys:
+            self._preloaded.setdefault(key, threading.Event())
+
+        def run():
+            for key in keys:
+                try:
+                    self._scenes[key].preload()
+                except OSError as e:
+                    print(f"Warning: could not preload scene {key}: {e}")
+                self._preloaded[key].set()
+
+        self._thread = threading.Thread(target=run, name="scene-preload", daemon=True)
+        self._thread.start()
+
+    def warm_pending(self):
+        """Warm one scene whose preload has finished; cheap enough to call every frame"""
+        for key, ready in self._preloaded.items():
+            if key not in self._warm and ready.is_set():
+                self._ready(key)
+                return
+
+    def _ready(self, key):
+        if key in self._warm:
+            return self._scenes[key]
+        ready = self._preloaded.get(key)
+        if ready is None:
+            self._scenes[key].preload()
+        else:
+            ready.wait()
+        self._scenes[key].warm()
+        self._warm.add(key)
+        return self._scenes[key]
+
+    def switch(self, key):
+        """Replace the whole stack with the scene registered as key"""
+        previous = self.key
+        while self._stack:
+            self._stack.pop()[1].exit()
+        scene = self._ready(key)
+        self._stack.append((key, scene))
+        scene.enter(previous)
+
+    def push(self, key):
+        """Show an overlay scene on top of the current one"""
+        previous = self.key
+        if self._stack:
+            self._stack[-1][1].suspend()
+        scene = self._ready(key)
+        self._stack.append((key, scene))
+        scene.enter(previous)
+
+    def pop(self):
+        """Close the top scene and resume the one underneath"""
+        self._stack.pop()[1].exit()
+        if self._stack:
+            self._stack[-1][1].resume()
+
+    def handle_event(self, stamp, event):
+        self.top.handle_event(stamp, event)
+
+    def update(self, dt, until):
+        self.top.update(dt, until)
+
+    def render(self, screen):
+        self.top.render(screen)
+
+    def __contains__(self, key):
+        return any(k == key for k, _ in self._stack)
+
+    @property
+    def top(self):
+        return self._stack[-1][1]
+
+    @property
+    def key(self):
+        """Get the key of the top scene, or None before the first switch"""
+        return self._stack[-1][0] if self._stack else None
+
+
+class UIScene(Scene):
+    """Scene drawn by a retained-mode UIScreen from game.screens"""
+
+    def __init__(self, game, key):
+        super().__init__(game)
+        self._key = key
+
+    def warm(self):
+        super().warm()
+        self.screen.prepare()
+
+    def render(self, screen):
+        self.screen.draw(screen)
+
+    def _clicked(self, event):
+        """Get the action of a left click, or None"""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            return self.screen.hit_test(event.pos)
+        return None
+
+    @property
+    def screen(self):
+        return self._game.screens[self._key]
+
+
+class MenuScene(UIScene):
+    ASSETS = ("menu_start.png", "sound_menu.wav")
+
+    def handle_event(self, stamp, event):
+        game = self._game
+        action = self._clicked(event)
+        if action == "start":
+            game.start_run()
+        elif action == "shop":
+            game.scenes.switch(game.SHOP)
+        elif action == "setting":
+            game.scenes.switch(game.SETTING)
+        elif action == "reset":
+            game.reset_data()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_r and game.retry_snapshot is not None:
+                game.retry_from_checkpoint()
+            elif event.key == pygame.K_c and game.suspended_run is not None:
+                game.continue_suspended_run()
+            elif event.key == pygame.K_2:
+                game.start_race()
+
+
+class ShopScene(UIScene):
+    def handle_event(self, stamp, event):
+        game = self._game
+        action = self._clicked(event)
+        if action == "back":
+            game.scenes.switch(game.MENU)
+        elif action in game.upgrades.names:
+            game.buy_item(action)
+            game.play_collectible_sound()
+
+
+class SettingsScene(UIScene):
+    def handle_event(self, stamp, event):
+        game = self._game
+        action = self._clicked(event)
+        if action == "back":
+            game.scenes.switch(game.MENU)
+        elif action == "music":
+            game.toggle_music()
+        elif action == "sfx":
+            game.toggle_sound_effects()
+        elif action == "controls":
+            game.scenes.switch(game.CONTROLS)
+
+
+class ControlsScene(UIScene):
+    """Rebinding: click an action, then press the key or pad button for it (Esc cancels)"""
+
+    def exit(self):
+        self.screen.waiting = None
+
+    def handle_event(self, stamp, event):
+        game = self._game
+        screen = self.screen
+        if screen.waiting is not None:
+            if event.type == pygame.KEYDOWN:
+                if event.key != pygame.K_ESCAPE:
+                    game.controls.rebind(screen.waiting, event.key)
+                    game.save_game()
+                screen.waiting = None
+            elif event.type == pygame.JOYBUTTONDOWN:
+                game.controls.rebind_button(screen.waiting, event.button)
+                game.save_game()
+                screen.waiting = None
+            return
+
+        action = self._clicked(event)
+        if action == "back":
+            game.scenes.switch(game.SETTING)
+        elif action == "defaults":
+            game.controls.reset_bindings()
+            game.save_game()
+        elif action is not None:
+            screen.waiting = action
+
+
+class PauseScene(UIScene):
+    """Pause menu over the frozen gameplay frame; timers follow run_time, so nothing
+    advances until the overlay is popped"""
+
+    OVERLAY = True
+
+    def enter(self, previous):
+        # Bekukan frame gameplay terakhir sebagai latar; overlay lalu cukup di-blit tiap frame
+        self.screen.invalidate()
+        pygame.mixer.pause()
+
+    def handle_event(self, stamp, event):
+        game = self._game
+        action = self._clicked(event)
+        if game.controls.event_bits(event) & PAUSE:
+            action = "resume"
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+            action = "menu"
+
+        if action == "resume":
+            game.resume_game()
+        elif action == "menu":
+            game.scenes.switch(game.MENU)
+            pygame.mixer.unpause()
+            game.play_menu_music()
+
+
+class GameplayScene(Scene):
+    ASSETS = ("sound_gameplay.wav", "sound_collectible.wav")
+
+    def __init__(self, game):
+        super().__init__(game)
+        self._hud = []
+        self._hud_frame = 0
+
+    def enter(self, previous):
+        self._hud = []
+
+    def resume(self):
+        self._game.input.clear()
+        self._game.controls.clear()
+        pygame.mixer.unpause()
+
+    def handle_event(self, stamp, event):
+        game = self._game
+        # Tombol debug tidak memengaruhi simulasi, jadi langsung dijalankan
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            game.profiler.overlay_visible = not game.profiler.overlay_visible
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            game.print_memory_report()
+        else:
+            # Diproses di dalam update() pada tick saat event terjadi
+            game.input.queue(stamp, event)
+
+    def update(self, dt, until):
+        """Advance one simulation tick; actions stamped before until are applied first"""
+        game = self._game
+        actions = self._actions(until)
+        if game.recorder is not None:
+            game.recorder.record(round(game.run_time / game.STEP_MS), actions)
+        if actions:
+            self._apply_actions(actions)
+            if game.scenes.top is not self:
+                return
+        game.sim_clock.tick(dt)
+        game.animations.advance(dt)
+        game.terrain.update()
+        game.player.update(dt)
+        game.obstacle_manager.update(dt)
+        game.boss.update(dt)
+        game.coin_manager.update(dt)
+        game.powerup_manager.update(dt)
+        game.check_collisions()
+        self._update_effects(dt)
+        if game.scenes.top is self:
+            game.stats.add("distance", game.obstacle_manager.obstacle_speed)
+            game.checkpoints.update(game)
+            game.ghost.sample(game.run_time, game.player.rect.y)
+
+        if game.player.score_timer >= game.player.score_interval:
+            game.player.score_timer = 0
+            game.player.score += game.powerup_manager.multiplier_value
+
+    def _actions(self, until):
+        """Get the action mask of this tick from the events due and the gamepads"""
+        game = self._game
+        pressed = 0
+        for stamp, event in game.input.due(until):
+            pressed |= game.controls.event_bits(event)
+            game.profiler.input_applied(stamp)
+        return game.controls.poll(pressed)
+
+    def _apply_actions(self, actions):
+        game = self._game
+        if actions & ROLL:
+            game.player.start_roll()
+        if actions & JUMP:
+            game.player.jump()
+        if actions & ATTACK:
+            game.player.attack()
+        if actions & THROW:
+            game.player.throw()
+        if actions & HITBOXES:
+            game.settings["hitbox_visible"] = not game.settings["hitbox_visible"]
+        if actions & PAUSE:
+            game.pause_game()
+
+    def _update_effects(self, dt):
+        game = self._game
+        if game.powerup_manager.double_jump_active and not game.player.on_ground:
+            game.particles.trail(game.player.rect.left + 30, game.player.rect.centery, TRAIL)
+        game.particles.update(dt, game.obstacle_manager.obstacle_speed)
+
+    def render(self, screen):
+        game = self._game
+        if game.quality.parallax:
+            screen.blit(game.bg_img, (game.player.bg_scroll_x - game.WIDTH, 0))
+            screen.blit(game.bg_img, (game.player.bg_scroll_x, 0))
+        else:
+            screen.blit(game.bg_img, (0, 0))
+
+        game.terrain.draw(screen)
+        game.obstacle_manager.draw(screen)
+        game.boss.draw(screen)
+        game.projectiles.draw(screen)
+        game.coin_manager.draw(screen)
+        game.powerup_manager.draw(screen)
+        game.player.draw(screen)
+        game.particles.draw(screen)
+
+        # Teks HUD dirender ulang setiap hud_interval frame, di antaranya dipakai ulang
+        if self._hud_frame % game.quality.hud_interval == 0 or not self._hud:
+            self._hud = self._render_hud()
+        self._hud_frame += 1
+        screen.blits(self._hud, False)
+
+        if game.settings["hitbox_visible"] and game.quality.hitboxes:
+            pygame.draw.rect(screen, (255, 0, 0), game.player.rect.inflate(-80, -30), 2)
+            for c in game.coin_manager.coins:
+                pygame.draw.rect(screen, (255, 255, 0), c, 2)
+            for obstacle in game.obstacle_manager.obstacles:
+                color = (255, 255, 255) if obstacle.type == "arrow" else (0, 0, 255)
+                pygame.draw.rect(screen, color, obstacle.rect, 2)
+            for dj in game.powerup_manager._double_jump._instances:
+                pygame.draw.rect(screen, (0, 255, 0), dj, 2)
+            for s in game.powerup_manager._shield._instances:
+                pygame.draw.rect(screen, (0, 0, 255), s, 2)
+            for m in game.powerup_manager._multiplier._instances:
+                pygame.draw.rect(screen, (255, 165, 0), m, 2)
+            for sm in game.powerup_manager._slow_motion._instances:
+                pygame.draw.rect(screen, (0, 255, 255), sm, 2)
+
+        if game.profiler.overlay_visible:
+            game.profiler.draw(screen, game.small_font, (10, 70))
+
+    def _render_hud(self):
+        """Get the HUD text as (surface, position) pairs"""
+        game = self._game
+        font = game.font
+        powerups = game.powerup_manager
+        hud = [
+            (font.render(f"Score: {int(game.player.score)}", True, (255, 255, 255)), (10, 10)),
+            (font.render(f"Coins: {game.player.coin_score}", True, (255, 255, 0)), (10, 40)),
+        ]
+
+        if powerups.double_jump_active:
+            dj_powerup = powerups._double_jump
+            elapsed = game.run_time - dj_powerup._timer
+            hud.append((
+                font.render(f"Double Jump: {(dj_powerup._duration - elapsed)//1000}s", True, (0, 255, 0)),
+                (game.WIDTH - 220, 10)
+            ))
+
+        if powerups.shield_active:
+            shield_powerup = powerups._shield
+            hud.append((
+                font.render(f"Shield: {shield_powerup.hits_remaining} hits", True, (128, 128, 255)),
+                (game.WIDTH - 220, 40)
+            ))
+
+        if powerups.multiplier_active:
+            multiplier_powerup = powerups._multiplier
+            elapsed = game.run_time - multiplier_powerup._timer
+            hud.append((
+                font.render(f"Multiplier: {(multiplier_powerup._duration - elapsed)//1000}s", True, (255, 215, 0)),
+                (game.WIDTH - 220, 70)
+            ))
+
+        if powerups.slow_motion_active:
+            slow_powerup = powerups._slow_motion
+            elapsed = game.run_time - slow_powerup._timer
+            # Durasi dalam waktu simulasi; sisa waktu ditampilkan dalam detik nyata
+            remaining = (slow_powerup._duration - elapsed) / slow_powerup._value
+            hud.append((
+                font.render(f"Slow Motion: {int(remaining)//1000}s", True, (0, 255, 255)),
+                (game.WIDTH - 220, 100)
+            ))
+
+        for i, title in enumerate(game.stats.notices()):
+            image = game.small_font.render(f"Achievement unlocked: {title}", True, (255, 215, 0))
+            hud.append((image, (game.WIDTH // 2 - image.get_width() // 2, 110 + 22 * i)))
+        return hud
+
+
+class RaceScene(Scene):
+    def handle_event(self, stamp, event):
+        self._game.input.queue(stamp, event)
+
+    def update(self, dt, until):
+        game = self._game
+        for stamp, event in game.input.due(until):
+            self._apply_input(event)
+            game.profiler.input_applied(stamp)
+            if game.scenes.top is not self:
+                return
+        if not game.race.finished:
+            game.race.update(dt)
+
+    def _apply_input(self, event):
+        game = self._game
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE or (event.key == pygame.K_RETURN and game.race.finished):
+                game.end_race()
+                return
+            if event.key == pygame.K_F3:
+                game.profiler.overlay_visible = not game.profiler.overlay_visible
+        game.race.handle_event(event)
+
+    def render(self, screen):
+        game = self._game
+        game.race.draw(screen)
+        if game.profiler.overlay_visible:
+            game.profiler.draw(screen, game.small_font, (330, 250))
+
+
+class PlaybackScene(GameplayScene):
+    """Replay viewer for recordings made with --record.
+
+    The recorded action masks are fed in tick by tick in place of live input,
+    so the run plays out exactly as recorded. Viewer keys work on the
+    simulation clock: space pauses on an exact tick, right arrow steps one
+    tick, f skips SKIP_MS ahead without drawing the frames in between and
+    1-4 set the playback speed."""
+
+    SPEEDS = {pygame.K_1: 1, pygame.K_2: 2, pygame.K_3: 4, pygame.K_4: 8}
+    SKIP_MS = 5000
+
+    def __init__(self, game):
+        super().__init__(game)
+        self._inputs = {}
+        self._ticks = 0
+
+    def enter(self, previous):
+        super().enter(previous)
+        recording = self._game.playback
+        self._inputs = dict(recording["inputs"])
+        self._ticks = recording["ticks"]
+
+    def exit(self):
+        clock = self._game.sim_clock
+        clock.speed = 1.0
+        clock.paused = False
+
+    def handle_event(self, stamp, event):
+        game = self._game
+        clock = game.sim_clock
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_SPACE:
+            clock.paused = not clock.paused
+        elif event.key == pygame.K_RIGHT:
+            clock.step()
+        elif event.key == pygame.K_f:
+            clock.step(round(self.SKIP_MS / game.STEP_MS))
+        elif event.key in self.SPEEDS:
+            clock.speed = self.SPEEDS[event.key]
+        elif event.key == pygame.K_ESCAPE:
+            game.stop_playback()
+        elif event.key in (pygame.K_F3, pygame.K_F4):
+            super().handle_event(stamp, event)
+
+    def update(self, dt, until):
+        game = self._game
+        if round(game.run_time / game.STEP_MS) >= self._ticks:
+            game.stop_playback()
+            return
+        super().update(dt, until)
+
+    def _actions(self, until):
+        # Pause di rekaman menghentikan waktu, jadi saat diputar ulang diabaikan
+        game = self._game
+        return self._inputs.get(round(game.run_time / game.STEP_MS), 0) & ~PAUSE
+
+    def render(self, screen):
+        super().render(screen)
+        clock = self._game.sim_clock
+        status = "Paused" if clock.paused else f"Replay {clock.speed:g}x"
+        image = self._game.small_font.render(status, True, (255, 255, 255))
+        screen.blit(image, (self._game.WIDTH // 2 - image.get_width() // 2, 10))
@@ -0,0 +1,60 @@
+class SimClock:
+    """Simulated time of the current run, kept apart from the wall clock.
+
+    Every gameplay timer (powerup durations, roll and attack cooldowns, spawn
+    timers, animations) is measured in simulated ms, which only move when a
+    tick runs; tick() is the one place run time advances. The main loop asks
+    ticks() how many fixed steps a frame of real time is worth, and that is
+    where time is scaled: a tick always simulates exactly one step, so a run
+    plays out the same at any speed.
+
+    The rate is time_scale, set by the simulation itself (slow motion) and part
+    of the run state, times speed, the playback speed of the replay viewer.
+    While paused no tick runs except the ones asked for with step()."""
+
+    def __init__(self, step_ms):
+        self._step_ms = step_ms
+        self._accumulator = 0.0
+        self._steps = 0
+        self.speed = 1.0
+        self.paused = False
+        self.reset()
+
+    def reset(self):
+        """Start a run at time 0 and normal time scale; viewer speed and pause are kept"""
+        self.time = 0
+        self.time_scale = 1.0
+
+    def tick(self, dt):
+        """Advance simulated time by one tick"""
+        self.time += dt
+
+    def step(self, count=1):
+        """Run count extra ticks on the next frame, also while paused"""
+        self._steps += count
+
+    def ticks(self, now, elapsed):
+        """Yield the real-time end stamp of every tick due after elapsed ms of
+        real time ending at now; input stamped before it belongs to that tick.
+
+        The last tick of the frame ends at now, so input polled before now is
+        applied in this frame and never waits for the next one."""
+        while self._steps:
+            self._steps -= 1
+            yield now
+        if self.paused:
+            # Waktu selama pause tidak ditabung, jadi tidak ada lonjakan tick saat lanjut
+            self._accumulator = 0.0
+            return
+        rate = self.rate
+        step = self._step_ms
+        self._accumulator += elapsed * rate
+        while self._accumulator >= step:
+            self._accumulator -= step
+            # Satu tick mencakup step / rate ms waktu nyata
+            yield now if self._accumulator < step else now - self._accumulator / rate
+
+    @property
+    def rate(self):
+        """Get simulated ms per real ms"""
+        return self.time_scale * self.speed
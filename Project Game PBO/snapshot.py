@@ -0,0 +1,121 @@
+import json
+import os
+from collections import deque
+
+SNAPSHOT_VERSION = 8
+
+
+def _rng_state(state):
+    """Turn a (possibly JSON-decoded) random.getstate() value back into a tuple"""
+    return state[0], tuple(state[1]), state[2]
+
+
+def _to_lists(value):
+    if isinstance(value, (tuple, list)):
+        return [_to_lists(item) for item in value]
+    return value
+
+
+class GameSnapshot:
+    """Complete run state as nested tuples of numbers and booleans.
+
+    Every component captures itself with snapshot() and rebuilds with restore();
+    no pygame object is copied, so capture and restore cost well under a
+    millisecond. Cosmetic state (particles, input queue) is not included."""
+
+    __slots__ = ("run_time", "state")
+
+    def __init__(self, run_time, state):
+        self.run_time = run_time
+        self.state = state
+
+    @classmethod
+    def capture(cls, game):
+        state = (
+            game.run_seed, game.run_time, game.coins_banked, game.rng.getstate(),
+            game.animations.time,
+            game.player.snapshot(),
+            game.terrain.snapshot(),
+            game.placement.snapshot(),
+            game.obstacle_manager.snapshot(),
+            game.coin_manager.snapshot(),
+            game.powerup_manager.snapshot(),
+            game.projectiles.snapshot(),
+            game.boss.snapshot(),
+            game.stats.snapshot(),
+        )
+        return cls(game.run_time, state)
+
+    def restore(self, game):
+        (game.run_seed, game.run_time, game.coins_banked, rng_state, animation_time,
+         player, terrain, placement, obstacles, coins, powerups, projectiles, boss, stats) = self.state
+        game.rng.setstate(_rng_state(rng_state))
+        game.animations.time = animation_time
+        game.player.restore(player)
+        game.terrain.restore(terrain)
+        game.placement.restore(placement)
+        game.obstacle_manager.restore(obstacles)
+        game.coin_manager.restore(coins)
+        game.powerup_manager.restore(powerups)
+        game.projectiles.restore(projectiles)
+        game.boss.restore(boss)
+        game.stats.restore(stats)
+        game.particles.reset()
+        game.input.clear()
+        game.controls.clear()
+
+    def save(self, path):
+        """Write the snapshot to disk as JSON"""
+        with open(path, "w") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "state": _to_lists(self.state)}, f)
+
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot written by save(), or None if missing or incompatible"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring suspended run: {e}")
+            return None
+        if data.get("version") != SNAPSHOT_VERSION:
+            return None
+        return cls(data["state"][1], data["state"])
+
+
+class CheckpointRing:
+    """Snapshots taken every INTERVAL_MS of run time, keeping the last CAPACITY"""
+
+    INTERVAL_MS = 1000
+    CAPACITY = 10
+
+    def __init__(self):
+        self._snapshots = deque(maxlen=self.CAPACITY)
+        self._next = 0
+
+    def reset(self):
+        self._snapshots.clear()
+        self._next = 0
+
+    def update(self, game):
+        """Take a checkpoint when run time crosses the next interval"""
+        if game.run_time >= self._next:
+            self._snapshots.append(GameSnapshot.capture(game))
+            self._next = game.run_time + self.INTERVAL_MS
+
+    def before(self, run_time):
+        """Get the latest checkpoint taken at or before run_time (or the oldest one)"""
+        chosen = None
+        for snapshot in self._snapshots:
+            if snapshot.run_time > run_time:
+                break
+            chosen = snapshot
+        if chosen is None and self._snapshots:
+            chosen = self._snapshots[0]
+        return chosen
+
+    @property
+    def snapshots(self):
+        return tuple(self._snapshots)
@@ -0,0 +1,100 @@
+import sys
+from bisect import bisect_left, bisect_right
+
+
+class SpawnPlacement:
+    """Interval index of the space taken by spawned obstacles, coins and powerups.
+
+    Reservations are kept in world coordinates (like Terrain) in parallel lists
+    sorted by left edge, so they stay valid while the world scrolls. A query only
+    looks at the entries found by one bisect: no reservation is wider than the
+    widest one seen this run, so anything starting further left cannot reach the
+    queried range. Entries behind the left edge of the screen are dropped by
+    moving the head index."""
+
+    MARGIN = 8
+    COMPACT_AT = 64
+
+    def __init__(self, game):
+        self._game = game
+        self.reset()
+
+    def reset(self):
+        self._lefts = []
+        self._rights = []
+        self._tops = []
+        self._bottoms = []
+        self._head = 0
+        self._max_width = 0
+
+    def _drop_passed(self, offset):
+        # Entri yang mulai lebih kiri dari offset - max_width pasti sudah lewat layar
+        lefts = self._lefts
+        while self._head < len(lefts) and lefts[self._head] + self._max_width < offset:
+            self._head += 1
+        if self._head >= self.COMPACT_AT:
+            del self._lefts[:self._head], self._rights[:self._head]
+            del self._tops[:self._head], self._bottoms[:self._head]
+            self._head = 0
+
+    def find(self, left, width, top, bottom, reach):
+        """Get the leftmost screen x in [left, left + reach] where a width-wide
+        entity spanning top..bottom overlaps no reservation, or None"""
+        offset = self._game.terrain.distance
+        self._drop_passed(offset)
+        margin = self.MARGIN
+        x = left + offset
+        limit = x + reach
+        lefts, rights, tops, bottoms = self._lefts, self._rights, self._tops, self._bottoms
+        first = max(self._head, bisect_left(lefts, x - self._max_width - margin))
+        last = bisect_right(lefts, limit + width + margin)
+        # Entri terurut menurut sisi kiri; setiap bentrokan menggeser x ke kanan entri itu
+        for i in range(first, last):
+            if lefts[i] >= x + width + margin:
+                break
+            if rights[i] + margin > x and tops[i] < bottom and bottoms[i] > top:
+                x = rights[i] + margin
+                if x > limit:
+                    return None
+        return x - offset
+
+    def reserve(self, rect):
+        """Mark the space of a Rect (screen coordinates) as taken"""
+        left = rect.left + self._game.terrain.distance
+        i = bisect_right(self._lefts, left, self._head)
+        self._lefts.insert(i, left)
+        self._rights.insert(i, left + rect.width)
+        self._tops.insert(i, rect.top)
+        self._bottoms.insert(i, rect.bottom)
+        self._max_width = max(self._max_width, rect.width)
+
+    def place(self, rect, reach):
+        """Move rect to the first free x within reach of its position and reserve it;
+        returns False (rect untouched) if there is no room"""
+        x = self.find(rect.left, rect.width, rect.top, rect.bottom, reach)
+        if x is None:
+            return False
+        rect.left = x
+        self.reserve(rect)
+        return True
+
+    def snapshot(self):
+        head = self._head
+        return (self._max_width, tuple(self._lefts[head:]), tuple(self._rights[head:]),
+                tuple(self._tops[head:]), tuple(self._bottoms[head:]))
+
+    def restore(self, state):
+        self._max_width, lefts, rights, tops, bottoms = state
+        self._lefts, self._rights = list(lefts), list(rights)
+        self._tops, self._bottoms = list(tops), list(bottoms)
+        self._head = 0
+
+    @property
+    def count(self):
+        """Get the number of resident reservations"""
+        return len(self._lefts) - self._head
+
+    @property
+    def memory_bytes(self):
+        lists = (self._lefts, self._rights, self._tops, self._bottoms)
+        return sum(sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values) for values in lists)
@@ -0,0 +1,124 @@
+import time
+
+# Penghitung yang dilacak; tiap penghitung punya nilai run ini dan total sepanjang masa
+COUNTERS = ("kills", "shield_hits", "double_jumps", "distance", "coins", "bosses")
+SCOPES = ("run", "total")
+
+
+class Stats:
+    """Lifetime statistics and achievements, updated from game events.
+
+    add() is called where the event happens (a kill, a shield hit, ...) and does
+    constant work: the counter is bumped and compared with the next unmet goal
+    of that counter, so achievements are only checked when their counter
+    changes. Goals come sorted from the entity tables. Totals and unlocks are
+    written by the RunHistory background writer, batched with the run log."""
+
+    NOTICE_MS = 3000
+
+    def __init__(self, game):
+        self._game = game
+        self.totals = dict.fromkeys(COUNTERS, 0)
+        self.best = dict.fromkeys(COUNTERS, 0)
+        self.run = dict.fromkeys(COUNTERS, 0)
+        self.unlocked = {}
+        self._pending = {}
+        self._next = {}
+        self._notices = []
+        self.retune()
+
+    def load(self, totals, best, unlocked):
+        """Take the values read back from the run history"""
+        for name in COUNTERS:
+            self.totals[name] = totals.get(name, 0)
+            self.best[name] = best.get(name, 0)
+        self.unlocked = dict(unlocked)
+        self.retune()
+
+    def retune(self):
+        """Point every counter at its first goal that is not unlocked yet"""
+        goals = self._game.entities.achievement_goals
+        values = {"run": self.run, "total": self.totals}
+        self._next = {}
+        for (counter, scope), entries in goals.items():
+            index = 0
+            while index < len(entries) and (entries[index][1] in self.unlocked
+                                            or values[scope][counter] >= entries[index][0]):
+                self._unlock(entries[index][1])
+                index += 1
+            self._next[counter, scope] = index
+        self._thresholds = {key: self._threshold(key) for key in goals}
+
+    def _threshold(self, key):
+        entries = self._game.entities.achievement_goals[key]
+        index = self._next[key]
+        return entries[index][0] if index < len(entries) else float("inf")
+
+    def start_run(self):
+        for name in COUNTERS:
+            self.run[name] = 0
+        self._notices = []
+        self.retune()
+
+    def snapshot(self):
+        """Capture the counters of the current run (totals are lifetime and not rewound)"""
+        return tuple(self.run[name] for name in COUNTERS)
+
+    def restore(self, state):
+        for name, value in zip(COUNTERS, state):
+            self.run[name] = value
+        self._notices = []
+        self.retune()
+
+    def add(self, counter, amount=1):
+        """Count an event of the current single-player run (not races or replays)"""
+        if self._game.race is not None or self._game.playback is not None:
+            return
+        run = self.run[counter] = self.run[counter] + amount
+        total = self.totals[counter] = self.totals[counter] + amount
+        thresholds = self._thresholds
+        if run >= thresholds.get((counter, "run"), float("inf")):
+            self._advance((counter, "run"), run)
+        if total >= thresholds.get((counter, "total"), float("inf")):
+            self._advance((counter, "total"), total)
+
+    def _advance(self, key, value):
+        entries = self._game.entities.achievement_goals[key]
+        index = self._next[key]
+        while index < len(entries) and value >= entries[index][0]:
+            self._unlock(entries[index][1])
+            index += 1
+        self._next[key] = index
+        self._thresholds[key] = self._threshold(key)
+
+    def _unlock(self, achievement):
+        if achievement in self.unlocked:
+            return
+        self.unlocked[achievement] = self._pending[achievement] = time.time()
+        self._notices.append((achievement, self._game.run_time + self.NOTICE_MS))
+
+    def end_run(self):
+        """Keep the best single-run values and queue everything for saving"""
+        for name in COUNTERS:
+            self.best[name] = max(self.best[name], self.run[name])
+        self.flush()
+
+    def flush(self):
+        """Queue totals, bests and new unlocks on the run history writer"""
+        self._game.run_history.record_stats(dict(self.totals), dict(self.best), self._pending)
+        self._pending = {}
+
+    def notices(self):
+        """Get the titles of achievements unlocked in the last NOTICE_MS of run time"""
+        if not self._notices:
+            return []
+        run_time = self._game.run_time
+        self._notices = [(a, until) for a, until in self._notices if until > run_time]
+        titles = self._game.entities.achievements
+        return [titles[a][0] for a, _ in self._notices if a in titles]
+
+    @property
+    def progress(self):
+        """Get (unlocked, defined) achievement counts"""
+        defined = self._game.entities.achievements
+        return sum(1 for a in self.unlocked if a in defined), len(defined)
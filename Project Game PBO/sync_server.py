@@ -0,0 +1,105 @@
+"""Local stand-in for the kiosk leaderboard server.
+
+Run `python sync_server.py` and start the game with `--sync 127.0.0.1:8765`.
+--delay and --fail-rate simulate a slow or flaky server."""
+import argparse
+import asyncio
+import json
+import random
+from sync_service import DEFAULT_PORT
+
+LEADERBOARD_SIZE = 10
+
+
+class LeaderboardServer:
+    """Keeps every run in memory (optionally in a JSON file) and the best ghost per seed"""
+
+    def __init__(self, path=None, delay=0.0, fail_rate=0.0):
+        self._path = path
+        self._delay = delay
+        self._fail_rate = fail_rate
+        self._runs = []
+        self._ghosts = {}
+        if path:
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                self._runs, self._ghosts = data["runs"], data["ghosts"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if self._delay:
+                    await asyncio.sleep(self._delay)
+                if random.random() < self._fail_rate:
+                    break
+                try:
+                    response = self._dispatch(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"ok": False, "error": f"bad request: {e}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, message):
+        if message["type"] == "runs":
+            for run in message["runs"]:
+                self._add_run(run)
+            self._save()
+        elif message["type"] == "ghost":
+            ghost = self._ghosts.get(str(message["seed"]))
+            return {"ok": True, "ghost": ghost}
+        elif message["type"] != "leaderboard":
+            return {"ok": False, "error": f"unknown type {message['type']!r}"}
+        return {"ok": True, "leaderboard": self.leaderboard()}
+
+    def _add_run(self, run):
+        ghost = run.pop("ghost", None)
+        self._runs.append(run)
+        best = self._ghosts.get(str(run["seed"]))
+        if ghost and (best is None or run["score"] > best["score"]):
+            self._ghosts[str(run["seed"])] = {"score": run["score"], "kiosk": run["kiosk"], "samples": ghost}
+
+    def leaderboard(self):
+        """Get the best runs of all kiosks as (kiosk, score) pairs"""
+        best = sorted(self._runs, key=lambda run: run["score"], reverse=True)[:LEADERBOARD_SIZE]
+        return [(run["kiosk"], run["score"]) for run in best]
+
+    def _save(self):
+        if self._path:
+            with open(self._path, "w") as f:
+                json.dump({"runs": self._runs, "ghosts": self._ghosts}, f)
+
+
+async def serve(host, port, server):
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"Leaderboard server listening on {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data", help="JSON file to keep runs in between restarts")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before every reply")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests to drop")
+    args = parser.parse_args()
+    server = LeaderboardServer(args.data, args.delay, args.fail_rate)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from array import array
+from collections import deque
+
+DEFAULT_PORT = 8765
+
+
+def parse_address(text):
+    """Parse host[:port] into a (host, port) tuple"""
+    host, _, port = text.partition(":")
+    return host or "127.0.0.1", int(port) if port else DEFAULT_PORT
+
+
+async def exchange(reader, writer, message):
+    """Send one JSON line and read the JSON line sent back"""
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("connection closed by server")
+    return json.loads(line)
+
+
+class GhostRecorder:
+    """Player height sampled every INTERVAL_MS of run time, for ghost replays"""
+
+    INTERVAL_MS = 100
+
+    def __init__(self):
+        self._samples = array("h")
+
+    def reset(self):
+        del self._samples[:]
+
+    def sample(self, run_time, y):
+        if run_time >= len(self._samples) * self.INTERVAL_MS:
+            self._samples.append(int(y))
+
+    def truncate(self, run_time):
+        """Drop samples after run_time (used when a run is rewound)"""
+        del self._samples[int(run_time // self.INTERVAL_MS) + 1:]
+
+    @property
+    def samples(self):
+        return self._samples.tolist()
+
+
+class SyncClient:
+    """Shares run results and ghosts with a leaderboard server.
+
+    An asyncio loop runs on its own daemon thread. submit_run() only schedules
+    a callback on that loop, so the frame loop and game_over never wait on the
+    network. Pending items are sent in batches; a failed batch is kept and
+    retried with exponential backoff, and the oldest items are dropped once
+    MAX_PENDING is reached so an unreachable server cannot grow memory."""
+
+    BATCH_SIZE = 20
+    BATCH_DELAY = 0.5
+    TIMEOUT = 3.0
+    BACKOFF_MIN = 0.5
+    BACKOFF_MAX = 30.0
+    MAX_PENDING = 500
+    CLOSE_TIMEOUT = 1.0
+
+    def __init__(self, address, kiosk_id=None):
+        self._host, self._port = address
+        self._kiosk_id = kiosk_id or socket.gethostname()
+        self._pending = deque(maxlen=self.MAX_PENDING)
+        self._lock = threading.Lock()
+        self._summary = {"leaderboard": [], "online": False, "pending": 0, "last_error": None}
+        self._loop = asyncio.new_event_loop()
+        self._wakeup = None
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run_loop, name="sync-client", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        self._loop.run_until_complete(self._sender())
+        self._loop.close()
+
+    def submit_run(self, score, coins, duration_ms, seed, cause, ghost):
+        """Queue a finished run with its ghost samples; returns immediately"""
+        item = {
+            "kiosk": self._kiosk_id,
+            "played_at": time.time(),
+            "score": score,
+            "coins": coins,
+            "duration_ms": int(duration_ms),
+            "seed": seed,
+            "cause": cause,
+            "ghost": ghost,
+        }
+        self._loop.call_soon_threadsafe(self._enqueue, item)
+
+    def _enqueue(self, item):
+        self._pending.append(item)
+        self._wakeup.set()
+
+    async def _sender(self):
+        backoff = self.BACKOFF_MIN
+        while True:
+            if not self._pending:
+                if self._stopping:
+                    return
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            if not self._stopping and len(self._pending) < self.BATCH_SIZE:
+                # Beri waktu sebentar supaya beberapa hasil terkirim dalam satu batch
+                await asyncio.sleep(self.BATCH_DELAY)
+
+            batch = [self._pending[i] for i in range(min(self.BATCH_SIZE, len(self._pending)))]
+            try:
+                response = await asyncio.wait_for(self._send(batch), self.TIMEOUT)
+            except (OSError, ValueError, asyncio.TimeoutError) as e:
+                self._set_summary(online=False, last_error=str(e) or type(e).__name__)
+                if self._stopping:
+                    return
+                await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+                backoff = min(backoff * 2, self.BACKOFF_MAX)
+                continue
+
+            backoff = self.BACKOFF_MIN
+            # Item terlama bisa sudah terbuang oleh maxlen selama batch dikirim
+            for item in batch:
+                if self._pending and self._pending[0] is item:
+                    self._pending.popleft()
+            self._set_summary(online=True, last_error=None, leaderboard=response.get("leaderboard", []))
+
+    async def _send(self, batch):
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        try:
+            response = await exchange(reader, writer, {"type": "runs", "runs": batch})
+        finally:
+            writer.close()
+        if not response.get("ok"):
+            raise ValueError(response.get("error", "rejected by server"))
+        return response
+
+    def _set_summary(self, **changes):
+        summary = dict(self._summary, pending=len(self._pending), **changes)
+        with self._lock:
+            self._summary = summary
+
+    def close(self):
+        """Try to flush pending results for at most CLOSE_TIMEOUT, then stop"""
+        def stop():
+            self._stopping = True
+            self._wakeup.set()
+        self._loop.call_soon_threadsafe(stop)
+        self._thread.join(self.CLOSE_TIMEOUT)
+
+    @property
+    def summary(self):
+        """Get the cached leaderboard and connection state (never touches the network)"""
+        with self._lock:
+            return self._summary
@@ -0,0 +1,171 @@
+import random
+import sys
+from bisect import bisect_right
+import pygame
+from entity_defs import MAX_TERRAIN_SEGMENT
+
+GROUND, PLATFORM = 0, 1
+
+
+class Terrain:
+    """Streamed ground segments, gaps and floating platforms.
+
+    Segments live in world coordinates (pixels scrolled since the run started) in
+    parallel lists sorted by start x. No segment is longer than MAX_SEGMENT, so an
+    x-range query only has to look at the few entries found by one bisect. Segments
+    behind the screen are dropped by moving the head index, and segments are
+    generated just ahead of the right edge, so every query costs the same no
+    matter how long the run is."""
+
+    MAX_SEGMENT = MAX_TERRAIN_SEGMENT
+    COMPACT_AT = 64
+    GROUND_COLOR = (20, 14, 10)
+    PLATFORM_COLOR = (110, 76, 44)
+    PLATFORM_EDGE_COLOR = (70, 48, 28)
+
+    def __init__(self, game):
+        self._game = game
+        self.reset()
+
+    def reset(self, seed=0):
+        """Start a new level; the layout is fully determined by seed"""
+        self._config = self._game.entities.terrain
+        self._rng = random.Random(seed)
+        self._starts = []
+        self._ends = []
+        self._tops = []
+        self._kinds = []
+        self._head = 0
+        self._distance = 0
+        self._generated_to = 0
+        self._stream()
+
+    def retune(self):
+        """Use changed terrain tuning for segments generated from now on"""
+        self._config = self._game.entities.terrain
+
+    def update(self):
+        """Scroll with the obstacles and stream segments in and out"""
+        self._distance += self._game.obstacle_manager.obstacle_speed
+        self._stream()
+
+    def _stream(self):
+        ahead = self._distance + self._game.WIDTH + self.MAX_SEGMENT
+        while self._generated_to < ahead:
+            self._generate_segment()
+
+        # Buang segmen yang sudah sepenuhnya lewat di kiri layar
+        while self._head < len(self._starts) and self._ends[self._head] < self._distance - self.MAX_SEGMENT:
+            self._head += 1
+        if self._head >= self.COMPACT_AT:
+            del self._starts[:self._head], self._ends[:self._head]
+            del self._tops[:self._head], self._kinds[:self._head]
+            self._head = 0
+
+    def _add(self, start, end, top, kind):
+        self._starts.append(start)
+        self._ends.append(end)
+        self._tops.append(top)
+        self._kinds.append(kind)
+
+    def _generate_segment(self):
+        """Append one ground segment, maybe a platform above it, maybe a gap after it"""
+        config = self._config
+        rng = self._rng
+        ground = self._game.player.ground_level
+        start = self._generated_to
+        end = start + rng.randint(config["segment_min"], config["segment_max"])
+        self._add(start, end, ground, GROUND)
+
+        past_safe_zone = start >= config["safe_distance"]
+        if past_safe_zone and rng.random() < config["platform_chance"]:
+            length = rng.randint(config["platform_min"], config["platform_max"])
+            platform_start = rng.randint(start, end - 1)
+            self._add(platform_start, platform_start + length,
+                      ground - rng.choice(config["platform_heights"]), PLATFORM)
+
+        self._generated_to = end
+        if past_safe_zone and rng.random() < config["gap_chance"]:
+            self._generated_to += rng.randint(config["gap_min"], config["gap_max"])
+
+    def _overlapping(self, left, right):
+        """Yield indexes of segments overlapping the world x-range [left, right)"""
+        i = bisect_right(self._starts, right, self._head) - 1
+        while i >= self._head and self._starts[i] > left - self.MAX_SEGMENT:
+            if self._ends[i] > left:
+                yield i
+            i -= 1
+
+    def support_top(self, left, right, previous_bottom, bottom):
+        """Get the highest surface under a screen-space x-range that a falling body
+        crossed between previous_bottom and bottom, or None"""
+        best = None
+        offset = self._distance
+        for i in self._overlapping(left + offset, right + offset):
+            top = self._tops[i]
+            if previous_bottom <= top <= bottom and (best is None or top < best):
+                best = top
+        return best
+
+    def solid_ground(self, left, right):
+        """Check if the whole screen-space x-range has ground under it"""
+        covered = left + self._distance
+        end = right + self._distance
+        for i in sorted(self._overlapping(covered, end), key=self._starts.__getitem__):
+            if self._kinds[i] == GROUND and self._starts[i] <= covered:
+                covered = max(covered, self._ends[i])
+        return covered >= end
+
+    def draw(self, screen):
+        """Draw gaps as pits and platforms as ledges over the background"""
+        width = self._game.WIDTH
+        height = self._game.HEIGHT
+        ground = self._game.player.ground_level
+        offset = self._distance
+        previous_end = None
+        for i in range(self._head, len(self._starts)):
+            start = self._starts[i] - offset
+            if start > width:
+                break
+            end = self._ends[i] - offset
+            if self._kinds[i] == GROUND:
+                if previous_end is not None and start > previous_end:
+                    screen.fill(self.GROUND_COLOR, (previous_end, ground, start - previous_end, height - ground))
+                previous_end = end if previous_end is None else max(previous_end, end)
+            else:
+                rect = pygame.Rect(start, self._tops[i], end - start, self._config["platform_thickness"])
+                screen.fill(self.PLATFORM_COLOR, rect)
+                pygame.draw.rect(screen, self.PLATFORM_EDGE_COLOR, rect, 2)
+
+    def snapshot(self):
+        """Capture the resident segments, scroll position and generator state"""
+        head = self._head
+        return (
+            self._rng.getstate(), self._distance, self._generated_to,
+            tuple(self._starts[head:]), tuple(self._ends[head:]),
+            tuple(self._tops[head:]), tuple(self._kinds[head:])
+        )
+
+    def restore(self, state):
+        """Restore a state captured by snapshot()"""
+        rng_state, self._distance, self._generated_to, starts, ends, tops, kinds = state
+        self._rng.setstate((rng_state[0], tuple(rng_state[1]), rng_state[2]))
+        self._starts, self._ends = list(starts), list(ends)
+        self._tops, self._kinds = list(tops), list(kinds)
+        self._head = 0
+
+    @property
+    def distance(self):
+        """Get how far the world has scrolled this run"""
+        return self._distance
+
+    @property
+    def memory_bytes(self):
+        """Get the approximate bytes held by the segment lists"""
+        lists = (self._starts, self._ends, self._tops, self._kinds)
+        return sum(sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values) for values in lists)
+
+    @property
+    def segment_count(self):
+        """Get the number of resident segments"""
+        return len(self._starts) - self._head
@@ -0,0 +1,286 @@
+import pygame
+from input_mapping import ACTIONS
+
+WHITE = (255, 255, 255)
+YELLOW = (255, 255, 0)
+GREY = (200, 200, 200)
+GREEN = (50, 200, 50)
+RED = (200, 50, 50)
+DISABLED = (100, 100, 100)
+
+
+class UIScreen:
+    """Retained-mode screen: the composed frame and hit boxes are rebuilt only when
+    the data behind them changes"""
+
+    DIMMED = True
+
+    def __init__(self, game):
+        self._game = game
+        self._background = None
+        self._surface = None
+        self._buttons = []
+        self._state = None
+
+    def _state_key(self):
+        """Return the data the screen depends on; a different value invalidates it"""
+        return None
+
+    def _compose(self, surface):
+        """Draw the whole screen into surface and return its (action, Rect) buttons"""
+        raise NotImplementedError
+
+    def _compose_background(self):
+        """Compose the background plus overlay once; every layout starts from a copy"""
+        game = self._game
+        self._background = pygame.Surface((game.WIDTH, game.HEIGHT)).convert()
+        self._background.blit(game.bg_img, (0, 0))
+        if self.DIMMED:
+            overlay = pygame.Surface((game.WIDTH, game.HEIGHT), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 180))
+            self._background.blit(overlay, (0, 0))
+
+    def _refresh(self):
+        state = self._state_key()
+        if self._surface is None or state != self._state:
+            if self._background is None:
+                self._compose_background()
+            self._state = state
+            self._surface = self._background.copy()
+            self._buttons = self._compose(self._surface)
+
+    def prepare(self):
+        """Compose the screen now so its first draw is only a blit"""
+        self._refresh()
+
+    def invalidate(self):
+        """Force the next draw or hit test to rebuild the layout"""
+        self._background = None
+        self._surface = None
+
+    def hit_test(self, pos):
+        """Return the action of the button under pos, or None (never draws)"""
+        self._refresh()
+        for action, rect in self._buttons:
+            if rect.collidepoint(pos):
+                return action
+        return None
+
+    def draw(self, screen):
+        """Blit the cached frame"""
+        self._refresh()
+        screen.blit(self._surface, (0, 0))
+
+    def _text(self, surface, text, color, pos, font=None):
+        image = (font or self._game.font).render(text, True, color)
+        surface.blit(image, pos)
+        return image
+
+
+class MenuScreen(UIScreen):
+    DIMMED = False
+
+    def _state_key(self):
+        game = self._game
+        # Ringkasan riwayat diganti objek baru setiap kali ditulis, jadi cukup dibandingkan id-nya
+        return (game.save_data["high_score"], game.save_data["total_coin"],
+                id(game.run_history.summary), game.retry_snapshot is not None,
+                game.suspended_run is not None, id(game.sync.summary) if game.sync else None,
+                game.stats.progress)
+
+    def _compose(self, surface):
+        game = self._game
+        buttons = [
+            ("start", game.start_img, game.start_button_rect),
+            ("shop", game.shop_img, game.shop_rect),
+            ("setting", game.setting_img, game.setting_rect),
+            ("reset", game.reset_img, game.reset_rect),
+        ]
+        for _, image, rect in buttons:
+            surface.blit(image, rect)
+
+        self._text(surface, f"High Score: {int(game.save_data['high_score'])}", WHITE, (10, 10))
+        self._text(surface, f"Total Coins: {game.save_data['total_coin']}", YELLOW, (10, 40))
+        unlocked, defined = game.stats.progress
+        if defined:
+            self._text(surface, f"Achievements: {unlocked}/{defined}", GREY, (game.WIDTH - 170, 10), game.small_font)
+
+        if game.sync is not None:
+            shared = game.sync.summary
+            if shared["leaderboard"]:
+                best = ", ".join(f"{kiosk} {int(score)}" for kiosk, score in shared["leaderboard"][:3])
+                self._text(surface, f"Kiosks: {best}", WHITE, (10, 75), game.small_font)
+            if not shared["online"] and shared["last_error"]:
+                self._text(surface, f"Leaderboard offline ({shared['pending']} waiting)", GREY,
+                           (10, 95), game.small_font)
+
+        history = game.run_history.summary
+        if history["runs"]:
+            top = " / ".join(str(int(score)) for score in history["top"])
+            self._text(surface, f"Top: {top}", WHITE, (10, 300), game.small_font)
+            self._text(surface, f"Best today: {int(history['today_best'])}", WHITE, (10, 320), game.small_font)
+            if history["last_rank"] is not None:
+                self._text(surface, f"Last run beat {history['last_rank']:.0f}% of runs", WHITE,
+                           (10, 340), game.small_font)
+
+        hints = ["2: two-player race"]
+        if game.retry_snapshot is not None:
+            hints.append("R: retry from checkpoint")
+        if game.suspended_run is not None:
+            hints.append("C: continue suspended run")
+        for i, hint in enumerate(hints):
+            self._text(surface, hint, GREEN, (game.WIDTH - 200, 300 + 20 * i), game.small_font)
+
+        return [(action, rect) for action, _, rect in buttons]
+
+
+class PauseScreen(UIScreen):
+    def _compose_background(self):
+        # Latar belakang adalah frame gameplay terakhir, dibekukan saat pause
+        game = self._game
+        self._background = game.screen.copy()
+        overlay = pygame.Surface((game.WIDTH, game.HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 140))
+        self._background.blit(overlay, (0, 0))
+
+    def _compose(self, surface):
+        game = self._game
+        title = game.font.render("PAUSED", True, WHITE)
+        surface.blit(title, (game.WIDTH // 2 - title.get_width() // 2, 110))
+
+        buttons = []
+        for y_pos, action, label in ((160, "resume", "Resume (Esc)"), (210, "menu", "Menu (M)")):
+            rect = pygame.Rect(game.WIDTH // 2 - 90, y_pos, 180, 40)
+            pygame.draw.rect(surface, GREEN if action == "resume" else RED, rect)
+            image = game.font.render(label, True, WHITE)
+            surface.blit(image, image.get_rect(center=rect.center))
+            buttons.append((action, rect))
+        return buttons
+
+
+class ShopScreen(UIScreen):
+    def _state_key(self):
+        game = self._game
+        items = tuple(game.upgrades.levels.items())
+        return game.save_data["total_coin"], items
+
+    def _compose(self, surface):
+        game = self._game
+        self._text(surface, f"Coins: {game.save_data['total_coin']}", YELLOW, (game.WIDTH - 150, 20))
+        title = game.font.render("SHOP", True, WHITE)
+        surface.blit(title, (game.WIDTH // 2 - title.get_width() // 2, 50))
+
+        back_btn = pygame.Rect(20, 20, 80, 40)
+        pygame.draw.rect(surface, RED, back_btn)
+        self._text(surface, "Back", WHITE, (back_btn.x + 20, back_btn.y + 10))
+        buttons = [("back", back_btn)]
+
+        y_pos = 100
+        upgrades = game.upgrades
+        names = upgrades.names
+        # Baris dirapatkan supaya semua upgrade (dan tombol belinya) muat di layar
+        row = min(80, (game.HEIGHT - y_pos) // max(1, len(names)))
+        icon_size = min(50, row - 10)
+        button_height = min(40, row - 10)
+        powerups = game.entities.powerups
+        for item in names:
+            img = pygame.transform.scale(powerups[item]["frames"][0], (icon_size, icon_size))
+            surface.blit(img, (50, y_pos))
+
+            self._text(surface, item.replace('_', ' ').title(), WHITE, (120, y_pos))
+            self._text(surface, f"Lvl: {upgrades.level(item)}/{upgrades.max_level(item)}", GREY, (120, y_pos + 25))
+
+            price = upgrades.price(item)
+            if price is not None:
+                btn_rect = pygame.Rect(game.WIDTH - 150, y_pos + min(10, row - button_height - 5), 120, button_height)
+                btn_color = GREEN if game.save_data['total_coin'] >= price else DISABLED
+                pygame.draw.rect(surface, btn_color, btn_rect)
+                self._text(surface, f"Buy: {price}", WHITE, (game.WIDTH - 140, btn_rect.centery - 10))
+                buttons.append((item, btn_rect))
+
+            y_pos += row
+
+        return buttons
+
+
+class SettingsScreen(UIScreen):
+    def _state_key(self):
+        settings = self._game.settings
+        return settings["music_enabled"], settings["sound_effects_enabled"], tuple(self._game.controls.key_names("hitboxes"))
+
+    def _compose(self, surface):
+        game = self._game
+        title = game.font.render("SETTINGS", True, WHITE)
+        surface.blit(title, (game.WIDTH // 2 - title.get_width() // 2, 50))
+
+        back_btn = pygame.Rect(20, 20, 90, 40)
+        pygame.draw.rect(surface, RED, back_btn)
+        self._text(surface, "Back", WHITE, (back_btn.x + 15, back_btn.y + 10))
+
+        music_btn = pygame.Rect(game.WIDTH // 2 - 100, 120, 260, 50)
+        pygame.draw.rect(surface, GREEN if game.settings["music_enabled"] else RED, music_btn)
+        status = "ON" if game.settings["music_enabled"] else "OFF"
+        self._text(surface, f"Music:            {status}", WHITE, (music_btn.x + 50, music_btn.y + 15))
+
+        sfx_btn = pygame.Rect(game.WIDTH // 2 - 100, 190, 260, 50)
+        pygame.draw.rect(surface, GREEN if game.settings["sound_effects_enabled"] else RED, sfx_btn)
+        status = "ON" if game.settings["sound_effects_enabled"] else "OFF"
+        self._text(surface, f"Sound Effects: {status}", WHITE, (sfx_btn.x + 30, sfx_btn.y + 15))
+
+        controls_btn = pygame.Rect(game.WIDTH // 2 - 100, 260, 260, 40)
+        pygame.draw.rect(surface, GREY, controls_btn)
+        self._text(surface, "Controls", WHITE, (controls_btn.x + 80, controls_btn.y + 10))
+
+        keys = " / ".join(game.controls.key_names("hitboxes")).upper() or "-"
+        hitbox_text = game.small_font.render(f"Press {keys} in-game to toggle hitboxes", True, WHITE)
+        surface.blit(hitbox_text, (game.WIDTH // 2 - hitbox_text.get_width() // 2, 320))
+
+        return [("back", back_btn), ("music", music_btn), ("sfx", sfx_btn), ("controls", controls_btn)]
+
+
+class ControlsScreen(UIScreen):
+    """Key and gamepad button of every action; clicking a row waits for the new key"""
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.waiting = None
+
+    def _state_key(self):
+        bindings = self._game.controls.bindings
+        keys = tuple(tuple(bindings["keys"][name]) for name in ACTIONS)
+        buttons = tuple(tuple(bindings["buttons"][name]) for name in ACTIONS)
+        return keys, buttons, self.waiting, self._game.controls.joysticks
+
+    def _compose(self, surface):
+        game = self._game
+        controls = game.controls
+        title = game.font.render("CONTROLS", True, WHITE)
+        surface.blit(title, (game.WIDTH // 2 - title.get_width() // 2, 30))
+
+        back_btn = pygame.Rect(20, 20, 90, 40)
+        pygame.draw.rect(surface, RED, back_btn)
+        self._text(surface, "Back", WHITE, (back_btn.x + 15, back_btn.y + 10))
+        buttons = [("back", back_btn)]
+
+        y_pos = 75
+        for name in ACTIONS:
+            row = pygame.Rect(game.WIDTH // 2 - 160, y_pos, 320, 34)
+            pygame.draw.rect(surface, YELLOW if name == self.waiting else DISABLED, row)
+            if name == self.waiting:
+                label = f"{name.title()}: press a key or button..."
+            else:
+                keys = " / ".join(controls.key_names(name)).upper() or "-"
+                pad = "".join(f"  [pad {button}]" for button in controls.button_numbers(name))
+                label = f"{name.title()}: {keys}{pad}"
+            self._text(surface, label, WHITE, (row.x + 10, row.y + 9), game.small_font)
+            buttons.append((name, row))
+            y_pos += 40
+
+        default_btn = pygame.Rect(game.WIDTH // 2 - 60, y_pos + 4, 120, 30)
+        pygame.draw.rect(surface, RED, default_btn)
+        self._text(surface, "Defaults", WHITE, (default_btn.x + 25, default_btn.y + 8), game.small_font)
+        buttons.append(("defaults", default_btn))
+
+        pads = controls.joysticks
+        self._text(surface, f"Gamepads: {pads}", GREY, (game.WIDTH - 130, 30), game.small_font)
+        return buttons
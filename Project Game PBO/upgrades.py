@@ -0,0 +1,91 @@
+SAVE_VERSION = 2
+
+
+def _migrate_v1(data):
+    """Version 1 stored level, price and max_level per item; prices now come from the tables"""
+    shop_items = data.pop("shop_items", {})
+    data["upgrades"] = {name: item.get("level", 1) for name, item in shop_items.items()}
+
+
+# MIGRATIONS[v] mengubah data simpanan versi v menjadi versi v + 1
+MIGRATIONS = {
+    1: _migrate_v1,
+}
+
+
+def migrate_save(data):
+    """Bring save data of any older version up to SAVE_VERSION (in place)"""
+    version = data.get("version", 1)
+    if version > SAVE_VERSION:
+        raise ValueError(f"Save data version {version} is newer than this game ({SAVE_VERSION})")
+    while version < SAVE_VERSION:
+        MIGRATIONS[version](data)
+        version += 1
+    data["version"] = version
+    return data
+
+
+class UpgradeShop:
+    """Shop levels of the upgradable powerups.
+
+    Prices and effects are looked up in the tables precomputed by entity_defs,
+    so any powerup with a shop section in the entity definitions is sold and
+    applied without changes here or in Game."""
+
+    def __init__(self, game):
+        self._game = game
+        self._levels = {}
+        self.reset()
+
+    def reset(self):
+        """Put every upgrade back to level 1"""
+        self._levels = {name: 1 for name in self._game.entities.upgrade_max_level}
+
+    def load(self, levels):
+        """Take saved levels; unknown items are dropped and levels are clamped"""
+        self.reset()
+        for name, level in levels.items():
+            if name in self._levels:
+                self.set_level(name, level)
+
+    def retune(self):
+        """Keep the levels valid after the entity definitions changed"""
+        self.load(self._levels)
+
+    def set_level(self, name, level):
+        self._levels[name] = max(1, min(int(level), self.max_level(name)))
+
+    def level(self, name):
+        return self._levels[name]
+
+    def max_level(self, name):
+        return self._game.entities.upgrade_max_level[name]
+
+    def price(self, name):
+        """Get the price of the next level, or None if the upgrade is maxed"""
+        return self._game.entities.upgrade_prices[name][self._levels[name]]
+
+    def buy(self, name, coins):
+        """Raise an upgrade one level if coins cover it; returns the coins spent"""
+        price = self.price(name)
+        if price is None or coins < price:
+            return 0
+        self._levels[name] += 1
+        return price
+
+    def apply(self, powerup_manager):
+        """Set every upgraded powerup parameter from the effect tables"""
+        effects = self._game.entities.upgrade_effects
+        for name, level in self._levels.items():
+            powerup = powerup_manager.powerup(name)
+            for param, value in effects[name][level]:
+                powerup.set_param(param, value)
+
+    @property
+    def names(self):
+        return tuple(self._levels)
+
+    @property
+    def levels(self):
+        """Get a copy of {name: level} for saving"""
+        return dict(self._levels)